@@ -0,0 +1,94 @@
+"""
+This python file (aeroMapCache.py) is for caching aero maps on disk, so identical aero maps are only ever calculated
+once (even across separate runs of aeroMaps.py, aeroMapRHEnvelope.py and main.py)
+
+Aero maps are stored as compressed .npz files, named by a hash of everything that affects the aero map (the parsed car
+data, wing angles and ride height grid) - so if any of those change, the aero map is simply recalculated and stored under
+a new name. The minimum collider ground clearance is stored rather than whether each ride height is valid, so the collider
+margin isn't part of the name
+
+When the total size of the cache is above maxCacheSize, the least recently used aero maps are deleted
+"""
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+
+# Increment this if the aero calculations or the stored arrays change, so old cache files are no longer used
+cacheVersion = 2
+
+
+class AeroMapCache:
+    def __init__(self, cacheDirectory, maxCacheSize=1024 ** 3):
+        """cacheDirectory is the folder the aero maps are stored in (created if it doesn't exist), and maxCacheSize is
+            the maximum total size of the stored aero maps in bytes"""
+        self.cacheDirectory = cacheDirectory
+        self.maxCacheSize = maxCacheSize
+        os.makedirs(cacheDirectory, exist_ok=True)
+
+    def getKey(self, carDataHash, wingAngles, frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, dtype,
+               adaptiveTolerance=None, adaptiveCoarseStep=None):
+        """Returns the cache key (a hex string) of the aero map defined by the arguments passed in, where carDataHash is
+            the hash of the parsed car data (see Car.getAeroDataHash()) - adaptively refined aero maps (see
+            Car.getAeroMap()) are stored separately from fully calculated ones"""
+        keyData = [cacheVersion, carDataHash, [float(wingAngle) for wingAngle in wingAngles],
+                   [float(frontRHMin), float(frontRHMax), float(rearRHMin), float(rearRHMax), float(RHStep)],
+                   np.dtype(dtype).str]
+        if adaptiveTolerance is not None:
+            keyData.append([float(adaptiveTolerance), int(adaptiveCoarseStep)])
+        return hashlib.sha256(json.dumps(keyData).encode()).hexdigest()
+
+    def getFilePath(self, key):
+        """Returns the path of the cache file for key"""
+        return os.path.join(self.cacheDirectory, key + ".npz")
+
+    def load(self, key):
+        """Returns (frontRHArray, rearRHArray, metricArrays, clearance2D) of the aero map stored under key, or None if it
+            isn't in the cache"""
+        filePath = self.getFilePath(key)
+        try:
+            with np.load(filePath) as cacheFile:
+                aeroMapArrays = (cacheFile["frontRHArray"], cacheFile["rearRHArray"], cacheFile["metricArrays"],
+                                 cacheFile["clearance2D"])
+        except (OSError, KeyError, ValueError):
+            # Not cached (or the file is unreadable, in which case it'll be overwritten)
+            return None
+
+        # Update the modification time, so the least recently used aero maps are the ones that get evicted
+        os.utime(filePath)
+        return aeroMapArrays
+
+    def save(self, key, frontRHArray, rearRHArray, metricArrays, clearance2D):
+        """Stores the aero map arrays under key, then evicts the least recently used aero maps if the cache is too big"""
+        filePath = self.getFilePath(key)
+
+        # Write to a temporary file first (unique to this process and thread), so other processes and threads never read
+        # a partially written aero map
+        tempFilePath = filePath + "." + str(os.getpid()) + "." + str(threading.get_ident()) + ".tmp.npz"
+        np.savez_compressed(tempFilePath, frontRHArray=frontRHArray, rearRHArray=rearRHArray,
+                            metricArrays=metricArrays, clearance2D=clearance2D)
+        os.replace(tempFilePath, filePath)
+
+        self.evict()
+
+    def evict(self):
+        """Deletes the least recently used aero maps until the total size of the cache is at most maxCacheSize"""
+        cacheFiles = []
+        for fileName in os.listdir(self.cacheDirectory):
+            if fileName.endswith(".npz") and not fileName.endswith(".tmp.npz"):
+                try:
+                    fileStats = os.stat(os.path.join(self.cacheDirectory, fileName))
+                except OSError:
+                    continue
+                cacheFiles.append([fileStats.st_mtime, fileStats.st_size, fileName])
+
+        totalSize = sum(cacheFile[1] for cacheFile in cacheFiles)
+        for modifiedTime, fileSize, fileName in sorted(cacheFiles):
+            if totalSize <= self.maxCacheSize:
+                break
+            try:
+                os.remove(os.path.join(self.cacheDirectory, fileName))
+            except OSError:
+                pass
+            totalSize -= fileSize
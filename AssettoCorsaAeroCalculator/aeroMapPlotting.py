@@ -0,0 +1,202 @@
+"""
+This python file (aeroMapPlotting.py) is for plotting aero maps (see Car.plotAeroMap() and Car.plotAeroMaps())
+
+It's kept separate from car.py, and only imported when something is plotted, so runs that only calculate (e.g. the
+optimiser, and its worker processes) never have to import Matplotlib
+"""
+import hashlib
+import json
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+from car import AeroMap
+
+# Increment this if the figure layout or plot settings change, so every figure is rendered again
+figureVersion = 1
+
+
+def getFigureFingerprint(figureTitle, aeroMap, RHEnvelope2D, boundsArray):
+    """Returns a fingerprint (a hex string) of everything that affects a figure - its title, the aero map, the RH
+        envelope, the colour map bounds (boundsArray, see AeroMapRenderer.render()), the figure version and the
+        Matplotlib version"""
+    fingerprintHash = hashlib.sha256()
+    boundsData = [[float(bound) if bound is not None else None for bound in bounds] if bounds is not None else None for bounds in boundsArray]
+    fingerprintHash.update(json.dumps([figureVersion, matplotlib.__version__, figureTitle, boundsData, aeroMap.metricArrays.dtype.str, aeroMap.metricArrays.shape]).encode())
+    for array in [aeroMap.frontRHArray, aeroMap.rearRHArray, aeroMap.metricArrays, aeroMap.isValid2D]:
+        fingerprintHash.update(np.ascontiguousarray(array).tobytes())
+    if RHEnvelope2D is not None:
+        fingerprintHash.update(np.ascontiguousarray(np.asarray(RHEnvelope2D, dtype=bool)).tobytes())
+    else:
+        fingerprintHash.update(b"No RH envelope")
+    return fingerprintHash.hexdigest()
+
+
+# Worker process state for Car.plotAeroMaps() (set by initRenderWorker())
+renderWorkerState = {}
+
+
+def initRenderWorker(car):
+    """Initialises an aero map rendering worker process with the car, using the headless Agg backend"""
+    plt.switch_backend("Agg")
+    renderWorkerState["car"] = car
+
+
+def renderAeroMapWorker(plotTask, skipUnchanged):
+    """Renders and saves one aero map figure in a worker process, where plotTask is the arguments of Car.plotAeroMap()
+        - each worker reuses its figure for every aero map on the same ride height grid
+
+        Returns True if the figure was rendered, or False if it was unchanged (see Car.plotAeroMap())"""
+    car = renderWorkerState["car"]
+    aeroMap = plotTask[2]
+    renderer = renderWorkerState.get("renderer")
+    if renderer is None or not (np.array_equal(renderer.frontRHArray, aeroMap.frontRHArray) and np.array_equal(renderer.rearRHArray, aeroMap.rearRHArray)):
+        if renderer is not None:
+            renderer.close()
+        renderer = AeroMapRenderer(car.carName, aeroMap.frontRHArray, aeroMap.rearRHArray)
+        renderWorkerState["renderer"] = renderer
+    return car.plotAeroMap(*plotTask, renderer=renderer, skipUnchanged=skipUnchanged)
+
+
+class AeroMapRenderer:
+    def __init__(self, carName, frontRHArray, rearRHArray):
+        """Builds the figure layout used by Car.plotAeroMap() once for a ride height grid (frontRHArray and rearRHArray
+            are the grid ride heights in metres), so aero maps on the same grid can be rendered by only swapping their
+            data into the existing images (see render()) - call close() when finished with it
+
+            Still have no idea whether to include contours or not - and if so, whether to mix data sources for colours
+            and contours (e.g. coloured efficiency but contours of aero balance)"""
+
+        # Plot settings
+        figDPI = 400
+        plotArea = 80
+        plotMarginX = 3.5
+        colourBarSizeMult = 0.65
+        colourMap = 'rainbow'     # magma, rainbow, gist_rainbow
+        self.notRHEnvelopeAlpha = 0.3
+
+        """figTitleFontSize = 12
+        axisTitleFontSize = 10
+        labelFontSize = 8
+        tickFontSize = 7"""
+
+        figTitleFontSize = 16
+        axisTitleFontSize = 14
+        labelFontSize = 12
+        self.tickFontSize = 10
+
+        self.contourPlotLineWidth = 0.1
+
+        gridSpacingMinor = 5
+        gridSpacingMajor = 20
+        gridLineWidthMinor = 0.1
+        gridLineWidthMajor = 0.2
+
+        # Set figure DPI
+        plt.rcParams['savefig.dpi'] = figDPI
+
+        # Set font sizes
+        plt.rc('axes', titlesize=axisTitleFontSize)  # fontsize of the axes title
+        plt.rc('axes', labelsize=labelFontSize)  # fontsize of the x and y labels
+        plt.rc('xtick', labelsize=self.tickFontSize)  # fontsize of the tick labels
+        plt.rc('ytick', labelsize=self.tickFontSize)  # fontsize of the tick labels
+        plt.rc('figure', titlesize=figTitleFontSize)  # fontsize of the figure title
+
+        self.carName = carName
+        self.frontRHArray = np.asarray(frontRHArray, dtype=float)
+        self.rearRHArray = np.asarray(rearRHArray, dtype=float)
+
+        # Get the ride heights in mm
+        self.frontRHArrayMM = self.frontRHArray * 1000
+        self.rearRHArrayMM = self.rearRHArray * 1000
+
+        # Get min and max ride heights for setting plot axis bounds
+        frontRHMin = np.min(self.frontRHArrayMM)
+        frontRHMax = np.max(self.frontRHArrayMM)
+        rearRHMin = np.min(self.rearRHArrayMM)
+        rearRHMax = np.max(self.rearRHArrayMM)
+
+        # Set up figure and axes
+        self.fig, self.axs = plt.subplots(2, 3, figsize=(plotArea ** 0.5 + plotMarginX, plotArea ** 0.5))
+        self.figTitle = self.fig.suptitle(carName)
+        majorTickArray = np.arange(round(min(frontRHMin, rearRHMin)), round(max(frontRHMax, rearRHMax)) + 1, gridSpacingMajor)
+        minorTickArray = np.arange(round(min(frontRHMin, rearRHMin)), round(max(frontRHMax, rearRHMax)) + 1, gridSpacingMinor)
+        for ax in self.axs.flat:
+            ax.set(xlabel='Front ride height (mm)', ylabel='Rear ride height (mm)')
+            ax.set_xticks(majorTickArray)
+            ax.set_xticks(minorTickArray, minor=True)
+            ax.set_yticks(majorTickArray)
+            ax.set_yticks(minorTickArray, minor=True)
+            ax.grid(which='minor', color='black', alpha=0.5, linewidth=gridLineWidthMinor)
+            ax.grid(which='major', color='black', linewidth=gridLineWidthMajor)
+            ax.set(xlim=(frontRHMin, frontRHMax), ylim=(rearRHMin, rearRHMax))
+            ax.axis('scaled')
+
+        self.axs[0, 0].set_title('Front ClA')
+        self.axs[1, 0].set_title('Rear ClA')
+        self.axs[0, 1].set_title('Total ClA')
+        self.axs[1, 1].set_title('Total CdA')
+        self.axs[0, 2].set_title('Efficiency (L/D Ratio)')
+        self.axs[1, 2].set_title('Front Aero Balance %')
+
+        # Colour map plots (in the order of AeroMap.metricNames), with placeholder data until render() is called
+        self.metricAxs = [self.axs[0, 0], self.axs[1, 0], self.axs[0, 1], self.axs[1, 1], self.axs[0, 2], self.axs[1, 2]]
+        placeholderArray2D = np.zeros((len(self.rearRHArray), len(self.frontRHArray)))
+        self.images = []
+        for ax in self.metricAxs:
+            image = ax.imshow(placeholderArray2D, extent=[frontRHMin, frontRHMax, rearRHMax, rearRHMin], vmin=0, vmax=1, cmap=colourMap)
+            self.fig.colorbar(image, orientation="vertical", shrink=colourBarSizeMult)
+            self.images.append(image)
+
+        # Contour lines of [metricIndex, levels], which are redrawn for every aero map
+        self.contourSettings = [[2, np.arange(0, 10 + 1, 0.1)], [3, np.arange(0, 2 + 1, 0.01)],
+                                [5, np.arange(0, 100 + 1, 1)], [4, np.arange(0, 10 + 1, 0.1)]]
+        self.contourSets = []
+
+    def render(self, saveDirectory, fileName, aeroMap, RHEnvelope2D=None, boundsArray=None):
+        """Renders aeroMap (an AeroMap on the same ride height grid as the renderer) and saves it to saveDirectory as
+            fileName
+
+            boundsArray is an array of the colour map bounds [lowerBound, upperBound] of each metric (in the order of
+            AeroMap.metricNames), where a bound of None (or boundsArray of None) means the minimum or maximum of the data"""
+        if not (np.array_equal(aeroMap.frontRHArray, self.frontRHArray) and np.array_equal(aeroMap.rearRHArray, self.rearRHArray)):
+            raise Exception("Aero map isn't on the same ride height grid as the renderer")
+        if boundsArray is None:
+            boundsArray = [None] * len(AeroMap.metricNames)
+
+        self.figTitle.set_text(self.carName + " " + fileName)
+
+        # Create transparency (alpha) array for denoting the ride height envelope and whether the ride height is valid
+        if RHEnvelope2D is not None:
+            alphaArray2D = np.where(np.asarray(RHEnvelope2D, dtype=bool), 1.0,
+                                    np.where(aeroMap.isValid2D, self.notRHEnvelopeAlpha, 0.0))
+        else:
+            alphaArray2D = np.where(aeroMap.isValid2D, 1.0, 0.0)
+
+        # Swap the data into the colour map plots (the colour bars update with the images)
+        for i in range(len(self.images)):
+            bounds = boundsArray[i] if boundsArray[i] is not None else [None, None]
+            metricArray2D = aeroMap.metricArrays[i]
+            self.images[i].set_data(metricArray2D)
+            self.images[i].set_alpha(alphaArray2D)
+            self.images[i].set_clim(bounds[0] if bounds[0] is not None else np.min(metricArray2D),
+                                    bounds[1] if bounds[1] is not None else np.max(metricArray2D))
+
+        # Lay out the figure from the default subplot parameters (like a new figure), rather than from the previous
+        # aero map's layout
+        self.fig.subplots_adjust(**{parameter: plt.rcParams["figure.subplot." + parameter] for parameter in ["left", "bottom", "right", "top", "wspace", "hspace"]})
+        self.fig.tight_layout()
+
+        # Contour lines (atm only for total ClA, total CdA, aero balance and efficiency)
+        for contourSet in self.contourSets:
+            contourSet.remove()
+        self.contourSets = []
+        for metricIndex, levels in self.contourSettings:
+            contourSet = self.metricAxs[metricIndex].contour(self.frontRHArrayMM, self.rearRHArrayMM, aeroMap.metricArrays[metricIndex], colors='black', levels=levels, linewidths=self.contourPlotLineWidth)
+            self.metricAxs[metricIndex].clabel(contourSet, inline=True, fontsize=self.tickFontSize)
+            self.contourSets.append(contourSet)
+
+        self.fig.savefig(saveDirectory + "\\" + fileName + ".png")
+
+    def close(self):
+        """Closes the figure"""
+        plt.close(self.fig)
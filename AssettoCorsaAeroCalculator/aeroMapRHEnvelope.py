@@ -2,8 +2,9 @@
 Generates aero map plots for all wing combinations in wingAnglesArray, with a smoothed telemetry RH envelope overlay
 """
 
-import math
+from aeroMapCache import AeroMapCache
 from car import Car, getRHEnvelope2D
+from telemData import readMoTeCTelem, smooth
 
 """INPUTS"""
 carName = "rss_formula_americas_2020_oval"
@@ -22,69 +23,21 @@ RHMax = 0.001 * 100
 RHStep = 0.001 * 1
 colliderMargin = 0
 
+aeroMapCacheDirectory = "aeroMapCache"  # Set to None to disable caching aero maps
+envelopeMargin = None   # Set to e.g. 0.001 * 5 to only calculate the aero maps within 5 mm of the RH envelope
+skipUnchanged = True    # Only re-render the plots whose inputs have changed since they were last saved
+
 wingAnglesArray = [[1, 1, 0.186, 0.186, 0.186, 0.186, 0.186, 0.186, 0.186, 0]]
 """END OF INPUTS"""
 
-
-def smooth(telemArray, smoothingPoints):
-    """Returns an array containing the moving average (of smoothingPoints * 2 + 1 points) of telemArray, where the first
-        smoothingPoints elements are simply the first moving average data point repeated, and similar for the last
-        smoothingPoints elements"""
-    # Generate array of the moving average of telemArray
-    smoothedTelemArray = []
-    for index in range(smoothingPoints, len(telemArray) - smoothingPoints):
-        movingSum = telemArray[index]
-        for i in range(smoothingPoints):
-            movingSum += telemArray[index - i - 1] + telemArray[index + i + 1]
-        smoothedTelemArray.append(movingSum / (smoothingPoints * 2 + 1))
-    # Repeat the first moving average data point and last moving average data point until smoothedTelemArray is the same
-    # length as the original telem array
-    for i in range(smoothingPoints):
-        smoothedTelemArray.insert(0, smoothedTelemArray[0])
-        smoothedTelemArray.insert(-1, smoothedTelemArray[-1])
-    return smoothedTelemArray
-
-
-car = Car(carsDirectory, carName)
+aeroMapCache = AeroMapCache(aeroMapCacheDirectory) if aeroMapCacheDirectory is not None else None
+car = Car(carsDirectory, carName, aeroMapCache)
 print(car)
 print()
 
-groundSpeedTelem = []   # in km/h
-frontRHTelem = []       # in metres
-rearRHTelem = []        # in metres
-longGTelem = []         # in G
-combinedGTelem = []     # in G
-combinedG2WDTelem = []  # in G, multiplies longitudinal G by 2 if it's positive (accelerating)
-
-# Read raw telemetry data
-channelNameLine = 14
-channelUnitsLine = 15
-dataLineStart = 18
-csvFile = open(telemDirectory + "\\" + telemFileName, "r")
-lineCounter = 1
-rawDataPoints = 0
-for line in csvFile:
-    data = line.replace("\n", "").replace("\"", "")
-
-    if lineCounter >= dataLineStart:
-        data = [float(i) for i in data.split(",")]
-        rawDataPoints += 1
-        # Ground speed
-        groundSpeedTelem.append(data[63])
-        # Ride heights
-        frontRHTelem.append((data[90] + data[91]) / 2 / 1000)
-        rearRHTelem.append((data[92] + data[93]) / 2 / 1000)
-        # Longitudinal G
-        longGTelem.append(data[23])
-        # Combined G
-        combinedGTelem.append(math.sqrt(pow(data[22], 2) + pow(data[23], 2)))
-        # Combined G 2WD
-        if data[23] > 0:
-            combinedG2WDTelem.append(math.sqrt(pow(data[22], 2) + pow(data[23] * 2, 2)))
-        else:
-            combinedG2WDTelem.append(math.sqrt(pow(data[22], 2) + pow(data[23], 2)))
-    lineCounter += 1
-csvFile.close()
+# Read raw telemetry data (ground speed in km/h, ride heights in metres and G in G)
+groundSpeedTelem, frontRHTelem, rearRHTelem, longGTelem, combinedGTelem, combinedG2WDTelem = readMoTeCTelem(telemDirectory + "\\" + telemFileName)
+rawDataPoints = len(groundSpeedTelem)
 
 smoothedFrontRHTelem = smooth(frontRHTelem, smoothingPoints)
 smoothedRearRHTelem = smooth(rearRHTelem, smoothingPoints)
@@ -112,4 +65,4 @@ for i in range(rawDataPoints):
                 processedRearRHTelem.append(smoothedRearRHTelem[i])
 
 RHEnvelope2D = getRHEnvelope2D(RHMin, RHMax, RHMin, RHMax, RHStep, processedFrontRHTelem, processedRearRHTelem)
-car.plotAeroMaps("plots", RHMin, RHMax, RHMin, RHMax, RHStep, colliderMargin, wingAnglesArray, RHEnvelope2D)
+car.plotAeroMaps("plots", RHMin, RHMax, RHMin, RHMax, RHStep, colliderMargin, wingAnglesArray, RHEnvelope2D, skipUnchanged=skipUnchanged, envelopeMargin=envelopeMargin)
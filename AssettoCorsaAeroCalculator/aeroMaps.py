@@ -2,6 +2,7 @@
 Generates aero map plots for all wing combinations given in wingAnglesArray (without RH envelope overlay)
 """
 
+from aeroMapCache import AeroMapCache
 from car import Car
 
 """INPUTS"""
@@ -14,11 +15,19 @@ RHMax = 0.001 * 20
 RHStep = 0.001 * 1
 colliderMargin = 0
 
+aeroMapCacheDirectory = "aeroMapCache"  # Set to None to disable caching aero maps
+numRenderWorkers = 1    # Set to more than 1 to render the plots in parallel processes
+adaptiveTolerance = None    # Set to e.g. 1e-4 to adaptively refine the aero maps (much faster for small RHSteps)
+skipUnchanged = True    # Only re-render the plots whose inputs have changed since they were last saved
+
 wingAnglesArray = [[1, 1, 0.186, 0.186, 0.186, 0.186, 0.186, 0.186, 0.186, 0]]
 """END OF INPUTS"""
 
-car = Car(carsDirectory, carName)
-print(car)
-print()
+# The worker processes (when numRenderWorkers is more than 1) import this file, so only run it in the main process
+if __name__ == "__main__":
+    aeroMapCache = AeroMapCache(aeroMapCacheDirectory) if aeroMapCacheDirectory is not None else None
+    car = Car(carsDirectory, carName, aeroMapCache)
+    print(car)
+    print()
 
-car.plotAeroMaps("plots", RHMin, RHMax, RHMin, RHMax, RHStep, colliderMargin, wingAnglesArray)
+    car.plotAeroMaps("plots", RHMin, RHMax, RHMin, RHMax, RHStep, colliderMargin, wingAnglesArray, numRenderWorkers=numRenderWorkers, skipUnchanged=skipUnchanged, adaptiveTolerance=adaptiveTolerance)
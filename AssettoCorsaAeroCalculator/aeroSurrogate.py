@@ -0,0 +1,210 @@
+"""
+This python file (aeroSurrogate.py) is for optimising the RH offsets continuously (rather than on the 1mm RH offset grid
+that Car.optimiseAeroRHTelem() uses) with a smooth surrogate of the aero map
+
+Each metric of the aero map is fitted with a bicubic tensor product spline (SciPy's RectBivariateSpline), so the
+telemetry weighted averages of the aero numbers, and their gradients with respect to the RH offsets, are cheap to
+calculate without using the real aero model. A bounded gradient based optimiser (SLSQP) then finds the RH offsets that
+maximise the objective with the weighted aero balance within the tolerances, and the answers are checked with the real
+aero model
+
+The optimiser is started from the best points of the 1mm RH offset grid (found with the surrogate), which are checked
+with the real aero model too, so the answer is never worse than the best of them. If none of the answers are within the
+aero balance tolerances with the real aero model, the 1mm RH offset grid is evaluated with the real aero model instead
+(like Car.optimiseAeroRHTelem()), so a setup is only missed if the grid has none either
+
+Requires SciPy (which the rest of the calculator doesn't need, so this is only imported when it's used)
+"""
+import numpy as np
+from scipy.interpolate import RectBivariateSpline
+from scipy.optimize import minimize
+from car import AeroMap, getRHAxis
+
+# The sign of each objective when it's maximised
+objectiveSigns = {"totalClA": 1, "efficiency": 1, "totalCdA": -1}
+
+
+class AeroSurrogate:
+    def __init__(self, aeroMap):
+        """Fits a bicubic spline to each metric of aeroMap (an AeroMap with at least 4 ride heights in each direction),
+            which passes through every point of the aero map"""
+        self.frontRHArray = aeroMap.frontRHArray
+        self.rearRHArray = aeroMap.rearRHArray
+        self.splines = [RectBivariateSpline(aeroMap.rearRHArray, aeroMap.frontRHArray, metricArray2D, kx=3, ky=3, s=0)
+                        for metricArray2D in aeroMap.metricArrays]
+
+    def evaluate(self, frontRH, rearRH, frontRHDerivative=0, rearRHDerivative=0):
+        """Returns a NumPy array in the form [metric][ride height] (metrics in the order of AeroMap.metricNames) of the
+            splines at the ride heights frontRH and rearRH (1D arrays in metres), or their analytic derivatives with
+            respect to front and rear RH of the orders frontRHDerivative and rearRHDerivative"""
+        return np.array([spline.ev(rearRH, frontRH, dx=rearRHDerivative, dy=frontRHDerivative) for spline in self.splines])
+
+    def getWeightedAverages(self, RHOffsets, frontRHTelem, rearRHTelem, velocityWeighting, withGradients=True):
+        """Returns weightedAverages, gradients, where weightedAverages is the weighted average of each metric (in the
+            same form as Car.calculateAeroRHTelem()) over the telemetry shifted by RHOffsets ([frontRHOffset,
+            rearRHOffset] in metres), and gradients is the gradient of each one with respect to RHOffsets, in the form
+            [metric][frontRHOffset or rearRHOffset] (or None if withGradients is False)
+
+            Shifting the telemetry by the RH offsets shifts every ride height equally, so the gradient of each weighted
+            average is just the weighted average of the gradients"""
+        frontRH = frontRHTelem + RHOffsets[0]
+        rearRH = rearRHTelem + RHOffsets[1]
+        velocityWeightingSum = np.sum(velocityWeighting)
+        weightedAverages = self.evaluate(frontRH, rearRH) @ velocityWeighting / velocityWeightingSum
+        if not withGradients:
+            return weightedAverages, None
+        gradients = np.array([self.evaluate(frontRH, rearRH, frontRHDerivative=1) @ velocityWeighting,
+                              self.evaluate(frontRH, rearRH, rearRHDerivative=1) @ velocityWeighting]).T / velocityWeightingSum
+        return weightedAverages, gradients
+
+
+def getSurrogateAeroMap(car, wingAngles, frontRHOffsetMin, frontRHOffsetMax, rearRHOffsetMin, rearRHOffsetMax, frontRHTelem, rearRHTelem, surrogateRHStep):
+    """Returns the aero map of wingAngles that the surrogate is fitted to, on a grid with a spacing of surrogateRHStep
+        covering the telemetry shifted by any RH offset (with 2 extra ride heights on each side, so the splines aren't
+        extrapolated and aren't affected by the edges of the grid)"""
+    frontRHMin = (np.floor((np.min(frontRHTelem) + frontRHOffsetMin) / surrogateRHStep) - 2) * surrogateRHStep
+    frontRHMax = (np.ceil((np.max(frontRHTelem) + frontRHOffsetMax) / surrogateRHStep) + 2) * surrogateRHStep
+    rearRHMin = (np.floor((np.min(rearRHTelem) + rearRHOffsetMin) / surrogateRHStep) - 2) * surrogateRHStep
+    rearRHMax = (np.ceil((np.max(rearRHTelem) + rearRHOffsetMax) / surrogateRHStep) + 2) * surrogateRHStep
+    return car.getAeroMap(frontRHMin, frontRHMax, rearRHMin, rearRHMax, surrogateRHStep, 0, wingAngles=wingAngles)
+
+
+def optimiseRHOffsetsSurrogate(car, wingAngles, frontRHOffsetMin, frontRHOffsetMax, rearRHOffsetMin, rearRHOffsetMax, aeroBalanceTarget, aeroBalanceTolerance, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, objective="totalClA", surrogateRHStep=0.001, numStarts=3, aeroBalanceMargin=0.001):
+    """Returns the best setup for wingAngles in the form [frontRHOffset (metres), rearRHOffset (metres), wingAngles,
+        exactResults, surrogateResults], where the RH offsets can be anywhere between their min and max (rather than
+        multiples of 1mm), or None if no setup was found with the weighted aero balance within the tolerances
+
+        exactResults and surrogateResults are the weighted averages of the aero numbers (in the same form as
+        Car.calculateAeroRHTelem()) calculated with the real aero model and with the surrogate
+
+        objective is the weighted average that is optimised, which can be "totalClA" (maximised), "efficiency"
+        (maximised) or "totalCdA" (minimised)
+
+        The surrogate is evaluated on the 1mm RH offset grid, and SLSQP is started from the numStarts best grid points
+        (preferring ones within the aero balance tolerances), with the aero balance tolerance reduced by
+        aeroBalanceMargin (in %) so the answers aren't right on the edge of the tolerances. Each answer and starting
+        point is checked with the real aero model, and an answer that's outside the tolerances is optimised once more
+        with the surrogate's aero balance corrected by its error there. The best one that's within the tolerances with
+        the real aero model is returned, or the best setup on the 1mm RH offset grid (with the real aero model) if
+        none are"""
+    if objective not in objectiveSigns:
+        raise Exception("Unknown objective: " + str(objective))
+    objectiveIndex = AeroMap.metricNames.index(objective)
+    objectiveSign = objectiveSigns[objective]
+    aeroBalanceIndex = AeroMap.metricNames.index("aeroBalance")
+
+    frontRHTelem = np.asarray(frontRHTelem, dtype=float)
+    rearRHTelem = np.asarray(rearRHTelem, dtype=float)
+    velocityWeighting = np.power(np.asarray(groundSpeedTelem, dtype=float), velocityPower)
+
+    surrogate = AeroSurrogate(getSurrogateAeroMap(car, wingAngles, frontRHOffsetMin, frontRHOffsetMax, rearRHOffsetMin, rearRHOffsetMax, frontRHTelem, rearRHTelem, surrogateRHStep))
+
+    # The surrogate's weighted averages of the last RH offsets, as SLSQP asks for the objective and both constraints at
+    # the same RH offsets
+    lastEvaluation = [None, None, None]
+
+    def getWeightedAverages(RHOffsets):
+        RHOffsets = np.asarray(RHOffsets, dtype=float)
+        if lastEvaluation[0] is None or not np.array_equal(lastEvaluation[0], RHOffsets):
+            lastEvaluation[:] = [RHOffsets.copy()] + list(surrogate.getWeightedAverages(RHOffsets, frontRHTelem, rearRHTelem, velocityWeighting))
+        return lastEvaluation[1], lastEvaluation[2]
+
+    def getObjective(RHOffsets):
+        weightedAverages, gradients = getWeightedAverages(RHOffsets)
+        return -objectiveSign * weightedAverages[objectiveIndex], -objectiveSign * gradients[objectiveIndex]
+
+    def getConstraints(aeroBalanceCorrection):
+        """Returns the aero balance constraints in the form aeroBalanceTolerance - aeroBalanceMargin - |aeroBalance +
+            aeroBalanceCorrection - aeroBalanceTarget| >= 0 (split into 2, so they're differentiable)"""
+        constraints = []
+        for sign in [1, -1]:
+            constraints.append({"type": "ineq",
+                                "fun": lambda RHOffsets, sign=sign: aeroBalanceTolerance - aeroBalanceMargin - sign * (getWeightedAverages(RHOffsets)[0][aeroBalanceIndex] + aeroBalanceCorrection - aeroBalanceTarget),
+                                "jac": lambda RHOffsets, sign=sign: -sign * getWeightedAverages(RHOffsets)[1][aeroBalanceIndex]})
+        return constraints
+
+    bounds = [(frontRHOffsetMin, frontRHOffsetMax), (rearRHOffsetMin, rearRHOffsetMax)]
+    RHOffsetsMin = [frontRHOffsetMin, rearRHOffsetMin]
+    RHOffsetsMax = [frontRHOffsetMax, rearRHOffsetMax]
+
+    def optimise(RHOffsets, aeroBalanceCorrection):
+        result = minimize(getObjective, RHOffsets, jac=True, method="SLSQP", bounds=bounds, constraints=getConstraints(aeroBalanceCorrection))
+        return np.clip(result.x, RHOffsetsMin, RHOffsetsMax).tolist()
+
+    def getExactResults(RHOffsets):
+        return car.calculateAeroRHTelem(velocityPower, frontRHTelem + RHOffsets[0], rearRHTelem + RHOffsets[1], groundSpeedTelem, wingAngles=wingAngles)
+
+    # Starting points from the 1mm RH offset grid (the same grid as Car.optimiseAeroRHTelem()), ordered by aero balance
+    # error beyond the tolerance (so ones within the tolerances come first) and then by objective
+    RHOffsetStep = 0.001
+    startPoints = []
+    for frontRHOffset in getRHAxis(frontRHOffsetMin, frontRHOffsetMax, RHOffsetStep).tolist():
+        for rearRHOffset in getRHAxis(rearRHOffsetMin, rearRHOffsetMax, RHOffsetStep).tolist():
+            weightedAverages = surrogate.getWeightedAverages([frontRHOffset, rearRHOffset], frontRHTelem, rearRHTelem, velocityWeighting, withGradients=False)[0]
+            aeroBalanceError = max(abs(weightedAverages[aeroBalanceIndex] - aeroBalanceTarget) - aeroBalanceTolerance, 0)
+            startPoints.append([aeroBalanceError, -objectiveSign * weightedAverages[objectiveIndex], [frontRHOffset, rearRHOffset]])
+    startPoints.sort(key=lambda startPoint: startPoint[:2])
+
+    # Check the answers and the starting points with the real aero model, keeping the best one within the tolerances
+    bestRHOffsets = None
+    bestExactResults = None
+
+    def checkRHOffsets(RHOffsets):
+        """Returns the aero balance error of RHOffsets with the real aero model, and keeps them if they're the best
+            within the tolerances so far"""
+        nonlocal bestRHOffsets, bestExactResults
+        exactResults = getExactResults(RHOffsets)
+        if abs(exactResults[aeroBalanceIndex] - aeroBalanceTarget) <= aeroBalanceTolerance:
+            if bestExactResults is None or objectiveSign * (exactResults[objectiveIndex] - bestExactResults[objectiveIndex]) > 0:
+                bestRHOffsets = RHOffsets
+                bestExactResults = exactResults
+        return exactResults[aeroBalanceIndex]
+
+    for aeroBalanceError, objectiveValue, startRHOffsets in startPoints[:numStarts]:
+        checkRHOffsets(startRHOffsets)
+        RHOffsets = optimise(startRHOffsets, 0)
+        exactAeroBalance = checkRHOffsets(RHOffsets)
+        if abs(exactAeroBalance - aeroBalanceTarget) > aeroBalanceTolerance - aeroBalanceMargin:
+            # Correct the surrogate's aero balance by its error at the answer, and optimise again from there
+            aeroBalanceCorrection = exactAeroBalance - getWeightedAverages(RHOffsets)[0][aeroBalanceIndex]
+            checkRHOffsets(optimise(RHOffsets, aeroBalanceCorrection))
+
+    if bestRHOffsets is None:
+        # Fall back to the best setup on the 1mm RH offset grid with the real aero model
+        frontRHOffsets = getRHAxis(frontRHOffsetMin, frontRHOffsetMax, RHOffsetStep).tolist()
+        rearRHOffsets = getRHAxis(rearRHOffsetMin, rearRHOffsetMax, RHOffsetStep).tolist()
+        setupResults = car.evaluateSetups(frontRHOffsets, rearRHOffsets, [wingAngles], velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem)[0]
+        isValidSetup = np.abs(setupResults[..., aeroBalanceIndex] - aeroBalanceTarget) <= aeroBalanceTolerance
+        if not np.any(isValidSetup):
+            return None
+        rearRHOffsetIndex, frontRHOffsetIndex = np.unravel_index(np.argmax(np.where(isValidSetup, objectiveSign * setupResults[..., objectiveIndex], -np.inf)), isValidSetup.shape)
+        bestRHOffsets = [frontRHOffsets[frontRHOffsetIndex], rearRHOffsets[rearRHOffsetIndex]]
+        bestExactResults = getExactResults(bestRHOffsets)
+
+    surrogateResults = surrogate.getWeightedAverages(bestRHOffsets, frontRHTelem, rearRHTelem, velocityWeighting, withGradients=False)[0]
+    return [bestRHOffsets[0], bestRHOffsets[1], wingAngles, [float(value) for value in bestExactResults], surrogateResults.tolist()]
+
+
+def optimiseSurrogate(car, frontRHOffsetMin, frontRHOffsetMax, rearRHOffsetMin, rearRHOffsetMax, wingAnglesArray, aeroBalanceTarget, aeroBalanceTolerance, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, objective="totalClA", surrogateRHStep=0.001, numStarts=3, aeroBalanceMargin=0.001):
+    """Returns bestSetup, setups, where setups contains the best setup (from optimiseRHOffsetsSurrogate()) of each wing
+        angle combination in wingAnglesArray that has one, and bestSetup is the best of them (judged with the real aero
+        model), or None if there aren't any
+
+        Prints out each setup, with the difference between the surrogate and the real aero model"""
+    objectiveIndex = AeroMap.metricNames.index(objective) if objective in objectiveSigns else None
+    setups = []
+    bestSetup = None
+    print("Surrogate setups:")
+    for wingAngles in wingAnglesArray:
+        setup = optimiseRHOffsetsSurrogate(car, wingAngles, frontRHOffsetMin, frontRHOffsetMax, rearRHOffsetMin, rearRHOffsetMax, aeroBalanceTarget, aeroBalanceTolerance, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, objective, surrogateRHStep, numStarts, aeroBalanceMargin)
+        if setup is None:
+            continue
+        setups.append(setup)
+        frontRHOffset, rearRHOffset, wingAngles, exactResults, surrogateResults = setup
+        print("\tWing angles:", wingAngles, "\tRH offsets [F, R] (mm):", [round(frontRHOffset * 1000, 3), round(rearRHOffset * 1000, 3)],
+              "\t" + objective + ":", round(exactResults[objectiveIndex], 4), "\tAero balance %:", round(exactResults[5], 3),
+              "\tSurrogate error:", round(surrogateResults[objectiveIndex] - exactResults[objectiveIndex], 6))
+        if bestSetup is None or objectiveSigns[objective] * (exactResults[objectiveIndex] - bestSetup[3][objectiveIndex]) > 0:
+            bestSetup = setup
+
+    return bestSetup, setups
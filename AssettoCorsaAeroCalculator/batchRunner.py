@@ -0,0 +1,159 @@
+"""
+Runs a batch of aero map and setup optimisation jobs from a JSON manifest, instead of editing the INPUTS of
+aeroMaps.py, aeroMapRHEnvelope.py or main.py and re-running them for every job
+
+Each distinct car and telemetry file is only loaded once, and shared by every job that uses it - jobs are either run
+one after another, or (if numWorkers is more than 1) the jobs are split into groups that share the same car and
+telemetry file, and the groups are run in parallel processes
+
+Manifest format (ride heights and RH offsets in metres, like the rest of the scripts):
+{
+    "carsDirectory": "C:\\Program Files (x86)\\Steam\\steamapps\\common\\assettocorsa\\content\\cars",
+    "aeroMapCacheDirectory": "aeroMapCache",    (optional, null disables caching aero maps)
+    "numWorkers": 1,                            (optional, the number of job groups run in parallel)
+    "jobs": [
+        {
+            "type": "aeroMaps",
+            "carName": "ks_porsche_911_gt1",
+            "saveDirectory": "plots",
+            "frontRHMin": 0, "frontRHMax": 0.1, "rearRHMin": 0, "rearRHMax": 0.1, "RHStep": 0.001,
+            "colliderMargin": 0,
+            "wingAnglesArray": [[0, 2, 6, 1]],
+            "telemFile": "C:\\Users\\Willow\\Downloads\\911 gt1 silvo.csv",     (optional, adds the RH envelope)
+            "smoothingPoints": 2, "telemDataFiltering": "all", "is2WD": true,   (optional)
+            "numRenderWorkers": 1, "streaming": false,                          (optional)
+            "skipUnchanged": false,                                             (optional, see Car.plotAeroMaps())
+            "adaptiveTolerance": 0.0001,                                        (optional, see Car.getAeroMap())
+            "envelopeMargin": 0.005                                             (optional, needs telemFile, see Car.plotAeroMaps())
+        },
+        {
+            "type": "optimise",
+            "carName": "ks_porsche_911_gt1",
+            "telemFile": "C:\\Users\\Willow\\Downloads\\911 gt1 silvo.csv",
+            "smoothingPoints": 2, "telemDataFiltering": "all", "is2WD": true,   (optional)
+            "frontRHOffsetMin": 0, "frontRHOffsetMax": 0.002, "rearRHOffsetMin": 0, "rearRHOffsetMax": 0.002,
+            "wingAnglesArray": [[0, 2, 6, 1], [0, 2, 7, 1]],                  (or "setup" for every combination in setup.ini)
+            "aeroBalanceTarget": 43.2, "aeroBalanceTolerance": 0.5, "velocityPower": 1,
+            "method": "exact", "histogramRHStep": 0.001, "numWorkers": 1,     (optional)
+            "lookupRHStep": 0.001, "useThreads": false,                         (optional)
+            "contourBalanceMargin": 0,                                          (optional)
+            "resultsFile": "results.json"                                       (optional)
+        }
+    ]
+}
+
+telemDataFiltering is "all" or "cornering" (see aeroMapRHEnvelope.py)
+"""
+import concurrent.futures
+import json
+import os
+import sys
+from aeroMapCache import AeroMapCache
+from car import Car, getRHEnvelope2D
+from telemData import processTelem, readMoTeCTelem
+
+"""INPUTS"""
+manifestFilePath = sys.argv[1] if len(sys.argv) > 1 else "batchManifest.json"
+"""END OF INPUTS"""
+
+
+class BatchRunner:
+    def __init__(self, carsDirectory, aeroMapCacheDirectory=None):
+        """Runs jobs (see the manifest format at the top of this file), loading each car and telemetry file only once"""
+        self.carsDirectory = carsDirectory
+        self.aeroMapCache = AeroMapCache(aeroMapCacheDirectory) if aeroMapCacheDirectory is not None else None
+        self.cars = {}          # Cars by car name
+        self.rawTelem = {}      # readMoTeCTelem() outputs by telemetry file path
+        self.telem = {}         # processTelem() outputs by (telemetry file path, smoothingPoints, filtering, is2WD)
+
+    def getCar(self, carName):
+        """Returns the Car carName, which is only loaded the first time it's used"""
+        if carName not in self.cars:
+            self.cars[carName] = Car(self.carsDirectory, carName, self.aeroMapCache)
+        return self.cars[carName]
+
+    def getTelem(self, job):
+        """Returns groundSpeedTelem, frontRHTelem, rearRHTelem for the telemetry settings of job, where the telemetry
+            file is only read the first time it's used"""
+        telemFilePath = job["telemFile"]
+        telemKey = (telemFilePath, job.get("smoothingPoints", 2), job.get("telemDataFiltering", "all"), job.get("is2WD", True))
+        if telemKey not in self.telem:
+            if telemFilePath not in self.rawTelem:
+                self.rawTelem[telemFilePath] = readMoTeCTelem(telemFilePath)
+            self.telem[telemKey] = processTelem(self.rawTelem[telemFilePath], *telemKey[1:])
+        return self.telem[telemKey]
+
+    def runJob(self, job):
+        """Runs job, and returns its results (None for aero map jobs, or a dictionary of the optimiser outputs for
+            optimisation jobs, which is also saved to the job's resultsFile if it has one)"""
+        car = self.getCar(job["carName"])
+
+        if job["type"] == "aeroMaps":
+            RHEnvelope2D = None
+            if job.get("telemFile") is not None:
+                groundSpeedTelem, frontRHTelem, rearRHTelem = self.getTelem(job)
+                RHEnvelope2D = getRHEnvelope2D(job["frontRHMin"], job["frontRHMax"], job["rearRHMin"], job["rearRHMax"], job["RHStep"], frontRHTelem, rearRHTelem)
+            os.makedirs(job["saveDirectory"], exist_ok=True)
+            car.plotAeroMaps(job["saveDirectory"], job["frontRHMin"], job["frontRHMax"], job["rearRHMin"], job["rearRHMax"], job["RHStep"], job.get("colliderMargin", 0), job["wingAnglesArray"], RHEnvelope2D, numRenderWorkers=job.get("numRenderWorkers"), streaming=job.get("streaming", False), skipUnchanged=job.get("skipUnchanged", False), adaptiveTolerance=job.get("adaptiveTolerance"), envelopeMargin=job.get("envelopeMargin"))
+            return None
+
+        if job["type"] == "optimise":
+            groundSpeedTelem, frontRHTelem, rearRHTelem = self.getTelem(job)
+            wingAnglesArray = job["wingAnglesArray"]
+            if wingAnglesArray == "setup":
+                wingAnglesArray = car.generateWingAngles(job["aeroBalanceTarget"], job["aeroBalanceTolerance"], frontRHTelem, rearRHTelem, job["frontRHOffsetMin"], job["frontRHOffsetMax"], job["rearRHOffsetMin"], job["rearRHOffsetMax"])
+            validSetups, maxTotalClASetup, minTotalCdASetup, maxEfficiencySetup, paretoSetups = car.optimiseAeroRHTelem(job["frontRHOffsetMin"], job["frontRHOffsetMax"], job["rearRHOffsetMin"], job["rearRHOffsetMax"], wingAnglesArray, job["aeroBalanceTarget"], job["aeroBalanceTolerance"], job.get("velocityPower", 1), frontRHTelem, rearRHTelem, groundSpeedTelem, job.get("method", "exact"), job.get("histogramRHStep", 0.001), job.get("numWorkers"), job.get("lookupRHStep", 0.001), job.get("useThreads", False), contourBalanceMargin=job.get("contourBalanceMargin", 0))
+            results = {"validSetups": validSetups, "maxTotalClASetup": maxTotalClASetup,
+                       "minTotalCdASetup": minTotalCdASetup, "maxEfficiencySetup": maxEfficiencySetup,
+                       "paretoSetups": paretoSetups}
+            if job.get("resultsFile") is not None:
+                with open(job["resultsFile"], "w") as resultsFile:
+                    json.dump(results, resultsFile, indent=4)
+            return results
+
+        raise Exception("Unknown job type: " + str(job["type"]))
+
+
+def runJobGroup(carsDirectory, aeroMapCacheDirectory, indexedJobs):
+    """Runs a group of jobs (in the form [[jobIndex, job], ...]) with one BatchRunner, and returns
+        [[jobIndex, results], ...] - used to run each group of jobs in a separate process"""
+    batchRunner = BatchRunner(carsDirectory, aeroMapCacheDirectory)
+    return [[jobIndex, batchRunner.runJob(job)] for jobIndex, job in indexedJobs]
+
+
+def runManifest(manifest):
+    """Runs all the jobs in manifest (a dictionary in the manifest format at the top of this file), and returns an array
+        of the results of each job (see BatchRunner.runJob())"""
+    carsDirectory = manifest["carsDirectory"]
+    aeroMapCacheDirectory = manifest.get("aeroMapCacheDirectory")
+    numWorkers = manifest.get("numWorkers", 1)
+    jobs = manifest["jobs"]
+
+    if numWorkers is None or numWorkers <= 1:
+        batchRunner = BatchRunner(carsDirectory, aeroMapCacheDirectory)
+        jobResults = []
+        for jobIndex in range(len(jobs)):
+            print("\nRunning job", jobIndex + 1, "of", len(jobs), "(" + jobs[jobIndex]["type"] + ", " + jobs[jobIndex]["carName"] + ")")
+            jobResults.append(batchRunner.runJob(jobs[jobIndex]))
+        return jobResults
+
+    # Group the jobs that share a car and telemetry file, so each group only loads them once in its process
+    jobGroups = {}
+    for jobIndex in range(len(jobs)):
+        groupKey = (jobs[jobIndex]["carName"], jobs[jobIndex].get("telemFile"))
+        jobGroups.setdefault(groupKey, []).append([jobIndex, jobs[jobIndex]])
+
+    jobResults = [None] * len(jobs)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=numWorkers) as executor:
+        futures = [executor.submit(runJobGroup, carsDirectory, aeroMapCacheDirectory, indexedJobs) for indexedJobs in jobGroups.values()]
+        for future in concurrent.futures.as_completed(futures):
+            for jobIndex, results in future.result():
+                jobResults[jobIndex] = results
+                print("Finished job", jobIndex + 1, "of", len(jobs))
+    return jobResults
+
+
+if __name__ == "__main__":
+    with open(manifestFilePath, "r") as manifestFile:
+        batchManifest = json.load(manifestFile)
+    runManifest(batchManifest)
@@ -5,8 +5,6 @@ main.py is for specifying what to do (i.e. what car to look at, whether to plot
 
 To Do:
     - Add to optimiseAeroRHTelem():
-        - Something to get the aero maps of all the wing angle combinations, then linearly interpolate to find the aero
-            numbers - should be faster than calculating the aero for every ride height
         - An array argument that allows aero balance for that telemetry data point to be ignored if the array element is
             0 or something
             - Mostly to allow drag/efficiency to be quantified for weird tracks like ovals (considering ride heights in
@@ -37,8 +35,14 @@ To Do:
     - Add Fin class for dealing with fins in aero.ini
         - Would just assume yaw to be 0 atm though
 """
+import bisect
+import concurrent.futures
+import hashlib
+import itertools
+import json
 import math
-import matplotlib.pyplot as plt
+import os
+from multiprocessing import shared_memory
 import numpy as np
 
 
@@ -47,32 +51,102 @@ def linearInterpolate(x, x1, x2, y1, y2):
     return y1 + ((x - x1) * (y2 - y1) / (x2 - x1))
 
 
+class LookupTable:
+    def __init__(self, LUT):
+        """Compiles a LUT in the form [[x0, y0], [x1, y1], [x2, y2], ...] into NumPy arrays sorted by x, so it only has
+            to be parsed once and can then be read many times"""
+        LUT = np.asarray(LUT, dtype=float).reshape(-1, 2)
+        sortedIndexes = np.argsort(LUT[:, 0], kind="stable")
+        self.xArray = LUT[sortedIndexes, 0]
+        self.yArray = LUT[sortedIndexes, 1]
+
+        # Python lists of the same data, as bisect is much faster than NumPy for reading single values
+        self.xList = self.xArray.tolist()
+        self.yList = self.yArray.tolist()
+
+    def __len__(self):
+        return len(self.xList)
+
+    def __getitem__(self, index):
+        """Returns the LUT entry [x, y] at index, so it can still be used like the 2D array form of the LUT"""
+        return [self.xList[index], self.yList[index]]
+
+    def read(self, x):
+        """Returns the LUT value of y for the supplied value of x, using linear interpolation between LUT entries
+            Uses a binary search (O(log n)) to find the LUT entries surrounding x
+            If the x value supplied is beyond the range of the LUT, y value of the nearest x value will be returned"""
+        # Check if the x value is within the range of the LUT
+        if x <= self.xList[0]:
+            return self.yList[0]
+        if x >= self.xList[-1]:
+            return self.yList[-1]
+
+        # Search for the indexes that surround the x value (the upper index is the first x that is >= the x value)
+        upperIndex = bisect.bisect_left(self.xList, x)
+        lowerIndex = upperIndex - 1
+
+        # Return the linear interpolation between the lower and upper indexes
+        return linearInterpolate(x, self.xList[lowerIndex], self.xList[upperIndex], self.yList[lowerIndex],
+                                 self.yList[upperIndex])
+
+    def readArray(self, xArray):
+        """Returns an array of the LUT values of y for every x value in xArray (any shape), with the same linear
+            interpolation and end clamping as read()"""
+        return np.interp(xArray, self.xArray, self.yArray)
+
+    def readValues(self, x):
+        """Returns read(x) if x is a single value (the binary search is much faster than NumPy for one value),
+            otherwise readArray(x)"""
+        if np.ndim(x) == 0:
+            return self.read(x)
+        return self.readArray(x)
+
+
 def readLUT(x, LUT):
     """Returns the LUT value of y for the supplied value of x, using linear interpolation between LUT entries
-       LUT defined as [[x0, y1], [x1, y1], [x2, y2], ...], where x is in ascending order
+       LUT defined as [[x0, y1], [x1, y1], [x2, y2], ...] (or a LookupTable), where x is in ascending order
        If the x value supplied is beyond the range of the LUT, y value of the nearest x value will be returned"""
+    if isinstance(LUT, LookupTable):
+        return LUT.read(x)
+
     # Check if the x value is within the range of the LUT
     if x <= LUT[0][0]:
         return LUT[0][1]
     if x >= LUT[len(LUT) - 1][0]:
         return LUT[len(LUT) - 1][1]
 
-    # Search for the indexes that surround the x value (search for upper index, but lowerIndex = upperIndex - 1)
-    upperIndex = 0
-    found = False
-    while upperIndex < len(LUT) - 1 and not found:
-        upperIndex += 1
-        if LUT[upperIndex][0] >= x:
-            found = True
-    lowerIndex = upperIndex - 1
+    # Binary search for the upper index (the first x that is >= the x value), as the LUT is already in ascending order
+    lowerIndex = 0
+    upperIndex = len(LUT) - 1
+    while upperIndex - lowerIndex > 1:
+        middleIndex = (lowerIndex + upperIndex) // 2
+        if LUT[middleIndex][0] >= x:
+            upperIndex = middleIndex
+        else:
+            lowerIndex = middleIndex
 
     # Return the linear interpolation between the lower and upper indexes
     return linearInterpolate(x, LUT[lowerIndex][0], LUT[upperIndex][0], LUT[lowerIndex][1], LUT[upperIndex][1])
 
 
-def readLUTFile(LUTFilePath):
-    """Reads the LUT file defined by LUTFilePath and returns the LUT in the form of a 2D array
-        If passed an file path that doesn't end with ".lut", returns the unit LUT unitLUT = [[0, 1], [1, 1]]"""
+def readLUTArray(xArray, LUT):
+    """Returns an array of the LUT values of y for every x value in xArray (any shape), with the same linear
+        interpolation and end clamping as readLUT()"""
+    if not isinstance(LUT, LookupTable):
+        LUT = LookupTable(LUT)
+    return LUT.readArray(xArray)
+
+
+def readLUTFile(LUTFilePath, LUTCache=None):
+    """Reads the LUT file defined by LUTFilePath and returns the LUT in the form of a LookupTable
+        If passed an file path that doesn't end with ".lut", returns the unit LUT unitLUT = [[0, 1], [1, 1]]
+
+        If LUTCache (a dictionary) is passed in, LUTs already in it are returned without reading the file again, and
+        newly read LUTs are added to it - so wings that use the same LUT file share one LookupTable"""
+    LUTKey = os.path.normcase(os.path.normpath(LUTFilePath))
+    if LUTCache is not None and LUTKey in LUTCache:
+        return LUTCache[LUTKey]
+
     # Check if LUTFilePath is a LUT file
     if LUTFilePath.lower().endswith(".lut"):
         LUTFile = open(LUTFilePath, "r")
@@ -83,9 +157,13 @@ def readLUTFile(LUTFilePath):
                 data = dataString.split("|")
                 LUT.append([float(data[0]), float(data[1])])
         LUTFile.close()
-        return LUT
+        LUT = LookupTable(LUT)
     else:
-        return [[0, 1], [1, 1]]
+        LUT = LookupTable([[0, 1], [1, 1]])
+
+    if LUTCache is not None:
+        LUTCache[LUTKey] = LUT
+    return LUT
 
 
 def clipArrayData(dataArray, lowerBound, upperBound):
@@ -115,55 +193,294 @@ def clipArrayData2D(dataArray2D, lowerBound, upperBound):
     return dataArray2D
 
 
-def getRHEnvelope2D(frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, frontRHTelem, rearRHTelem):
-    """Returns the 2D array RHEnvelope2D
+def getRHAxis(RHMin, RHMax, RHStep):
+    """Returns a NumPy array of the ride heights from RHMin to RHMax (inclusive) in increments of RHStep
+        The ride heights are calculated from integer indexes (RHMin + index * RHStep) rather than by repeatedly adding
+        RHStep, so they don't drift due to floating point maths"""
+    numSteps = int(round((RHMax - RHMin) / RHStep))
+    return RHMin + RHStep * np.arange(numSteps + 1)
 
-        frontRHTelem and rearRHTelem must be 1D arrays of the same length, and in metres
 
-        A ride height combination will be within the envelope if it rounds to the same mm as a telemetry ride height"""
-    RHEnvelope2D = []
+def getGridPosition(RHArray, RH):
+    """Returns RHIndexes, RHFractions, where RHArray is a uniformly spaced 1D array of grid ride heights, such that each
+        ride height in RH (a single value or a NumPy array) is between RHArray[RHIndexes] and RHArray[RHIndexes + 1],
+        RHFractions of the way along - ride heights outside the grid are moved to the nearest edge of the grid"""
+    if len(RHArray) == 1:
+        return np.zeros(np.shape(RH), dtype=int), np.zeros(np.shape(RH))
+    RHPositions = np.clip((np.asarray(RH, dtype=float) - RHArray[0]) / (RHArray[1] - RHArray[0]), 0, len(RHArray) - 1)
+    RHIndexes = np.minimum(np.floor(RHPositions).astype(int), len(RHArray) - 2)
+    return RHIndexes, RHPositions - RHIndexes
 
-    # Round each value in frontRHTelem and rearRHTelem to the nearest integer
-    frontRHTelem = [round(i, 3) for i in frontRHTelem]
-    rearRHTelem = [round(i, 3) for i in rearRHTelem]
 
-    # Create an array storing each (rounded) telemetry ride height combo - [[frontRH, rearRH], [frontRH2, rearRH2], ...]
-    telemRHCombinations = []
-    for i in range(len(frontRHTelem)):
-        telemRHCombinations.append([frontRHTelem[i], rearRHTelem[i]])
+def roundToMM(RHArray):
+    """Returns a NumPy integer array of the ride heights in RHArray (in metres) rounded to the nearest integer mm, the
+        same as round(RH, 3) - which rounds the exact binary value of each float, so a ride height half way between two
+        mm (e.g. 0.0125) goes whichever way its float is closer to
 
-    """# Turn telemRHCombinations into a set for faster searching
-    telemRHCombinations = set(telemRHCombinations)"""
+        RH * 1000 isn't exact, so only the ride heights that aren't close to half way between two mm are rounded with
+        NumPy, and the rest are rounded with round()"""
+    RHArray = np.asarray(RHArray, dtype=float)
+    RHArrayMM = RHArray * 1000
+    roundedRHArrayMM = np.floor(RHArrayMM + 0.5)
+    isNearHalfMM = np.abs(RHArrayMM - np.floor(RHArrayMM) - 0.5) < 1e-6
+    roundedRHArrayMM[isNearHalfMM] = [round(round(RH, 3) * 1000) for RH in RHArray[isNearHalfMM].tolist()]
+    return roundedRHArrayMM.astype(np.int64)
 
-    # Floating point maths reasons
-    RHMargin = RHStep / 2
 
-    rearRH = rearRHMin
-    while rearRH <= rearRHMax + RHMargin:
-        # Add a new row to the 2D array to represent a new rear RH
-        RHEnvelope2D.append([])
+def getRHEnvelope2D(frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, frontRHTelem, rearRHTelem, weights=None,
+                    returnDensity=False):
+    """Returns the 2D array RHEnvelope2D, or RHEnvelope2D, density2D if returnDensity is True
 
-        frontRH = frontRHMin
-        while frontRH <= frontRHMax + RHMargin:
-            # If the ride height combination is in the telemRHCombinations set
-            if [round(frontRH, 3), round(rearRH, 3)] in telemRHCombinations:
-                RHEnvelope2D[-1].append(1)
-            else:
-                RHEnvelope2D[-1].append(0)
-            frontRH += RHStep
-        rearRH += RHStep
+        frontRHTelem and rearRHTelem must be 1D arrays of the same length, and in metres
 
+        A ride height combination will be within the envelope if it rounds to the same mm as a telemetry ride height
+
+        density2D is the density of the telemetry ride heights on the grid, per mm^2 of ride height - the sum of weights
+            of the telemetry ride heights nearest to each ride height combination (i.e. within the RHStep by RHStep
+            cell centred on it), as a fraction of the total weight of all the telemetry, divided by the area of the cell
+            in mm^2. So it adds up to 1 / (RHStep in mm)^2 over a grid covering all the telemetry, whatever RHStep is
+            (and with a 1mm RHStep it's just the fraction in each cell). With weights=None it's the density of
+            telemetry samples (dwell time, for a constant sample rate), and with weights set to the sample durations or
+            speed^(velocity power) it's the dwell time or speed weighted density
+
+        The telemetry is binned directly onto the grid in one pass (with np.bincount), rather than searching the
+            telemetry for every ride height combination"""
+    frontRHTelem = np.asarray(frontRHTelem, dtype=float)
+    rearRHTelem = np.asarray(rearRHTelem, dtype=float)
+    if weights is None:
+        weights = np.ones(len(frontRHTelem))
+    else:
+        weights = np.asarray(weights, dtype=float)
+
+    # Round the ride heights of the grid (the same ride height grid as getAeroMap(), calculated from integer indexes)
+    # and the telemetry to the nearest integer mm, the same as round(RH, 3) - so grid ride heights half way between two
+    # mm (e.g. with a 0.5 mm RHStep) go whichever way their float is closer to (e.g. 0.0025 rounds up and 0.0055 rounds
+    # down)
+    frontRHArray = getRHAxis(frontRHMin, frontRHMax, RHStep)
+    rearRHArray = getRHAxis(rearRHMin, rearRHMax, RHStep)
+    frontRHGridMM = roundToMM(frontRHArray)
+    rearRHGridMM = roundToMM(rearRHArray)
+    frontRHTelemMM = roundToMM(frontRHTelem)
+    rearRHTelemMM = roundToMM(rearRHTelem)
+
+    # Bin the telemetry on the mm grid covering the ride height grid, ignoring the telemetry outside it
+    frontMMMin, rearMMMin = frontRHGridMM.min(), rearRHGridMM.min()
+    numFrontMM = frontRHGridMM.max() - frontMMMin + 1
+    numRearMM = rearRHGridMM.max() - rearMMMin + 1
+    frontBinIndexes = frontRHTelemMM - frontMMMin
+    rearBinIndexes = rearRHTelemMM - rearMMMin
+    isInGrid = (frontBinIndexes >= 0) & (frontBinIndexes < numFrontMM) & (rearBinIndexes >= 0) & (rearBinIndexes < numRearMM)
+    binCounts = np.bincount(rearBinIndexes[isInGrid] * numFrontMM + frontBinIndexes[isInGrid],
+                            minlength=numRearMM * numFrontMM).reshape(numRearMM, numFrontMM)
+
+    # Look up the mm bin of each ride height combination
+    RHEnvelope2D = (binCounts[np.ix_(rearRHGridMM - rearMMMin, frontRHGridMM - frontMMMin)] > 0).astype(int)
+
+    if returnDensity:
+        # Bin the telemetry on the grid itself, by the nearest ride height combination
+        frontGridIndexes = np.floor((frontRHTelem - frontRHArray[0]) / RHStep + 0.5).astype(np.int64)
+        rearGridIndexes = np.floor((rearRHTelem - rearRHArray[0]) / RHStep + 0.5).astype(np.int64)
+        isInGrid = ((frontGridIndexes >= 0) & (frontGridIndexes < len(frontRHArray))
+                    & (rearGridIndexes >= 0) & (rearGridIndexes < len(rearRHArray)))
+        gridWeights = np.bincount(rearGridIndexes[isInGrid] * len(frontRHArray) + frontGridIndexes[isInGrid],
+                                  weights=weights[isInGrid], minlength=RHEnvelope2D.size).reshape(RHEnvelope2D.shape)
+        totalWeight = np.sum(weights)
+        density2D = gridWeights / (totalWeight * (RHStep * 1000) ** 2) if totalWeight != 0 else np.zeros(RHEnvelope2D.shape)
+        return RHEnvelope2D, density2D
     return RHEnvelope2D
 
 
+def dilateRHEnvelope2D(RHEnvelope2D, numSteps):
+    """Returns a 2D boolean array of the ride height combinations within numSteps grid steps (in both front and rear RH)
+        of the envelope RHEnvelope2D (from getRHEnvelope2D())"""
+    isInEnvelope2D = np.asarray(RHEnvelope2D, dtype=bool)
+    for step in range(numSteps):
+        dilatedEnvelope2D = isInEnvelope2D.copy()
+        dilatedEnvelope2D[1:, :] |= isInEnvelope2D[:-1, :]
+        dilatedEnvelope2D[:-1, :] |= isInEnvelope2D[1:, :]
+        isInEnvelope2D = dilatedEnvelope2D.copy()
+        isInEnvelope2D[:, 1:] |= dilatedEnvelope2D[:, :-1]
+        isInEnvelope2D[:, :-1] |= dilatedEnvelope2D[:, 1:]
+    return isInEnvelope2D
+
+
+def getContourSegments(xArray, yArray, array2D, level):
+    """Returns segments, cellIndexes for the contour of array2D at level, found with marching squares, where array2D is
+        in the form array2D[y][x] on the grid given by the 1D arrays xArray and yArray
+
+        segments is a NumPy array of shape (number of segments, 2, 2) of the ends of each straight line segment of the
+        contour, in the form [[x1, y1], [x2, y2]], and cellIndexes is the [yIndex, xIndex] of the grid cell (the
+        bottom left corner) that each segment is in
+
+        All the grid cells are processed at once - the contour crosses each cell edge whose ends are on opposite sides
+        of level, at the point linearly interpolated between them. A cell with all 4 edges crossed (a saddle) is split
+        using the average of its corners"""
+    xArray = np.asarray(xArray, dtype=float)
+    yArray = np.asarray(yArray, dtype=float)
+    values2D = np.asarray(array2D, dtype=float) - level
+    isAbove2D = values2D >= 0
+
+    # Corner values of each cell, going anticlockwise from the bottom left
+    cornerValues = [values2D[:-1, :-1], values2D[:-1, 1:], values2D[1:, 1:], values2D[1:, :-1]]
+    cornerIsAbove = [isAbove2D[:-1, :-1], isAbove2D[:-1, 1:], isAbove2D[1:, 1:], isAbove2D[1:, :-1]]
+    x1, x2 = xArray[None, :-1], xArray[None, 1:]
+    y1, y2 = yArray[:-1, None], yArray[1:, None]
+    cornerPositions = [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+
+    # Where the contour crosses each edge (bottom, right, top, left), in the form [edge][x or y][yIndex][xIndex]
+    edgeCrossings = []
+    edgeIsCrossed = []
+    for edge in range(4):
+        startValue, endValue = cornerValues[edge], cornerValues[(edge + 1) % 4]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fraction = np.where(startValue != endValue, startValue / (startValue - endValue), 0.5)
+        startPosition, endPosition = cornerPositions[edge], cornerPositions[(edge + 1) % 4]
+        edgeCrossings.append([startPosition[i] + fraction * (endPosition[i] - startPosition[i]) for i in range(2)])
+        edgeIsCrossed.append(cornerIsAbove[edge] != cornerIsAbove[(edge + 1) % 4])
+    edgeCrossings = np.array([np.broadcast_arrays(*edgeCrossing) for edgeCrossing in edgeCrossings])
+    edgeIsCrossed = np.array(edgeIsCrossed)
+    numCrossedEdges = np.sum(edgeIsCrossed, axis=0)
+
+    # Cells with 2 crossed edges have one segment between them
+    segments = []
+    cellIndexes = []
+    singleCells = np.argwhere(numCrossedEdges == 2)
+    if len(singleCells) > 0:
+        crossedEdges = np.argwhere(edgeIsCrossed[:, singleCells[:, 0], singleCells[:, 1]].T)[:, 1].reshape(-1, 2)
+        for end in range(2):
+            segments.append(edgeCrossings[crossedEdges[:, end], :, singleCells[:, 0], singleCells[:, 1]])
+        segments = [np.stack(segments, axis=1)]
+        cellIndexes.append(singleCells)
+
+    # Saddle cells have two segments, each cutting off a pair of opposite corners
+    saddleCells = np.argwhere(numCrossedEdges == 4)
+    if len(saddleCells) > 0:
+        rowIndexes, columnIndexes = saddleCells[:, 0], saddleCells[:, 1]
+        centreIsAbove = np.mean([cornerValue[rowIndexes, columnIndexes] for cornerValue in cornerValues], axis=0) >= 0
+        # If the centre is on the same side as the bottom left corner, the bottom right and top left corners are cut off
+        isBottomLeftSide = centreIsAbove == cornerIsAbove[0][rowIndexes, columnIndexes]
+        for firstEdges, secondEdges in [[[0, 1], [0, 3]], [[2, 3], [1, 2]]]:
+            startEdges = np.where(isBottomLeftSide, firstEdges[0], secondEdges[0])
+            endEdges = np.where(isBottomLeftSide, firstEdges[1], secondEdges[1])
+            segments.append(np.stack([edgeCrossings[startEdges, :, rowIndexes, columnIndexes],
+                                      edgeCrossings[endEdges, :, rowIndexes, columnIndexes]], axis=1))
+            cellIndexes.append(saddleCells)
+
+    if len(segments) == 0:
+        return np.zeros((0, 2, 2)), np.zeros((0, 2), dtype=int)
+    return np.concatenate(segments), np.concatenate(cellIndexes)
+
+
+def getParetoFront(objectives, numPrefilterBins=64):
+    """Returns the indexes (in ascending order) of the non-dominated rows of objectives, a 2D array in the form
+        [point][objective] with 2 or 3 objectives that are all minimised - a point is dominated if another point is at
+        least as good in every objective and better in at least one. Points with identical objectives are only returned
+        once (the first of them)
+
+        The points are sorted by the objectives (so a point can only be dominated by points before it). With 2
+        objectives, a point is non-dominated if its second objective is below the minimum of all the points before it,
+        which is O(n log n)
+
+        With 3 objectives, the points are first binned by the rank of each objective into numPrefilterBins bins per
+        objective, and a point is dropped if any point is in a bin below it in all 3 objectives (which always dominates
+        it) - usually leaving only a small fraction of the points. The rest are compared with divide and conquer: at
+        each of the log n levels, the points are split into blocks of 2 halves, and each point in the second half of a
+        block is dominated if a point in the first half with a lower or equal second objective has a lower or equal
+        third objective - found for every block at once by sorting by block and second objective, and taking a running
+        minimum of the third objective of the first halves. That's O(n log n) per level, so O(n log^2 n) in the worst
+        case (when every point is non-dominated), all in NumPy"""
+    objectives = np.asarray(objectives, dtype=float)
+    if objectives.ndim != 2 or objectives.shape[1] not in [2, 3]:
+        raise Exception("Pareto fronts need 2 or 3 objectives, not " + str(objectives.shape[1:]))
+    if len(objectives) == 0:
+        return np.zeros(0, dtype=int)
+
+    # Sort the points lexicographically by their objectives, then remove duplicates (the stable sort keeps the first)
+    sortedIndexes = np.lexsort(objectives.T[::-1])
+    sortedObjectives = objectives[sortedIndexes]
+    isUnique = np.ones(len(sortedIndexes), dtype=bool)
+    isUnique[1:] = np.any(sortedObjectives[1:] != sortedObjectives[:-1], axis=1)
+    sortedIndexes = sortedIndexes[isUnique]
+    sortedObjectives = sortedObjectives[isUnique]
+    numPoints = len(sortedIndexes)
+
+    if objectives.shape[1] == 2:
+        previousMins = np.minimum.accumulate(sortedObjectives[:, 1])
+        isNonDominated = np.ones(numPoints, dtype=bool)
+        isNonDominated[1:] = sortedObjectives[1:, 1] < previousMins[:-1]
+        return np.sort(sortedIndexes[isNonDominated])
+
+    # Bin the points by the rank of each objective (a lower rank never has a higher objective, so a point in a lower bin
+    # in all 3 objectives is at least as good in all 3, and it's a different point, so it dominates)
+    bins = [np.arange(numPoints) * numPrefilterBins // numPoints]
+    for objectiveIndex in [1, 2]:
+        ranks = np.empty(numPoints, dtype=np.int64)
+        ranks[np.argsort(sortedObjectives[:, objectiveIndex])] = np.arange(numPoints)
+        bins.append(ranks * numPrefilterBins // numPoints)
+    isOccupied = np.zeros((numPrefilterBins, numPrefilterBins, numPrefilterBins), dtype=bool)
+    isOccupied[bins[0], bins[1], bins[2]] = True
+    for axis in range(3):
+        isOccupied = np.logical_or.accumulate(isOccupied, axis=axis)
+    isInLowerBins = np.all(np.array(bins) > 0, axis=0)
+    isInLowerBins[isInLowerBins] = isOccupied[bins[0][isInLowerBins] - 1, bins[1][isInLowerBins] - 1, bins[2][isInLowerBins] - 1]
+    sortedIndexes = sortedIndexes[~isInLowerBins]
+    sortedObjectives = sortedObjectives[~isInLowerBins]
+    numPoints = len(sortedIndexes)
+
+    # Ranks of the last 2 objectives (the second objective's ties are broken by position, so first halves come first)
+    positions = np.arange(numPoints)
+    secondRanks = np.empty(numPoints, dtype=np.int64)
+    secondRanks[np.lexsort((positions, sortedObjectives[:, 1]))] = positions
+    thirdRanks = np.unique(sortedObjectives[:, 2], return_inverse=True)[1].reshape(-1).astype(float)
+
+    isDominated = np.zeros(numPoints, dtype=bool)
+    order = np.argsort(secondRanks)
+    level = 0
+    while (1 << level) < numPoints:
+        blocks = positions >> (level + 1)
+        # The previous order is already sorted within each half, so this stable sort only has to merge them
+        order = order[np.argsort((blocks * numPoints + secondRanks)[order], kind="stable")]
+        orderedBlocks = blocks[order]
+        isSecondHalf = ((order >> level) & 1).astype(bool)
+
+        # Running minimum of the third objective ranks of the first halves, offset by block so each block's minimum
+        # is only affected by the points in that block (every earlier block's offset ranks are higher)
+        runningMins = np.minimum.accumulate(np.where(isSecondHalf, np.inf, thirdRanks[order] - orderedBlocks * float(numPoints)))
+        isDominated[order[isSecondHalf & (runningMins + orderedBlocks * float(numPoints) <= thirdRanks[order])]] = True
+        level += 1
+
+    return np.sort(sortedIndexes[~isDominated])
+
+
 def GHTransform(position, CGHeight, rake):
-    """Returns the ground height of the point (in metres), accounting for rake, assuming no roll"""
-    return CGHeight + position[1] - (position[2] * math.sin(math.radians(rake)))
+    """Returns the ground height of the point (in metres), accounting for rake, assuming no roll
+        CGHeight and rake can either be single values or NumPy arrays"""
+    return CGHeight + position[1] - (position[2] * np.sin(np.radians(rake)))
 
 
 def posZTransform(position, rake):
-    """Returns the z position of the point relative to the CG, accounting for rake, assuming no roll"""
-    return position[2] * math.cos(math.radians(rake))
+    """Returns the z position of the point relative to the CG, accounting for rake, assuming no roll
+        rake can either be a single value or a NumPy array"""
+    return position[2] * np.cos(np.radians(rake))
+
+
+# Worker process state for Car.evaluateSetupsParallel() (set by initSetupWorker())
+setupWorkerState = {}
+
+
+def initSetupWorker(car, sharedTelemName, numTelemPoints):
+    """Initialises a setup evaluation worker process with the car, and the telemetry in shared memory (so it isn't
+        copied into every task)"""
+    sharedTelem = shared_memory.SharedMemory(name=sharedTelemName)
+    setupWorkerState["car"] = car
+    setupWorkerState["sharedTelem"] = sharedTelem   # Keeps the shared memory open while the worker is running
+    setupWorkerState["telem"] = np.ndarray((3, numTelemPoints), dtype=np.float64, buffer=sharedTelem.buf)
+
+
+def evaluateSetupsWorker(task):
+    """Evaluates one tile of setups in a worker process (see Car.evaluateSetupsTile()) - returns setupResults for the
+        tile"""
+    return setupWorkerState["car"].evaluateSetupsTile(task, *setupWorkerState["telem"])
 
 
 class Collider:
@@ -181,14 +498,22 @@ class Collider:
 
         return [[frontY, frontZ], [rearY, rearZ]]
 
-    def isValid(self, CGHeight, rake, colliderMargin):
-        """Returns true if there is a ground collision, for colliderMargin in metres"""
+    def getLowerEdgeCentrePositions(self):
+        """Returns the positions of the centres of the front and rear lower edges relative to the CG, in the form
+            [frontCentrePos, rearCentrePos]"""
         positionLowerEdges = self.getPositionLowerEdges()
         frontCentrePos = [self.CENTRE[0], positionLowerEdges[0][0], positionLowerEdges[0][1]]
         rearCentrePos = [self.CENTRE[0], positionLowerEdges[1][0], positionLowerEdges[1][1]]
 
-        return (GHTransform(frontCentrePos, CGHeight, rake) >= colliderMargin
-                and GHTransform(rearCentrePos, CGHeight, rake) >= colliderMargin)
+        return [frontCentrePos, rearCentrePos]
+
+    def isValid(self, CGHeight, rake, colliderMargin):
+        """Returns true if there is a ground collision, for colliderMargin in metres
+            CGHeight and rake can either be single values or NumPy arrays (of the same shape)"""
+        frontCentrePos, rearCentrePos = self.getLowerEdgeCentrePositions()
+
+        return np.logical_and(GHTransform(frontCentrePos, CGHeight, rake) >= colliderMargin,
+                              GHTransform(rearCentrePos, CGHeight, rake) >= colliderMargin)
 
 
 class Wing:
@@ -205,16 +530,21 @@ class Wing:
         self.CD_GAIN = CD_GAIN
         self.ANGLE = ANGLE
 
-    def calculateWing(self, car, CGHeight, rake):
+    def calculateWing(self, car, CGHeight, rake, angle=None):
         """Returns a tuple of (ClA, CdA, Effective Front ClA, Effective Rear ClA) given the CGHeight, rake and static
-            AOA of the wing
-            Includes the effect of the drag on the wing being at a height from the ground (shifts aero balance back)"""
+            AOA of the wing (angle, or the wing's ANGLE if angle is None)
+            Includes the effect of the drag on the wing being at a height from the ground (shifts aero balance back)
+            CGHeight and rake can either be single values or NumPy arrays (of the same shape), in which case each value
+            returned is an array of that shape (single values are read from the LUTs with LookupTable.read())"""
+        if angle is None:
+            angle = self.ANGLE
+
         GH = GHTransform(self.POSITION, CGHeight, rake)
         posZ = posZTransform(self.POSITION, rake)
-        ClA = (self.CHORD * self.SPAN * self.CL_GAIN * readLUT(rake + self.ANGLE, self.LUT_AOA_CL)
-               * readLUT(GH, self.LUT_GH_CL))
-        CdA = (self.CHORD * self.SPAN * self.CD_GAIN * readLUT(rake + self.ANGLE, self.LUT_AOA_CD)
-               * readLUT(GH, self.LUT_GH_CD))
+        ClA = (self.CHORD * self.SPAN * self.CL_GAIN * self.LUT_AOA_CL.readValues(rake + angle)
+               * self.LUT_GH_CL.readValues(GH))
+        CdA = (self.CHORD * self.SPAN * self.CD_GAIN * self.LUT_AOA_CD.readValues(rake + angle)
+               * self.LUT_GH_CD.readValues(GH))
 
         # Account for the moment produced by the drag force being at a height
         effFrontClA = ((((car.WHEELBASE * car.CG_LOCATION + posZ) / car.WHEELBASE) * ClA)
@@ -224,8 +554,195 @@ class Wing:
         return ClA, CdA, effFrontClA, effRearClA
 
 
+class AeroMap:
+    metricNames = ["frontClA", "rearClA", "totalClA", "totalCdA", "efficiency", "aeroBalance"]
+
+    def __init__(self, frontRHArray, rearRHArray, metricArrays, isValid2D, dtype=np.float64, clearance2D=None):
+        """Stores an aero map on a ride height grid, where frontRHArray and rearRHArray are the 1D arrays of the grid
+            ride heights (in metres)
+
+            metricArrays is a sequence of the 6 2D arrays (frontClA, rearClA, totalClA, totalCdA, efficiency,
+            aeroBalance), which are stored in one contiguous array of the given dtype (e.g. np.float32 to halve the
+            memory used) - the 2D arrays are in the form array2D[RearRH][FrontRH]
+
+            isValid2D is the 2D boolean array of whether each ride height combination is valid, and clearance2D is the
+            2D array of the minimum collider ground clearance (see Car.getColliderClearance()) that it was calculated
+            from, if it's known
+
+            numEvaluations is the number of ride heights the aero was calculated at to generate the aero map (set by
+            Car.getAeroMap(), 0 if it was loaded from the aero map cache)"""
+        self.frontRHArray = np.asarray(frontRHArray, dtype=float)
+        self.rearRHArray = np.asarray(rearRHArray, dtype=float)
+
+        self.metricArrays = np.empty((len(self.metricNames), len(self.rearRHArray), len(self.frontRHArray)), dtype=dtype)
+        for i in range(len(self.metricNames)):
+            self.metricArrays[i] = metricArrays[i]
+        self.isValid2D = np.asarray(isValid2D, dtype=bool)
+        self.clearance2D = np.asarray(clearance2D, dtype=float) if clearance2D is not None else None
+        self.numEvaluations = None
+
+        # Views of each metric in metricArrays
+        self.frontClAArray2D = self.metricArrays[0]
+        self.rearClAArray2D = self.metricArrays[1]
+        self.totalClAArray2D = self.metricArrays[2]
+        self.totalCdAArray2D = self.metricArrays[3]
+        self.efficiencyArray2D = self.metricArrays[4]
+        self.aeroBalanceArray2D = self.metricArrays[5]
+
+    def __reduce__(self):
+        """Pickles the aero map as its arrays (so the metric views are rebuilt, rather than pickled as copies)"""
+        return AeroMap, (self.frontRHArray, self.rearRHArray, self.metricArrays, self.isValid2D, self.metricArrays.dtype, self.clearance2D)
+
+    def getIsValid2D(self, colliderMargin):
+        """Returns the 2D boolean array of whether each ride height combination is valid for colliderMargin (in metres),
+            without recalculating the aero map"""
+        if self.clearance2D is None:
+            raise Exception("Aero map doesn't have the collider clearance")
+        return self.clearance2D >= colliderMargin
+
+    def getMetric(self, metricName):
+        """Returns the 2D array of the metric given by metricName (see metricNames)"""
+        return self.metricArrays[self.metricNames.index(metricName)]
+
+    def getRHArray(self):
+        """Returns the grid ride heights in the form [[FrontRH], [RearRH]], in metres"""
+        return [self.frontRHArray.tolist(), self.rearRHArray.tolist()]
+
+    def getMinMax(self):
+        """Returns an array of [min, max] for each metric (in the order of metricNames), ignoring NaN (e.g. outside a
+            sparse aero map, see SparseAeroMap.toAeroMap())"""
+        return [[np.nanmin(metricArray2D), np.nanmax(metricArray2D)] for metricArray2D in self.metricArrays]
+
+    def getContour(self, metricName, level):
+        """Returns the contour of the metric given by metricName at level (e.g. the iso-balance contour with metricName
+            "aeroBalance"), as line segments in the form [[frontRH1, rearRH1], [frontRH2, rearRH2]] - see
+            getContourSegments()"""
+        return getContourSegments(self.frontRHArray, self.rearRHArray, self.getMetric(metricName), level)[0]
+
+    def interpolate(self, frontRH, rearRH):
+        """Returns (frontClA, rearClA, totalClA, totalCdA, efficiency, aeroBalance) at the ride heights frontRH and
+            rearRH (in metres, either single values or NumPy arrays of the same shape), bilinearly interpolated from the
+            aero map grid - each metric is interpolated separately, and ride heights outside the grid use the nearest
+            edge of the grid
+
+            All the ride heights are interpolated at once, so it only takes a few array gathers"""
+        frontRHIndexes, frontRHFractions = getGridPosition(self.frontRHArray, frontRH)
+        rearRHIndexes, rearRHFractions = getGridPosition(self.rearRHArray, rearRH)
+        frontRHNextIndexes = np.minimum(frontRHIndexes + 1, len(self.frontRHArray) - 1)
+        rearRHNextIndexes = np.minimum(rearRHIndexes + 1, len(self.rearRHArray) - 1)
+
+        lowerRearValues = (self.metricArrays[:, rearRHIndexes, frontRHIndexes] * (1 - frontRHFractions)
+                           + self.metricArrays[:, rearRHIndexes, frontRHNextIndexes] * frontRHFractions)
+        upperRearValues = (self.metricArrays[:, rearRHNextIndexes, frontRHIndexes] * (1 - frontRHFractions)
+                           + self.metricArrays[:, rearRHNextIndexes, frontRHNextIndexes] * frontRHFractions)
+        return tuple(lowerRearValues * (1 - rearRHFractions) + upperRearValues * rearRHFractions)
+
+
+class SparseAeroMap:
+    def __init__(self, frontRHArray, rearRHArray, gridIndexes, metricArrays, clearance, colliderMargin, dtype=np.float64):
+        """Stores an aero map at only some of the ride heights of a grid (e.g. those within a telemetry RH envelope),
+            where frontRHArray and rearRHArray are the 1D arrays of the grid ride heights (in metres)
+
+            gridIndexes is the sorted 1D array of the flat grid index (rearRHIndex * len(frontRHArray) + frontRHIndex) of
+            each ride height that is stored, and metricArrays and clearance are the 6 metrics (in the order of
+            AeroMap.metricNames) and the collider clearance at those ride heights - so the memory used is proportional
+            to the number of ride heights stored, rather than the size of the grid"""
+        self.frontRHArray = np.asarray(frontRHArray, dtype=float)
+        self.rearRHArray = np.asarray(rearRHArray, dtype=float)
+        self.gridIndexes = np.asarray(gridIndexes, dtype=np.int64)
+        self.metricArrays = np.asarray(metricArrays, dtype=dtype).reshape(len(AeroMap.metricNames), len(self.gridIndexes))
+        self.clearance = np.asarray(clearance, dtype=float)
+        self.colliderMargin = colliderMargin
+        self.isValid = self.clearance >= colliderMargin
+
+    def __reduce__(self):
+        """Pickles the sparse aero map as its arrays"""
+        return SparseAeroMap, (self.frontRHArray, self.rearRHArray, self.gridIndexes, self.metricArrays, self.clearance,
+                               self.colliderMargin, self.metricArrays.dtype)
+
+    def __len__(self):
+        return len(self.gridIndexes)
+
+    def getPositions(self, rearRHIndexes, frontRHIndexes):
+        """Returns the positions in the stored arrays of the grid ride heights at rearRHIndexes and frontRHIndexes
+            (single values or NumPy arrays of the same shape)"""
+        flatIndexes = np.asarray(rearRHIndexes) * len(self.frontRHArray) + np.asarray(frontRHIndexes)
+        positions = np.minimum(np.searchsorted(self.gridIndexes, flatIndexes), len(self.gridIndexes) - 1)
+        if np.any(self.gridIndexes[positions] != flatIndexes):
+            raise Exception("Ride heights are outside the sparse aero map")
+        return positions
+
+    def getMinMax(self):
+        """Returns an array of [min, max] for each metric (in the order of AeroMap.metricNames)"""
+        return [[np.min(metricArray), np.max(metricArray)] for metricArray in self.metricArrays]
+
+    def toAeroMap(self):
+        """Returns the sparse aero map as an AeroMap on the whole grid (e.g. for plotting), where the ride heights that
+            aren't stored are NaN (and not valid)"""
+        gridShape = (len(self.rearRHArray), len(self.frontRHArray))
+        metricArrays = np.full((len(AeroMap.metricNames), gridShape[0] * gridShape[1]), np.nan, dtype=self.metricArrays.dtype)
+        metricArrays[:, self.gridIndexes] = self.metricArrays
+        clearance2D = np.full(gridShape[0] * gridShape[1], np.nan)
+        clearance2D[self.gridIndexes] = self.clearance
+        clearance2D = clearance2D.reshape(gridShape)
+
+        return AeroMap(self.frontRHArray, self.rearRHArray, metricArrays.reshape((-1,) + gridShape),
+                       clearance2D >= self.colliderMargin, self.metricArrays.dtype, clearance2D)
+
+
+class AeroBasis:
+    def __init__(self, car, frontRHArray, rearRHArray):
+        """Stores the contribution of each wing to the aero numbers at the ride heights given by frontRHArray and
+            rearRHArray in metres (any array-like of the same shape, e.g. telemetry or a 2D grid)
+
+            Each wing's contribution doesn't depend on the other wings, so it's only calculated once for each angle of
+            that wing, then the aero for any combination of wing angles is just the sum of the wings' contributions
+            (i.e. the number of wing calculations is the number of distinct angles of each wing, rather than the number
+            of wing angle combinations multiplied by the number of wings)"""
+        self.car = car
+        self.shape = np.shape(frontRHArray)
+        self.CGHeight, self.rake = car.getCGHeightAndRake(np.asarray(frontRHArray, dtype=float),
+                                                          np.asarray(rearRHArray, dtype=float))
+
+        # In the form {(wingIndex, angle): (ClA, CdA, effFrontClA)}
+        self.wingContributions = {}
+
+    def getWingContribution(self, wingIndex, angle):
+        """Returns (ClA, CdA, effFrontClA) of the wing at wingIndex for the given angle, calculating it if it hasn't
+            already been calculated"""
+        key = (wingIndex, float(angle))
+        if key not in self.wingContributions:
+            ClA, CdA, effFrontClA, effRearClA = self.car.wings[wingIndex].calculateWing(self.car, self.CGHeight,
+                                                                                         self.rake, float(angle))
+            self.wingContributions[key] = (ClA, CdA, effFrontClA)
+
+        return self.wingContributions[key]
+
+    def calculateAero(self, wingAngles):
+        """Returns (frontClA, rearClA, ClA, CdA, efficiency, aeroBalance) for the given wing angles, where each is a
+            NumPy array of the ride height array shape
+            wingAngles is in the same form as Car.setWingAngles() (i.e. None is the default angle specified in aero.ini)"""
+        if len(wingAngles) != len(self.car.wings):
+            raise Exception("wingAngles[] is not the same size as wings[]")
+
+        totalClA = np.zeros(self.shape)
+        totalCdA = np.zeros(self.shape)
+        frontClA = np.zeros(self.shape)
+        for i in range(len(wingAngles)):
+            angle = self.car.defaultWingAngles[i] if wingAngles[i] is None else wingAngles[i]
+            wingClA, wingCdA, wingEffectiveFrontClA = self.getWingContribution(i, angle)
+            totalClA += wingClA
+            totalCdA += wingCdA
+            frontClA += wingEffectiveFrontClA
+        rearClA = totalClA - frontClA
+        efficiency = totalClA / totalCdA
+        aeroBalance = (frontClA / totalClA) * 100
+
+        return frontClA, rearClA, totalClA, totalCdA, efficiency, aeroBalance
+
+
 class Car:
-    def __init__(self, carsDirectory, carName):
+    def __init__(self, carsDirectory, carName, aeroMapCache=None):
         """Reads car data from the data folder and assigns it to the relevant variables:
             - carName
             - PICKUP_FRONT_HEIGHT
@@ -235,8 +752,13 @@ class Car:
             - colliders[Collider]
             - wings[Wing]
             - defaultWingAngles[]
-            Also prints out general info about the car"""
+            - wingAngleRanges{wingIndex: [MIN, MAX, STEP]} (the wings that are adjustable in setup.ini, if it exists)
+            Also prints out general info about the car
+
+            If aeroMapCache (an AeroMapCache from aeroMapCache.py) is passed in, getAeroMap() will use it to avoid
+            recalculating aero maps that have already been calculated"""
         self.carName = carName
+        self.aeroMapCache = aeroMapCache
         carDataDirectory = carsDirectory + "\\" + carName + "\\data\\"
 
         # Read PICKUP_FRONT_HEIGHT and PICKUP_REAR_HEIGHT from car.ini
@@ -280,7 +802,8 @@ class Car:
                 CENTRE, SIZE, GROUND_ENABLE = None, None, None
         collidersINIFile.close()
 
-        # Read wings from aero.ini
+        # Read wings from aero.ini - LUTs are shared between wings that use the same LUT file
+        self.LUTCache = {}
         self.wings = []
         self.defaultWingAngles = []
 
@@ -295,15 +818,15 @@ class Car:
             elif dataString.__contains__("POSITION="):
                 POSITION = [float(i) for i in dataString.split("POSITION=")[1].split(";")[0].split(",")]
             elif dataString.__contains__("LUT_AOA_CL="):
-                LUT_AOA_CL = readLUTFile(carDataDirectory + dataString.split("LUT_AOA_CL=")[1].split(";")[0])
+                LUT_AOA_CL = readLUTFile(carDataDirectory + dataString.split("LUT_AOA_CL=")[1].split(";")[0], self.LUTCache)
             elif dataString.__contains__("LUT_GH_CL="):
-                LUT_GH_CL = readLUTFile(carDataDirectory + dataString.split("LUT_GH_CL=")[1].split(";")[0])
+                LUT_GH_CL = readLUTFile(carDataDirectory + dataString.split("LUT_GH_CL=")[1].split(";")[0], self.LUTCache)
             elif dataString.__contains__("CL_GAIN="):
                 CL_GAIN = float(dataString.split("CL_GAIN=")[1].split(";")[0])
             elif dataString.__contains__("LUT_AOA_CD="):
-                LUT_AOA_CD = readLUTFile(carDataDirectory + dataString.split("LUT_AOA_CD=")[1].split(";")[0])
+                LUT_AOA_CD = readLUTFile(carDataDirectory + dataString.split("LUT_AOA_CD=")[1].split(";")[0], self.LUTCache)
             elif dataString.__contains__("LUT_GH_CD="):
-                LUT_GH_CD = readLUTFile(carDataDirectory + dataString.split("LUT_GH_CD=")[1].split(";")[0])
+                LUT_GH_CD = readLUTFile(carDataDirectory + dataString.split("LUT_GH_CD=")[1].split(";")[0], self.LUTCache)
             elif dataString.__contains__("CD_GAIN="):
                 CD_GAIN = float(dataString.split("CD_GAIN=")[1].split(";")[0])
             elif dataString.__contains__("ANGLE="):
@@ -315,6 +838,30 @@ class Car:
                 CHORD, SPAN, POSITION, LUT_AOA_CL, LUT_GH_CL, CL_GAIN, LUT_AOA_CD, LUT_GH_CD, CD_GAIN, ANGLE = None, None, None, None, None, None, None, None, None, None
         aeroINIFile.close()
 
+        # Read the adjustable wing angle ranges from setup.ini (if it exists), where [WING_n] is the setup for wing n
+        self.wingAngleRanges = {}
+        if os.path.isfile(carDataDirectory + "\\setup.ini"):
+            wingIndex, MIN, MAX, STEP = None, None, None, None
+            setupINIFile = open(carDataDirectory + "\\setup.ini", "r")
+            for line in setupINIFile:
+                dataString = line.replace("\n", "").replace("\t", "").replace(" ", "").split(";")[0]
+                if dataString.startswith("["):
+                    wingIndex, MIN, MAX, STEP = None, None, None, None
+                    if dataString.startswith("[WING_"):
+                        wingIndex = int(dataString.split("[WING_")[1].split("]")[0])
+                elif dataString.startswith("MIN="):
+                    MIN = float(dataString.split("MIN=")[1])
+                elif dataString.startswith("MAX="):
+                    MAX = float(dataString.split("MAX=")[1])
+                elif dataString.startswith("STEP="):
+                    STEP = float(dataString.split("STEP=")[1])
+                # If all the necessary data has been read for the wing's angle range
+                if wingIndex is not None and MIN is not None and MAX is not None and STEP is not None:
+                    if wingIndex < len(self.wings):
+                        self.wingAngleRanges[wingIndex] = [MIN, MAX, STEP]
+                    wingIndex, MIN, MAX, STEP = None, None, None, None
+            setupINIFile.close()
+
     def __str__(self):
         string = ""
         string += "           Car Name: " + self.carName + "\n"
@@ -325,6 +872,7 @@ class Car:
         string += "Number of colliders: " + str(len(self.colliders)) + "\n"
         string += "    Number of wings: " + str(len(self.wings)) + "\n"
         string += "Default wing angles: " + str(self.defaultWingAngles) + "\n"
+        string += "  Wing angle ranges: " + str(self.wingAngleRanges) + "\n"
 
         currentWingAngles = []
         for wing in self.wings:
@@ -354,28 +902,182 @@ class Car:
 
         return wingAngles
 
-    def isValidRideHeight(self, frontRH, rearRH, colliderMargin):
-        """Returns True if the combination of frontRH and rearRH in metres is valid, otherwise returns False
-            (Valid if lowest point of the collider > colliderMargin)
-            All variables in SI units (i.e. metres)"""
+    def resolveWingAngles(self, wingAngles=None):
+        """Returns the array of the angle of each wing for wingAngles (in the same form as setWingAngles(), so None is
+            the default angle specified in aero.ini) without changing the wings - if wingAngles is None, the current
+            wing angles are returned"""
+        if wingAngles is None:
+            return self.getWingAngles()
+        if len(wingAngles) != len(self.wings):
+            raise Exception("wingAngles[] is not the same size as wings[]")
+        return [self.defaultWingAngles[i] if wingAngles[i] is None else float(wingAngles[i]) for i in range(len(wingAngles))]
+
+    def getWingAngleOptions(self, wingAngleRanges=None):
+        """Returns an array of the possible angles of each wing, where each index of the array corresponds to each wing
+            and the angles of a wing that isn't adjustable are just [None] (the default angle specified in aero.ini)
+
+            wingAngleRanges is in the same form as self.wingAngleRanges (if it is None, the ranges from setup.ini are
+            used) - the angles are from MIN to MAX (inclusive) in increments of STEP"""
+        if wingAngleRanges is None:
+            wingAngleRanges = self.wingAngleRanges
+
+        wingAngleOptions = []
+        for i in range(len(self.wings)):
+            if i in wingAngleRanges:
+                MIN, MAX, STEP = wingAngleRanges[i]
+                wingAngleOptions.append([round(angle, 6) for angle in getRHAxis(MIN, MAX, STEP).tolist()])
+            else:
+                wingAngleOptions.append([None])
+
+        return wingAngleOptions
+
+    def generateWingAngles(self, aeroBalanceTarget=None, aeroBalanceTolerance=None, frontRHTelem=None, rearRHTelem=None, frontRHOffsetMin=0, frontRHOffsetMax=0, rearRHOffsetMin=0, rearRHOffsetMax=0, wingAngleRanges=None):
+        """Yields every combination of wing angles allowed by wingAngleRanges (see getWingAngleOptions()) one at a time,
+            in the same form as setWingAngles(), so the combinations are never all stored in memory
+
+            If aeroBalanceTarget and aeroBalanceTolerance are passed in, combinations that can't possibly have an aero
+            balance within the tolerances are skipped, for the telemetry ride heights shifted by any of the RH offsets
+            (in the same form as optimiseAeroRHTelem()). The wing angles are chosen one wing at a time, and the range
+            of front and rear ClA that each wing can contribute (at any of those ride heights) is used to bound the aero
+            balance of every combination that starts with the wing angles chosen so far - if the bounds are outside the
+            tolerances, none of those combinations are generated. The bounds are conservative, so no combination that
+            could be valid is skipped (optimiseAeroRHTelem() still checks the ones that are generated)"""
+        wingAngleOptions = self.getWingAngleOptions(wingAngleRanges)
+        numWings = len(wingAngleOptions)
+
+        if aeroBalanceTarget is None or aeroBalanceTolerance is None:
+            for wingAngles in itertools.product(*wingAngleOptions):
+                yield list(wingAngles)
+            return
+
+        minAllowedAeroBalance = (aeroBalanceTarget - aeroBalanceTolerance) / 100
+        maxAllowedAeroBalance = (aeroBalanceTarget + aeroBalanceTolerance) / 100
+
+        # The telemetry ride heights are shifted by every RH offset (1mm increments, like optimiseAeroRHTelem())
+        telemRHs = np.unique(np.array([frontRHTelem, rearRHTelem], dtype=float), axis=1)
+        frontRHOffsets = getRHAxis(frontRHOffsetMin, frontRHOffsetMax, 0.001)
+        rearRHOffsets = getRHAxis(rearRHOffsetMin, rearRHOffsetMax, 0.001)
+
+        # [min front ClA, max front ClA, min rear ClA, max rear ClA] that each angle of each wing can contribute - only
+        # the bounds are kept, and they're updated one front RH offset at a time, so only len(rearRHOffsets) shifted
+        # copies of the telemetry are stored at once
+        contributionBounds = [np.tile([np.inf, -np.inf, np.inf, -np.inf], (len(wingAngleOptions[i]), 1)) for i in range(numWings)]
+        for frontRHOffset in frontRHOffsets:
+            frontRHArray2D = np.broadcast_to(telemRHs[0][None, :] + frontRHOffset, (len(rearRHOffsets), telemRHs.shape[1]))
+            rearRHArray2D = telemRHs[1][None, :] + rearRHOffsets[:, None]
+            CGHeight, rake = self.getCGHeightAndRake(frontRHArray2D, rearRHArray2D)
+            for i in range(numWings):
+                for angleIndex in range(len(wingAngleOptions[i])):
+                    angle = wingAngleOptions[i][angleIndex]
+                    wingClA, wingCdA, wingEffectiveFrontClA, wingEffectiveRearClA = self.wings[i].calculateWing(self, CGHeight, rake, self.defaultWingAngles[i] if angle is None else angle)
+                    bounds = contributionBounds[i][angleIndex]
+                    bounds[0] = min(bounds[0], np.min(wingEffectiveFrontClA))
+                    bounds[1] = max(bounds[1], np.max(wingEffectiveFrontClA))
+                    bounds[2] = min(bounds[2], np.min(wingEffectiveRearClA))
+                    bounds[3] = max(bounds[3], np.max(wingEffectiveRearClA))
+
+        # Bounds of the total contribution of the wings after each wing (the last element is for no wings)
+        remainingBounds = np.zeros((numWings + 1, 4))
+        for i in reversed(range(numWings)):
+            remainingBounds[i] = remainingBounds[i + 1] + [np.min(contributionBounds[i][:, 0]), np.max(contributionBounds[i][:, 1]),
+                                                           np.min(contributionBounds[i][:, 2]), np.max(contributionBounds[i][:, 3])]
+
+        def canBeValid(bounds):
+            """Returns False if no aero balance within the bounds of front and rear ClA can be within the tolerances
+                frontClA / (frontClA + rearClA) only has its min and max at the corners of the bounds (if total ClA is
+                always positive), since it's monotonic in frontClA and in rearClA"""
+            minFrontClA, maxFrontClA, minRearClA, maxRearClA = bounds
+            if minFrontClA + minRearClA <= 0:
+                return True
+            aeroBalances = [frontClA / (frontClA + rearClA) for frontClA in [minFrontClA, maxFrontClA] for rearClA in [minRearClA, maxRearClA]]
+            return max(aeroBalances) >= minAllowedAeroBalance and min(aeroBalances) <= maxAllowedAeroBalance
+
+        # Depth first search through the wing angles, where chosenBounds is the bounds of the wings chosen so far
+        def generate(wingIndex, wingAngles, chosenBounds):
+            if wingIndex == numWings:
+                yield list(wingAngles)
+                return
+            for angleIndex in range(len(wingAngleOptions[wingIndex])):
+                newChosenBounds = chosenBounds + contributionBounds[wingIndex][angleIndex]
+                if canBeValid(newChosenBounds + remainingBounds[wingIndex + 1]):
+                    wingAngles.append(wingAngleOptions[wingIndex][angleIndex])
+                    yield from generate(wingIndex + 1, wingAngles, newChosenBounds)
+                    wingAngles.pop()
+
+        yield from generate(0, [], np.zeros(4))
+
+    def getAeroDataHash(self):
+        """Returns a hash (hex string) of all the parsed car data that affects the aero calculations (ride height
+            pickups, wheelbase, CG location, colliders and wings, including their LUTs) - wing angles are not included"""
+        dataHash = hashlib.sha256()
+        dataHash.update(json.dumps([self.PICKUP_FRONT_HEIGHT, self.PICKUP_REAR_HEIGHT, self.WHEELBASE,
+                                    self.CG_LOCATION]).encode())
+        for Collider in self.colliders:
+            dataHash.update(json.dumps([Collider.CENTRE, Collider.SIZE]).encode())
+        for Wing in self.wings:
+            dataHash.update(json.dumps([Wing.CHORD, Wing.SPAN, Wing.POSITION, Wing.CL_GAIN, Wing.CD_GAIN]).encode())
+            for LUT in [Wing.LUT_AOA_CL, Wing.LUT_GH_CL, Wing.LUT_AOA_CD, Wing.LUT_GH_CD]:
+                dataHash.update(LUT.xArray.tobytes())
+                dataHash.update(LUT.yArray.tobytes())
 
-        # Calculate CG heights and rake from front and rear ride heights
+        return dataHash.hexdigest()
+
+    def getCGHeightAndRake(self, frontRH, rearRH):
+        """Returns (CGHeight, rake) for frontRH and rearRH in metres, where rake is in degrees
+            frontRH and rearRH can either be single values or NumPy arrays (of the same shape)"""
         frontCGHeight = frontRH - self.PICKUP_FRONT_HEIGHT
         rearCGHeight = rearRH - self.PICKUP_REAR_HEIGHT
         CGHeight = linearInterpolate(self.CG_LOCATION, 0, 1, frontCGHeight, rearCGHeight)
-        rake = math.degrees(math.asin((rearCGHeight - frontCGHeight) / self.WHEELBASE))
+        rake = np.degrees(np.arcsin((rearCGHeight - frontCGHeight) / self.WHEELBASE))
+
+        return CGHeight, rake
 
-        # Check if the ride heights are valid for the colliderMargin
-        isValid = True
+    def getColliderClearanceCoefficients(self):
+        """Returns a NumPy array of shape (number of collider edges, 3), where each row is [a, b, c] such that the
+            ground clearance of that collider edge is a + b * frontRH + c * rearRH (in metres)
+
+            The ground height of a point is CGHeight + y - z * sin(rake) (see GHTransform()), where sin(rake) is just
+            (rearCGHeight - frontCGHeight) / WHEELBASE, so the clearance is linear in the ride heights"""
+        coefficients = []
         for Collider in self.colliders:
-            if not Collider.isValid(CGHeight, rake, colliderMargin):
-                isValid = False
+            for position in Collider.getLowerEdgeCentrePositions():
+                frontRHCoefficient = 1 - self.CG_LOCATION + position[2] / self.WHEELBASE
+                rearRHCoefficient = self.CG_LOCATION - position[2] / self.WHEELBASE
+                constant = position[1] - frontRHCoefficient * self.PICKUP_FRONT_HEIGHT - rearRHCoefficient * self.PICKUP_REAR_HEIGHT
+                coefficients.append([constant, frontRHCoefficient, rearRHCoefficient])
+
+        return np.array(coefficients, dtype=float).reshape(-1, 3)
+
+    def getColliderClearance(self, frontRH, rearRH):
+        """Returns the minimum ground clearance (in metres) of all the colliders for frontRH and rearRH in metres, which
+            can be single values or NumPy arrays that broadcast together (e.g. telemetry, a 2D grid, or a row of front
+            ride heights and a column of rear ride heights) - infinite if the car has no colliders
+
+            The clearance is calculated directly from the ride heights (see getColliderClearanceCoefficients()), without
+            calculating CG height or rake, so any colliderMargin is then just a threshold of the clearance"""
+        frontRH = np.asarray(frontRH, dtype=float)
+        rearRH = np.asarray(rearRH, dtype=float)
+        clearance = np.full(np.broadcast(frontRH, rearRH).shape, np.inf)
+        for constant, frontRHCoefficient, rearRHCoefficient in self.getColliderClearanceCoefficients():
+            clearance = np.minimum(clearance, constant + frontRHCoefficient * frontRH + rearRHCoefficient * rearRH)
 
-        return isValid
+        return clearance
 
-    def calculateAero(self, frontRH, rearRH):
+    def isValidRideHeight(self, frontRH, rearRH, colliderMargin):
+        """Returns True if the combination of frontRH and rearRH in metres is valid, otherwise returns False
+            (Valid if lowest point of the collider > colliderMargin)
+            All variables in SI units (i.e. metres)
+            frontRH and rearRH can either be single values or NumPy arrays (of the same shape)"""
+        return self.getColliderClearance(frontRH, rearRH) >= colliderMargin
+
+    def calculateAero(self, frontRH, rearRH, wingAngles=None):
         """Calculates aero for frontRH and rearRH in metres
-            Returns (frontClA, rearClA, ClA, CdA, efficiency, aeroBalance)"""
+            Returns (frontClA, rearClA, ClA, CdA, efficiency, aeroBalance)
+
+            wingAngles is in the same form as setWingAngles() - if it is None, the current wing angles are used (the
+            car is never changed, so this is safe to call from multiple threads)"""
+        wingAngles = self.resolveWingAngles(wingAngles)
+
         # Calculate CG heights and rake from front and rear ride heights
         frontCGHeight = frontRH - self.PICKUP_FRONT_HEIGHT
         rearCGHeight = rearRH - self.PICKUP_REAR_HEIGHT
@@ -386,8 +1088,8 @@ class Car:
         totalClA = 0
         totalCdA = 0
         frontClA = 0
-        for Wing in self.wings:
-            wingClA, wingCdA, wingEffectiveFrontClA, wingEffectiveRearClA = Wing.calculateWing(self, CGHeight, rake)
+        for i in range(len(self.wings)):
+            wingClA, wingCdA, wingEffectiveFrontClA, wingEffectiveRearClA = self.wings[i].calculateWing(self, CGHeight, rake, wingAngles[i])
             totalClA += wingClA
             totalCdA += wingCdA
             frontClA += wingEffectiveFrontClA
@@ -397,78 +1099,251 @@ class Car:
 
         return frontClA, rearClA, totalClA, totalCdA, efficiency, aeroBalance
 
-    def getAeroMap(self, frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, colliderMargin):
-        """Generates the aero map for the car in the form of 2D arrays - note that stuff like separate front ClA and
-            rear ClA they can be calculated using ClA and aeroBalance, and it isn't considered useful, so arrays of that
-            data are not returned
+    def calculateAeroArray(self, frontRHArray, rearRHArray, wingAngles=None):
+        """Calculates aero for every combination of frontRHArray[i] and rearRHArray[i] in metres in one vectorised pass
+            frontRHArray and rearRHArray can be any array-like of the same shape (e.g. telemetry or a 2D grid)
+            Returns (frontClA, rearClA, ClA, CdA, efficiency, aeroBalance), where each is a NumPy array of that shape
+
+            wingAngles is in the same form as setWingAngles() - if it is None, the current wing angles are used (the
+            car is never changed, so this is safe to call from multiple threads)"""
+        wingAngles = self.resolveWingAngles(wingAngles)
+        frontRHArray = np.asarray(frontRHArray, dtype=float)
+        rearRHArray = np.asarray(rearRHArray, dtype=float)
+
+        # Calculate CG height and rake from front and rear ride heights
+        CGHeight, rake = self.getCGHeightAndRake(frontRHArray, rearRHArray)
+
+        # Calculate aero
+        totalClA = np.zeros(frontRHArray.shape)
+        totalCdA = np.zeros(frontRHArray.shape)
+        frontClA = np.zeros(frontRHArray.shape)
+        for i in range(len(self.wings)):
+            wingClA, wingCdA, wingEffectiveFrontClA, wingEffectiveRearClA = self.wings[i].calculateWing(self, CGHeight, rake, wingAngles[i])
+            totalClA += wingClA
+            totalCdA += wingCdA
+            frontClA += wingEffectiveFrontClA
+        rearClA = totalClA - frontClA
+        efficiency = totalClA / totalCdA
+        aeroBalance = (frontClA / totalClA) * 100
+
+        return frontClA, rearClA, totalClA, totalCdA, efficiency, aeroBalance
+
+    def getAeroMapBasis(self, frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep):
+        """Returns an AeroBasis for the same ride height grid as getAeroMap(), which can be passed to getAeroMap() to
+            speed up calculating the aero maps of many wing angle combinations"""
+        frontRHArray2D, rearRHArray2D = np.meshgrid(getRHAxis(frontRHMin, frontRHMax, RHStep),
+                                                    getRHAxis(rearRHMin, rearRHMax, RHStep))
+        return AeroBasis(self, frontRHArray2D, rearRHArray2D)
+
+    def getAdaptiveAeroMapArrays(self, frontRHArray, rearRHArray, wingAngles, adaptiveTolerance, adaptiveCoarseStep=16):
+        """Returns (metricArrays, numEvaluations), where metricArrays is the 6 2D aero map arrays on the ride height grid
+            given by frontRHArray and rearRHArray (in the same form as getAeroMap()), and numEvaluations is the number
+            of ride heights the aero was actually calculated at
+
+            The grid is split into cells of adaptiveCoarseStep ride height steps, and the aero is calculated at the
+            corners of each cell. The aero at the centre and edge midpoints of each cell is then calculated and
+            compared to bilinearly interpolating the corners - if any metric is off by more than adaptiveTolerance
+            multiplied by the largest absolute value of that metric at the coarse corners, the cell is split into 4
+            (whose corners are those points, so none are wasted). Only cells near LUT breakpoints and steep gradients
+            end up being refined down to RHStep, and the rest of the grid is bilinearly interpolated from the corners
+            of the cells it's in (ride heights the aero was calculated at keep their calculated values)"""
+        numFront = len(frontRHArray)
+        numRear = len(rearRHArray)
+
+        # frontClA, totalClA and totalCdA at each ride height calculated so far (the other metrics are derived from them)
+        baseArrays = np.zeros((3, numRear, numFront))
+        isEvaluated2D = np.zeros((numRear, numFront), dtype=bool)
+
+        def evaluate(rearIndexes, frontIndexes):
+            """Calculates the aero at the grid points that haven't been calculated yet"""
+            rearIndexes, frontIndexes = np.asarray(rearIndexes).ravel(), np.asarray(frontIndexes).ravel()
+            isNew = ~isEvaluated2D[rearIndexes, frontIndexes]
+            flatIndexes = np.unique(rearIndexes[isNew] * numFront + frontIndexes[isNew])
+            rearIndexes, frontIndexes = flatIndexes // numFront, flatIndexes % numFront
+            frontClA, rearClA, totalClA, totalCdA, efficiency, aeroBalance = self.calculateAeroArray(
+                frontRHArray[frontIndexes], rearRHArray[rearIndexes], wingAngles)
+            baseArrays[:, rearIndexes, frontIndexes] = frontClA, totalClA, totalCdA
+            isEvaluated2D[rearIndexes, frontIndexes] = True
+
+        def getMetrics(baseValues):
+            """Returns the 6 metrics from [frontClA, totalClA, totalCdA] (the same way as calculateAeroArray())"""
+            frontClA, totalClA, totalCdA = baseValues
+            return np.array([frontClA, totalClA - frontClA, totalClA, totalCdA, totalClA / totalCdA,
+                             (frontClA / totalClA) * 100])
+
+        # Coarse cells, in the form [rearIndex1, rearIndex2, frontIndex1, frontIndex2] (the indexes of their corners)
+        rearStarts = np.arange(0, max(numRear - 1, 1), adaptiveCoarseStep)
+        frontStarts = np.arange(0, max(numFront - 1, 1), adaptiveCoarseStep)
+        rearStarts, frontStarts = [startArray.ravel() for startArray in np.meshgrid(rearStarts, frontStarts, indexing="ij")]
+        cells = np.array([rearStarts, np.minimum(rearStarts + adaptiveCoarseStep, numRear - 1),
+                          frontStarts, np.minimum(frontStarts + adaptiveCoarseStep, numFront - 1)])
+        evaluate(cells[[0, 0, 1, 1]], cells[[2, 3, 2, 3]])
+
+        # The error of each metric is relative to the size of that metric
+        metricScales = np.max(np.abs(getMetrics(baseArrays[:, isEvaluated2D])), axis=1)[:, None]
+
+        leafCells = []
+        while cells.shape[1] > 0:
+            rearIndexes1, rearIndexes2, frontIndexes1, frontIndexes2 = cells
+            rearMidIndexes = (rearIndexes1 + rearIndexes2) // 2
+            frontMidIndexes = (frontIndexes1 + frontIndexes2) // 2
+
+            # The centre and edge midpoints of each cell (which are just corners if the cell is 1 step wide)
+            testRearIndexes = np.array([rearMidIndexes, rearMidIndexes, rearMidIndexes, rearIndexes1, rearIndexes2])
+            testFrontIndexes = np.array([frontMidIndexes, frontIndexes1, frontIndexes2, frontMidIndexes, frontMidIndexes])
+            evaluate(testRearIndexes, testFrontIndexes)
+
+            # Bilinearly interpolate the test points from the corners
+            rearFractions = (testRearIndexes - rearIndexes1) / np.maximum(rearIndexes2 - rearIndexes1, 1)
+            frontFractions = (testFrontIndexes - frontIndexes1) / np.maximum(frontIndexes2 - frontIndexes1, 1)
+            cornerValues = [baseArrays[:, None, rearIndexes, frontIndexes]
+                            for rearIndexes, frontIndexes in [[rearIndexes1, frontIndexes1], [rearIndexes1, frontIndexes2],
+                                                              [rearIndexes2, frontIndexes1], [rearIndexes2, frontIndexes2]]]
+            interpolatedBaseValues = ((cornerValues[0] * (1 - frontFractions) + cornerValues[1] * frontFractions) * (1 - rearFractions)
+                                      + (cornerValues[2] * (1 - frontFractions) + cornerValues[3] * frontFractions) * rearFractions)
+            metricErrors = np.abs(getMetrics(interpolatedBaseValues)
+                                  - getMetrics(baseArrays[:, testRearIndexes, testFrontIndexes]))
+            isRefined = np.any(metricErrors > adaptiveTolerance * metricScales[:, :, None], axis=(0, 1))
+
+            leafCells.append(cells[:, ~isRefined])
+
+            # Split the refined cells into 4 (or 2 if they're only 1 step wide in one direction)
+            rearIndexes1, rearIndexes2, frontIndexes1, frontIndexes2 = cells[:, isRefined]
+            rearMidIndexes, frontMidIndexes = rearMidIndexes[isRefined], frontMidIndexes[isRefined]
+            isRearSplit = rearIndexes2 - rearIndexes1 >= 2
+            isFrontSplit = frontIndexes2 - frontIndexes1 >= 2
+            rearChildren = [[rearIndexes1, np.where(isRearSplit, rearMidIndexes, rearIndexes2), True],
+                            [rearMidIndexes, rearIndexes2, isRearSplit]]
+            frontChildren = [[frontIndexes1, np.where(isFrontSplit, frontMidIndexes, frontIndexes2), True],
+                             [frontMidIndexes, frontIndexes2, isFrontSplit]]
+            childCells = []
+            for rearIndexes1, rearIndexes2, isRearChild in rearChildren:
+                for frontIndexes1, frontIndexes2, isFrontChild in frontChildren:
+                    isChild = np.broadcast_to(np.logical_and(isRearChild, isFrontChild), isRearSplit.shape)
+                    childCells.append(np.array([rearIndexes1, rearIndexes2, frontIndexes1, frontIndexes2])[:, isChild])
+            cells = np.concatenate(childCells, axis=1)
+
+        # Resample onto the uniform grid by bilinearly interpolating each leaf cell from its corners (cells of the same
+        # size are interpolated together)
+        leafCells = np.concatenate(leafCells, axis=1)
+        interpolatedArrays = np.zeros(baseArrays.shape)
+        cellSizes = np.array([leafCells[1] - leafCells[0], leafCells[3] - leafCells[2]])
+        for rearSize, frontSize in np.unique(cellSizes, axis=1).T:
+            rearIndexes1, rearIndexes2, frontIndexes1, frontIndexes2 = leafCells[:, (cellSizes[0] == rearSize) & (cellSizes[1] == frontSize)]
+            rearFractions = np.arange(rearSize + 1) / max(rearSize, 1)
+            frontFractions = np.arange(frontSize + 1) / max(frontSize, 1)
+            cornerValues = [baseArrays[:, rearIndexes, frontIndexes][:, :, None, None]
+                            for rearIndexes, frontIndexes in [[rearIndexes1, frontIndexes1], [rearIndexes1, frontIndexes2],
+                                                              [rearIndexes2, frontIndexes1], [rearIndexes2, frontIndexes2]]]
+            cellValues = ((cornerValues[0] * (1 - frontFractions) + cornerValues[1] * frontFractions) * (1 - rearFractions[:, None])
+                          + (cornerValues[2] * (1 - frontFractions) + cornerValues[3] * frontFractions) * rearFractions[:, None])
+            interpolatedArrays[:, rearIndexes1[:, None, None] + np.arange(rearSize + 1)[:, None],
+                               frontIndexes1[:, None, None] + np.arange(frontSize + 1)] = cellValues
+        interpolatedArrays[:, isEvaluated2D] = baseArrays[:, isEvaluated2D]
+
+        return getMetrics(interpolatedArrays), int(np.count_nonzero(isEvaluated2D))
+
+    def getAeroMap(self, frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, colliderMargin, dtype=np.float64,
+                   aeroBasis=None, wingAngles=None, adaptiveTolerance=None, adaptiveCoarseStep=16):
+        """Generates the aero map for the car as an AeroMap, where the ride height grid is frontRHMin to frontRHMax and
+            rearRHMin to rearRHMax (inclusive) in increments of RHStep
 
-            Returns RHArray, frontClAArray2D, rearClAArray2D, ClAArray2D, CdAArray2D, efficiencyArray2D, aeroBalanceArray2D, isValid2D
             The 2D arrays are in the form array2D[RearRH][FrontRH] (rows as rear RH and columns as front RH)
+            dtype can be set to np.float32 to halve the memory used by the aero map
+
+            If the car has an aeroMapCache, the aero map is read from it if it's already been calculated, otherwise
+            it's calculated and then stored in it - the collider clearance is stored rather than whether each ride
+            height is valid, so aero maps with different colliderMargins are only calculated once
+
+            If aeroBasis (from getAeroMapBasis() with the same ride height grid) is passed in, the aero is calculated
+            by summing the wing contributions stored in it
+
+            wingAngles is in the same form as setWingAngles() - if it is None, the current wing angles are used (the
+            car is never changed, so this is safe to call from multiple threads)
+
+            If adaptiveTolerance is set (e.g. 1e-4), the aero is only calculated where it's needed to keep the
+            interpolation error below it, and the rest of the grid is interpolated (see getAdaptiveAeroMapArrays()) -
+            aeroBasis isn't used in this case. The number of ride heights the aero was calculated at is stored in the
+            numEvaluations attribute of the returned aero map
 
             All units passed in and returned are SI units (i.e. metres), and aero balance is in % front aero balance"""
+        wingAngles = self.resolveWingAngles(wingAngles)
+
+        # Check if the aero map has already been calculated
+        if self.aeroMapCache is not None:
+            cacheKey = self.aeroMapCache.getKey(self.getAeroDataHash(), wingAngles, frontRHMin, frontRHMax,
+                                                rearRHMin, rearRHMax, RHStep, dtype, adaptiveTolerance,
+                                                adaptiveCoarseStep)
+            cachedAeroMap = self.aeroMapCache.load(cacheKey)
+            if cachedAeroMap is not None:
+                frontRHArray, rearRHArray, metricArrays, clearance2D = cachedAeroMap
+                aeroMap = AeroMap(frontRHArray, rearRHArray, metricArrays, clearance2D >= colliderMargin, dtype, clearance2D)
+                aeroMap.numEvaluations = 0
+                return aeroMap
+
+        frontRHArray = getRHAxis(frontRHMin, frontRHMax, RHStep)
+        rearRHArray = getRHAxis(rearRHMin, rearRHMax, RHStep)
+
+        # Calculate aero and check which ride heights are valid for all ride heights at once (the collider clearance
+        # is cheap, so it's always calculated on the whole grid)
+        numEvaluations = len(frontRHArray) * len(rearRHArray)
+        if adaptiveTolerance is not None:
+            metricArrays, numEvaluations = self.getAdaptiveAeroMapArrays(frontRHArray, rearRHArray, wingAngles,
+                                                                         adaptiveTolerance, adaptiveCoarseStep)
+        elif aeroBasis is not None:
+            metricArrays = aeroBasis.calculateAero(wingAngles)
+        else:
+            frontRHArray2D, rearRHArray2D = np.meshgrid(frontRHArray, rearRHArray)
+            metricArrays = self.calculateAeroArray(frontRHArray2D, rearRHArray2D, wingAngles)
+        clearance2D = self.getColliderClearance(frontRHArray[None, :], rearRHArray[:, None])
+        aeroMap = AeroMap(frontRHArray, rearRHArray, metricArrays, clearance2D >= colliderMargin, dtype, clearance2D)
+        aeroMap.numEvaluations = numEvaluations
+
+        if self.aeroMapCache is not None:
+            self.aeroMapCache.save(cacheKey, aeroMap.frontRHArray, aeroMap.rearRHArray, aeroMap.metricArrays,
+                                   aeroMap.clearance2D)
+
+        return aeroMap
+
+    def getSparseAeroMapBasis(self, frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, RHEnvelope2D, envelopeMargin=0):
+        """Returns an AeroBasis for the same ride heights as getSparseAeroMap(), which can be passed to
+            getSparseAeroMap() to speed up calculating the sparse aero maps of many wing angle combinations"""
+        frontRHArray = getRHAxis(frontRHMin, frontRHMax, RHStep)
+        rearRHArray = getRHAxis(rearRHMin, rearRHMax, RHStep)
+        gridIndexes = np.flatnonzero(dilateRHEnvelope2D(RHEnvelope2D, int(math.ceil(round(envelopeMargin / RHStep, 6)))))
+        rearRHIndexes, frontRHIndexes = np.divmod(gridIndexes, len(frontRHArray))
+        return AeroBasis(self, frontRHArray[frontRHIndexes], rearRHArray[rearRHIndexes])
+
+    def getSparseAeroMap(self, frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, colliderMargin, RHEnvelope2D,
+                         envelopeMargin=0, dtype=np.float64, aeroBasis=None, wingAngles=None):
+        """Generates the aero map for the car as a SparseAeroMap, on the same ride height grid as getAeroMap() but only
+            at the ride heights within RHEnvelope2D (from getRHEnvelope2D() with the same grid), dilated by
+            envelopeMargin (in metres, rounded up to a whole number of RH steps) so there's a margin around the
+            telemetry
+
+            The envelope is usually a thin diagonal band, so this only calculates a small fraction of the grid - sparse
+            aero maps aren't stored in the aero map cache
+
+            aeroBasis (from getSparseAeroMapBasis() with the same arguments) and wingAngles are the same as getAeroMap()"""
+        wingAngles = self.resolveWingAngles(wingAngles)
+        frontRHArray = getRHAxis(frontRHMin, frontRHMax, RHStep)
+        rearRHArray = getRHAxis(rearRHMin, rearRHMax, RHStep)
+        if np.shape(RHEnvelope2D) != (len(rearRHArray), len(frontRHArray)):
+            raise Exception("RHEnvelope2D is not the same size as the ride height grid")
+
+        gridIndexes = np.flatnonzero(dilateRHEnvelope2D(RHEnvelope2D, int(math.ceil(round(envelopeMargin / RHStep, 6)))))
+        rearRHIndexes, frontRHIndexes = np.divmod(gridIndexes, len(frontRHArray))
+        if aeroBasis is not None:
+            metricArrays = aeroBasis.calculateAero(wingAngles)
+        else:
+            metricArrays = self.calculateAeroArray(frontRHArray[frontRHIndexes], rearRHArray[rearRHIndexes], wingAngles)
+        clearance = self.getColliderClearance(frontRHArray[frontRHIndexes], rearRHArray[rearRHIndexes])
+
+        return SparseAeroMap(frontRHArray, rearRHArray, gridIndexes, metricArrays, clearance, colliderMargin, dtype)
 
-        RHArray = [[], []]  # in the form [[FrontRH], [RearRH]], and in metres
-
-        # Rows are rear RH, columns are front RH, so it's array2D[RearRH][FrontRH]
-        frontClAArray2D = []
-        rearClAArray2D = []
-        totalClAArray2D = []
-        totalCdAArray2D = []
-        efficiencyArray2D = []
-        aeroBalanceArray2D = []
-        isValid2D = []
-
-        # Floating point maths reasons
-        RHMargin = RHStep / 2
-
-        # Generate front ride heights for RHArray
-        frontRH = frontRHMin
-        while frontRH <= frontRHMax + RHMargin:
-            RHArray[0].append(frontRH)
-            frontRH += RHStep
-        # Generate rear ride heights for RHArray
-        rearRH = rearRHMin
-        while rearRH <= rearRHMax + RHMargin:
-            RHArray[1].append(rearRH)
-            rearRH += RHStep
-
-        # Iterate through all ride heights and calculate aero
-        rearRH = rearRHMin
-        while rearRH <= rearRHMax + RHMargin:
-            # Add a new row to the 2D array to represent a new rear RH
-            frontClAArray2D.append([])
-            rearClAArray2D.append([])
-            totalClAArray2D.append([])
-            totalCdAArray2D.append([])
-            efficiencyArray2D.append([])
-            aeroBalanceArray2D.append([])
-            isValid2D.append([])
-
-            frontRH = frontRHMin
-            while frontRH <= frontRHMax + RHMargin:
-                # Calculate aero
-                frontClA, rearClA, totalClA, totalCdA, efficiency, aeroBalance = self.calculateAero(frontRH, rearRH)
-
-                # Check if it's a valid ride height
-                isValid = self.isValidRideHeight(frontRH, rearRH, colliderMargin)
-
-                # Add the new values to the 2D arrays
-                frontClAArray2D[-1].append(frontClA)
-                rearClAArray2D[-1].append(rearClA)
-                totalClAArray2D[-1].append(totalClA)
-                totalCdAArray2D[-1].append(totalCdA)
-                efficiencyArray2D[-1].append(efficiency)
-                aeroBalanceArray2D[-1].append(aeroBalance)
-                isValid2D[-1].append(isValid)
-
-                frontRH += RHStep
-            rearRH += RHStep
-
-        return RHArray, frontClAArray2D, rearClAArray2D, totalClAArray2D, totalCdAArray2D, efficiencyArray2D, aeroBalanceArray2D, isValid2D
-
-    def plotAeroMap(self, saveDirectory, fileName, RHArray, frontClAArray2D, rearClAArray2D, totalClAArray2D, totalCdAArray2D, efficiencyArray2D, aeroBalanceArray2D, isValid2D, RHEnvelope2D=None, boundsFrontClA=None, boundsRearClA=None, boundsTotalClA=None, boundsTotalCdA=None, boundsEfficiency=None, boundsAeroBalance=None):
-        """Plots a figure with 6 subplots (front ClA, rear ClA, total ClA, total CdA, efficiency, aero balance), and
-            saves it to saveDirectory as fileName
+    def plotAeroMap(self, saveDirectory, fileName, aeroMap, RHEnvelope2D=None, boundsFrontClA=None, boundsRearClA=None, boundsTotalClA=None, boundsTotalCdA=None, boundsEfficiency=None, boundsAeroBalance=None, renderer=None, skipUnchanged=False):
+        """Plots a figure with 6 subplots (front ClA, rear ClA, total ClA, total CdA, efficiency, aero balance) of
+            aeroMap (an AeroMap returned by getAeroMap()), and saves it to saveDirectory as fileName
 
             If RHEnvelope2D is not None, then all points outside of those listed in RHEnvelope2D will be made
             semi-transparent
@@ -477,143 +1352,107 @@ class Car:
             If bounds isn't None, then it must be an array in the form [lowerBound, upperBound], and the colour map will
             be clipped to those bounds
 
-            Still have no idea whether to include contours or not - and if so, whether to mix data sources for colours
-            and contours (e.g. coloured efficiency but contours of aero balance)"""
-
-        # Plot settings
-        figDPI = 400
-        plotArea = 80
-        plotMarginX = 3.5
-        colourBarSizeMult = 0.65
-        colourMap = 'rainbow'     # magma, rainbow, gist_rainbow
-        notRHEnvelopeAlpha = 0.3
-
-        """figTitleFontSize = 12
-        axisTitleFontSize = 10
-        labelFontSize = 8
-        tickFontSize = 7"""
-
-        figTitleFontSize = 16
-        axisTitleFontSize = 14
-        labelFontSize = 12
-        tickFontSize = 10
-
-        contourPlotLineWidth = 0.1
-
-        gridSpacingMinor = 5
-        gridSpacingMajor = 20
-        gridLineWidthMinor = 0.1
-        gridLineWidthMajor = 0.2
-
-        # Set figure DPI
-        plt.rcParams['savefig.dpi'] = figDPI
-
-        # Set font sizes
-        plt.rc('axes', titlesize=axisTitleFontSize)  # fontsize of the axes title
-        plt.rc('axes', labelsize=labelFontSize)  # fontsize of the x and y labels
-        plt.rc('xtick', labelsize=tickFontSize)  # fontsize of the tick labels
-        plt.rc('ytick', labelsize=tickFontSize)  # fontsize of the tick labels
-        plt.rc('figure', titlesize=figTitleFontSize)  # fontsize of the figure title
-
-        # Create variables for the number of columns (number of front RHs) and the number of rows (number of rear RHs)
-        numColumns = len(RHArray[0])
-        numRows = len(RHArray[1])
-
-        # Convert RHArray to be in mm
-        RHArray[0] = [i * 1000 for i in RHArray[0]]
-        RHArray[1] = [i * 1000 for i in RHArray[1]]
-
-        # Get min and max ride heights for setting plot axis bounds
-        frontRHMin = min(RHArray[0])
-        frontRHMax = max(RHArray[0])
-        rearRHMin = min(RHArray[1])
-        rearRHMax = max(RHArray[1])
-
-        # Create transparency (alpha) array for denoting the ride height envelope and whether the ride height is valid
-        alphaArray2D = []
-        for row in range(numRows):
-            alphaArray2D.append([])
-            for column in range(numColumns):
-                if RHEnvelope2D is not None:
-                    if RHEnvelope2D[row][column]:
-                        alphaArray2D[row].append(1.0)
-                    elif isValid2D[row][column]:
-                            alphaArray2D[row].append(notRHEnvelopeAlpha)
-                    else:
-                        alphaArray2D[row].append(0.0)
-                else:
-                    if isValid2D[row][column]:
-                        alphaArray2D[row].append(1.0)
-                    else:
-                        alphaArray2D[row].append(0.0)
-
-        # For vmin and vmax to work properly in the colourmap plots
-        if boundsFrontClA is None: boundsFrontClA = [None, None]
-        if boundsRearClA is None: boundsRearClA = [None, None]
-        if boundsTotalClA is None: boundsTotalClA = [None, None]
-        if boundsTotalCdA is None: boundsTotalCdA = [None, None]
-        if boundsEfficiency is None: boundsEfficiency = [None, None]
-        if boundsAeroBalance is None: boundsAeroBalance = [None, None]
-
-        # Set up figure and axes
-        fig, axs = plt.subplots(2, 3, figsize=(plotArea ** 0.5 + plotMarginX, plotArea ** 0.5))
-        fig.suptitle(self.carName + " " + fileName)
-        majorTickArray = np.arange(round(min(frontRHMin, rearRHMin)), round(max(frontRHMax, rearRHMax)) + 1, gridSpacingMajor)
-        minorTickArray = np.arange(round(min(frontRHMin, rearRHMin)), round(max(frontRHMax, rearRHMax)) + 1, gridSpacingMinor)
-        for ax in axs.flat:
-            ax.set(xlabel='Front ride height (mm)', ylabel='Rear ride height (mm)')
-            ax.set_xticks(majorTickArray)
-            ax.set_xticks(minorTickArray, minor=True)
-            ax.set_yticks(majorTickArray)
-            ax.set_yticks(minorTickArray, minor=True)
-            ax.grid(which='minor', color='black', alpha=0.5, linewidth=gridLineWidthMinor)
-            ax.grid(which='major', color='black', linewidth=gridLineWidthMajor)
-            ax.set(xlim=(frontRHMin, frontRHMax), ylim=(rearRHMin, rearRHMax))
-            ax.axis('scaled')
-
-        axs[0, 0].set_title('Front ClA')
-        axs[1, 0].set_title('Rear ClA')
-        axs[0, 1].set_title('Total ClA')
-        axs[1, 1].set_title('Total CdA')
-        axs[0, 2].set_title('Efficiency (L/D Ratio)')
-        axs[1, 2].set_title('Front Aero Balance %')
-
-        # Colour map plots
-        fig.colorbar(axs[0, 0].imshow(frontClAArray2D, extent=[frontRHMin, frontRHMax, rearRHMax, rearRHMin], vmin=boundsFrontClA[0], vmax=boundsRearClA[1], cmap=colourMap, alpha=alphaArray2D), orientation="vertical", shrink=colourBarSizeMult)
-        fig.colorbar(axs[1, 0].imshow(rearClAArray2D, extent=[frontRHMin, frontRHMax, rearRHMax, rearRHMin], vmin=boundsRearClA[0], vmax=boundsRearClA[1], cmap=colourMap, alpha=alphaArray2D), orientation="vertical", shrink=colourBarSizeMult)
-        fig.colorbar(axs[0, 1].imshow(totalClAArray2D, extent=[frontRHMin, frontRHMax, rearRHMax, rearRHMin], vmin=boundsTotalClA[0], vmax=boundsTotalClA[1], cmap=colourMap, alpha=alphaArray2D), orientation="vertical", shrink=colourBarSizeMult)
-        fig.colorbar(axs[1, 1].imshow(totalCdAArray2D, extent=[frontRHMin, frontRHMax, rearRHMax, rearRHMin], vmin=boundsTotalCdA[0], vmax=boundsTotalCdA[1], cmap=colourMap, alpha=alphaArray2D), orientation="vertical", shrink=colourBarSizeMult)
-        fig.colorbar(axs[0, 2].imshow(efficiencyArray2D, extent=[frontRHMin, frontRHMax, rearRHMax, rearRHMin], vmin=boundsEfficiency[0], vmax=boundsEfficiency[1], cmap=colourMap, alpha=alphaArray2D), orientation="vertical", shrink=colourBarSizeMult)
-        fig.colorbar(axs[1, 2].imshow(aeroBalanceArray2D, extent=[frontRHMin, frontRHMax, rearRHMax, rearRHMin], vmin=boundsAeroBalance[0], vmax=boundsAeroBalance[1], cmap=colourMap, alpha=alphaArray2D), orientation="vertical", shrink=colourBarSizeMult)
-        plt.tight_layout()
-
-        # Contour lines (atm only for aero balance)
-        totalClAContours = axs[0, 1].contour(RHArray[0], RHArray[1], totalClAArray2D, colors='black', levels=np.arange(0, 10 + 1, 0.1), linewidths=contourPlotLineWidth)
-        axs[0, 1].clabel(totalClAContours, inline=True, fontsize=tickFontSize)
-
-        totalCdAContours = axs[1, 1].contour(RHArray[0], RHArray[1], totalCdAArray2D, colors='black',levels=np.arange(0, 2 + 1, 0.01), linewidths=contourPlotLineWidth)
-        axs[1, 1].clabel(totalCdAContours, inline=True, fontsize=tickFontSize)
-
-        aeroBalanceContours = axs[1, 2].contour(RHArray[0], RHArray[1], aeroBalanceArray2D, colors='black', levels=np.arange(0, 100 + 1, 1), linewidths=contourPlotLineWidth)
-        axs[1, 2].clabel(aeroBalanceContours, inline=True, fontsize=tickFontSize)
-
-        efficiencyContours = axs[0, 2].contour(RHArray[0], RHArray[1], efficiencyArray2D, colors='black',levels=np.arange(0, 10 + 1, 0.1), linewidths=contourPlotLineWidth)
-        axs[0, 2].clabel(efficiencyContours, inline=True, fontsize=tickFontSize)
-
-        plt.savefig(saveDirectory + "\\" + fileName + ".png")
-
-        plt.close()
-
-    def plotAeroMaps(self, saveDirectory, frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, colliderMargin, wingAnglesArray, RHEnvelope2D=None, fileNames=None, boundsFrontClA=None, boundsRearClA=None, boundsTotalClA=None, boundsTotalCdA=None, boundsEfficiency=None, boundsAeroBalance=None):
-        """Plots aero maps and saves them to saveDirectory
+            renderer is an AeroMapRenderer for the aero map's ride height grid to reuse - if it is None, a new figure is
+            built for this aero map and closed afterwards
+
+            A fingerprint of the figure's inputs is saved next to the figure (as fileName.fingerprint), and if
+            skipUnchanged is True, the saved fingerprint matches and the figure isn't older than its fingerprint, the
+            figure isn't rendered again - the fingerprint is saved just before the figure is rendered, so a figure that
+            failed to save (or an older copy of it) is always rendered again
+
+            Returns True if the figure was rendered, or False if it was skipped"""
+        # Matplotlib is only imported when plotting, so compute-only runs never load it
+        from aeroMapPlotting import AeroMapRenderer, getFigureFingerprint
+
+        boundsArray = [boundsFrontClA, boundsRearClA, boundsTotalClA, boundsTotalCdA, boundsEfficiency, boundsAeroBalance]
+
+        filePath = saveDirectory + "\\" + fileName
+        fingerprint = getFigureFingerprint(self.carName + " " + fileName, aeroMap, RHEnvelope2D, boundsArray)
+        if skipUnchanged:
+            try:
+                if os.path.getmtime(filePath + ".png") >= os.path.getmtime(filePath + ".fingerprint"):
+                    with open(filePath + ".fingerprint", "r") as fingerprintFile:
+                        if fingerprintFile.read() == fingerprint:
+                            return False
+            except OSError:
+                pass
+
+        with open(filePath + ".fingerprint", "w") as fingerprintFile:
+            fingerprintFile.write(fingerprint)
+
+        if renderer is not None:
+            renderer.render(saveDirectory, fileName, aeroMap, RHEnvelope2D, boundsArray)
+        else:
+            renderer = AeroMapRenderer(self.carName, aeroMap.frontRHArray, aeroMap.rearRHArray)
+            renderer.render(saveDirectory, fileName, aeroMap, RHEnvelope2D, boundsArray)
+            renderer.close()
+
+        return True
+
+    def plotAeroMaps(self, saveDirectory, frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, colliderMargin, wingAnglesArray, RHEnvelope2D=None, fileNames=None, boundsFrontClA=None, boundsRearClA=None, boundsTotalClA=None, boundsTotalCdA=None, boundsEfficiency=None, boundsAeroBalance=None, numRenderWorkers=None, streaming=False, skipUnchanged=False, adaptiveTolerance=None, envelopeMargin=None):
+        """Plots aero maps and saves them to saveDirectory, and returns the file names of the figures that were rendered
 
             fileNames is an array of names (as strings) that will be used as the plot file names (if it is None, then
             the wing angles will be used as names)
 
             If bounds are not passed, then they are set to the min and max values of all the aero maps calculated
-            Note that in this case, the frontClA and rearClA plots will share the same bounds"""
+            Note that in this case, the frontClA and rearClA plots will share the same bounds
+
+            If numRenderWorkers is more than 1, the figures are rendered in parallel across that many processes (the
+            saved files are identical to rendering them one at a time)
+
+            If streaming is True, the aero maps aren't all kept in memory - the first pass only keeps the min and max
+            values of each aero map (and is skipped if all the bounds are passed), and the second pass calculates each
+            aero map again (or loads it from the aero map cache), plots it and then discards it, so the memory used
+            doesn't depend on the number of wing angle combinations
+
+            If skipUnchanged is True, figures whose inputs haven't changed since they were last saved aren't rendered
+            again (see plotAeroMap())
+
+            If adaptiveTolerance is set, the aero maps are adaptively refined rather than calculated at every ride
+            height (see getAeroMap()), which is much faster for small values of RHStep
+
+            If envelopeMargin is set (in metres) and RHEnvelope2D is passed, the aero maps are only calculated within
+            the envelope dilated by envelopeMargin (see getSparseAeroMap()), and the rest of each plot is left blank"""
+        # Matplotlib is only imported when plotting, so compute-only runs never load it
+        from aeroMapPlotting import AeroMapRenderer, initRenderWorker, renderAeroMapWorker
+
         numMaps = len(wingAnglesArray)
 
+        def getMapRHEnvelope2D(wingAnglesIndex):
+            """Returns the RH envelope of wingAnglesArray[wingAnglesIndex] (or None if there isn't one)"""
+            # If RHEnvelope2D is a 2D array of the ride height envelope
+            if RHEnvelope2D is not None:
+                if np.ndim(RHEnvelope2D[0]) == 1:
+                    return RHEnvelope2D
+                # If RHEnvelope2D is an array containing the RHEnvelope2D arrays (where the index corresponds to the
+                # wing angle)
+                return RHEnvelope2D[wingAnglesIndex]
+            return None
+
+        isSparse = envelopeMargin is not None and RHEnvelope2D is not None
+
+        # Each wing's contribution is only calculated once for each of its angles (unless the aero maps are adaptively
+        # refined, or each sparse aero map has its own envelope, as then each aero map is calculated at different ride
+        # heights)
+        aeroBasis = None
+        if isSparse:
+            if np.ndim(RHEnvelope2D[0]) == 1:
+                aeroBasis = self.getSparseAeroMapBasis(frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep,
+                                                       RHEnvelope2D, envelopeMargin)
+        elif adaptiveTolerance is None:
+            aeroBasis = self.getAeroMapBasis(frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep)
+
+        def getWingAnglesAeroMap(wingAnglesIndex):
+            """Returns the aero map of wingAnglesArray[wingAnglesIndex]"""
+            if isSparse:
+                return self.getSparseAeroMap(frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, colliderMargin,
+                                             getMapRHEnvelope2D(wingAnglesIndex), envelopeMargin, aeroBasis=aeroBasis,
+                                             wingAngles=wingAnglesArray[wingAnglesIndex]).toAeroMap()
+            return self.getAeroMap(frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, colliderMargin,
+                                   aeroBasis=aeroBasis, wingAngles=wingAnglesArray[wingAnglesIndex],
+                                   adaptiveTolerance=adaptiveTolerance)
+
         # Set up variables to get min and max values
         initMin = 999
         initMax = -999
@@ -625,49 +1464,29 @@ class Car:
         efficiencyMin, efficiencyMax = initMin, initMax
         aeroBalanceMin, aeroBalanceMax = initMin, initMax
 
-        print("\nCalculating aero maps")
-
-        RHMaps = []
-        frontClAMaps = []
-        rearClAMaps = []
-        totalClAMaps = []
-        totalCdAMaps = []
-        efficiencyMaps = []
-        aeroBalanceMaps = []
-        isValidMaps = []
-        for i in range(numMaps):
-            self.setWingAngles(wingAnglesArray[i])
-
-            # Get aero maps
-            RHArray, frontClAArray2D, rearClAArray2D, totalClAArray2D, totalCdAArray2D, efficiencyArray2D, aeroBalanceArray2D, isValid2D = self.getAeroMap(frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, colliderMargin)
-
-            # Append aero maps to their arrays
-            RHMaps.append(RHArray)
-            frontClAMaps.append(frontClAArray2D)
-            rearClAMaps.append(rearClAArray2D)
-            totalClAMaps.append(totalClAArray2D)
-            totalCdAMaps.append(totalCdAArray2D)
-            efficiencyMaps.append(efficiencyArray2D)
-            aeroBalanceMaps.append(aeroBalanceArray2D)
-            isValidMaps.append(isValid2D)
-
-            # Update min values
-            frontClAMin = min(np.min(frontClAArray2D), frontClAMin)
-            rearClAMin = min(np.min(rearClAArray2D), rearClAMin)
-            totalClAMin = min(np.min(totalClAArray2D), totalClAMin)
-            totalCdAMin = min(np.min(totalCdAArray2D), totalCdAMin)
-            efficiencyMin = min(np.min(efficiencyArray2D), efficiencyMin)
-            aeroBalanceMin = min(np.min(aeroBalanceArray2D), aeroBalanceMin)
-
-            # Update max values
-            frontClAMax = max(np.max(frontClAArray2D), frontClAMax)
-            rearClAMax = max(np.max(rearClAArray2D), rearClAMax)
-            totalClAMax = max(np.max(totalClAArray2D), totalClAMax)
-            totalCdAMax = max(np.max(totalCdAArray2D), totalCdAMax)
-            efficiencyMax = max(np.max(efficiencyArray2D), efficiencyMax)
-            aeroBalanceMax = max(np.max(aeroBalanceArray2D), aeroBalanceMax)
-
-            print("Calculated", i + 1, "of", numMaps, wingAnglesArray[i])
+        boundsArray = [boundsFrontClA, boundsRearClA, boundsTotalClA, boundsTotalCdA, boundsEfficiency, boundsAeroBalance]
+        aeroMaps = []
+        if not streaming or None in boundsArray:
+            print("\nCalculating aero maps")
+            for i in range(numMaps):
+                # Get aero map
+                aeroMap = getWingAnglesAeroMap(i)
+                if not streaming:
+                    aeroMaps.append(aeroMap)
+
+                # Update min and max values
+                [[frontClAMapMin, frontClAMapMax], [rearClAMapMin, rearClAMapMax], [totalClAMapMin, totalClAMapMax],
+                 [totalCdAMapMin, totalCdAMapMax], [efficiencyMapMin, efficiencyMapMax],
+                 [aeroBalanceMapMin, aeroBalanceMapMax]] = aeroMap.getMinMax()
+
+                frontClAMin, frontClAMax = min(frontClAMapMin, frontClAMin), max(frontClAMapMax, frontClAMax)
+                rearClAMin, rearClAMax = min(rearClAMapMin, rearClAMin), max(rearClAMapMax, rearClAMax)
+                totalClAMin, totalClAMax = min(totalClAMapMin, totalClAMin), max(totalClAMapMax, totalClAMax)
+                totalCdAMin, totalCdAMax = min(totalCdAMapMin, totalCdAMin), max(totalCdAMapMax, totalCdAMax)
+                efficiencyMin, efficiencyMax = min(efficiencyMapMin, efficiencyMin), max(efficiencyMapMax, efficiencyMax)
+                aeroBalanceMin, aeroBalanceMax = min(aeroBalanceMapMin, aeroBalanceMin), max(aeroBalanceMapMax, aeroBalanceMax)
+
+                print("Calculated", i + 1, "of", numMaps, wingAnglesArray[i])
 
         # Set the min and max values of frontClA and rearClA to the same thing
         frontClAMin = min(frontClAMin, rearClAMin)
@@ -683,82 +1502,644 @@ class Car:
         if boundsEfficiency is None: boundsEfficiency = [efficiencyMin, efficiencyMax]
         if boundsAeroBalance is None: boundsAeroBalance = [aeroBalanceMin, aeroBalanceMax]
 
-        # Plot aero maps
-        print("\nPlotting aero maps")
-        for i in range(len(wingAnglesArray)):
+        def getPlotTask(i):
+            """Returns the arguments of plotAeroMap() for wingAnglesArray[i] (calculating its aero map again if
+                streaming)"""
             if fileNames is not None:
                 fileName = fileNames[i]
             else:
                 fileName = str(wingAnglesArray[i])
 
-            # If RHEnvelope2D is a 2D array of the ride height envelope
-            if RHEnvelope2D is not None:
-                if type(RHEnvelope2D[0][0]) is not list:
-                    self.plotAeroMap(saveDirectory, fileName, RHMaps[i], frontClAMaps[i], rearClAMaps[i], totalClAMaps[i], totalCdAMaps[i], efficiencyMaps[i], aeroBalanceMaps[i], isValidMaps[i], RHEnvelope2D, boundsFrontClA, boundsRearClA, boundsTotalClA, boundsTotalCdA, boundsEfficiency, boundsAeroBalance)
-                else:
-                    # If RHEnvelope2D is an array containing the RHEnvelope2D arrays (where the index corresponds to the
-                    # wing angle)
-                    self.plotAeroMap(saveDirectory, fileName, RHMaps[i], frontClAMaps[i], rearClAMaps[i], totalClAMaps[i], totalCdAMaps[i], efficiencyMaps[i], aeroBalanceMaps[i], isValidMaps[i], RHEnvelope2D[i], boundsFrontClA, boundsRearClA, boundsTotalClA, boundsTotalCdA, boundsEfficiency, boundsAeroBalance)
-            else:
-                self.plotAeroMap(saveDirectory, fileName, RHMaps[i], frontClAMaps[i], rearClAMaps[i], totalClAMaps[i], totalCdAMaps[i], efficiencyMaps[i], aeroBalanceMaps[i], isValidMaps[i], RHEnvelope2D, boundsFrontClA, boundsRearClA, boundsTotalClA, boundsTotalCdA, boundsEfficiency, boundsAeroBalance)
-            print("Plotted", i + 1, "of", numMaps)
+            mapRHEnvelope2D = getMapRHEnvelope2D(i)
+            aeroMap = getWingAnglesAeroMap(i) if streaming else aeroMaps[i]
+            return saveDirectory, fileName, aeroMap, mapRHEnvelope2D, boundsFrontClA, boundsRearClA, boundsTotalClA, boundsTotalCdA, boundsEfficiency, boundsAeroBalance
 
-    def calculateAeroRHTelem(self, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem):
+        # Plot aero maps
+        print("\nPlotting aero maps")
+        renderedFileNames = []
+        if numRenderWorkers is None or numRenderWorkers <= 1:
+            # All the aero maps are on the same ride height grid, so the figure is only built once
+            renderer = None
+            for i in range(numMaps):
+                plotTask = getPlotTask(i)
+                if renderer is None:
+                    renderer = AeroMapRenderer(self.carName, plotTask[2].frontRHArray, plotTask[2].rearRHArray)
+                if self.plotAeroMap(*plotTask, renderer=renderer, skipUnchanged=skipUnchanged):
+                    renderedFileNames.append(plotTask[1])
+                    print("Plotted", i + 1, "of", numMaps)
+                else:
+                    print("Unchanged", i + 1, "of", numMaps)
+            if renderer is not None:
+                renderer.close()
+        else:
+            # Each worker renders whole figures with the headless Agg backend, which produces the same files as the
+            # serial path - only a few figures are queued at a time, so streamed aero maps aren't all held waiting to
+            # be rendered
+            maxQueuedFigures = numRenderWorkers * 2
+            numPlotted = 0
+            with concurrent.futures.ProcessPoolExecutor(max_workers=numRenderWorkers, initializer=initRenderWorker, initargs=(self,)) as executor:
+                futureFileNames = {}
+                for i in range(numMaps + 1):
+                    if i < numMaps:
+                        plotTask = getPlotTask(i)
+                        futureFileNames[executor.submit(renderAeroMapWorker, plotTask, skipUnchanged)] = plotTask[1]
+                    while len(futureFileNames) >= maxQueuedFigures or (i == numMaps and len(futureFileNames) > 0):
+                        doneFutures, _ = concurrent.futures.wait(futureFileNames, return_when=concurrent.futures.FIRST_COMPLETED)
+                        for future in doneFutures:
+                            fileName = futureFileNames.pop(future)
+                            numPlotted += 1
+                            if future.result():
+                                renderedFileNames.append(fileName)
+                                print("Plotted", numPlotted, "of", numMaps)
+                            else:
+                                print("Unchanged", numPlotted, "of", numMaps)
+
+        print("\nRendered", len(renderedFileNames), "of", numMaps, "figures (the rest were unchanged):")
+        for fileName in renderedFileNames:
+            print("\t" + fileName)
+        return renderedFileNames
+
+    def getLookupError(self, aeroMap, frontRH, rearRH, numValidationPoints=1000, wingAngles=None):
+        """Returns the maximum absolute error of each metric (in the order of AeroMap.metricNames) when the aero numbers
+            are bilinearly interpolated from aeroMap (calculated with wingAngles, or the current wing angles if it is
+            None) rather than calculated, over a validation subset of up to numValidationPoints evenly spaced points of
+            the ride heights frontRH and rearRH (1D arrays in metres)"""
+        frontRH = np.asarray(frontRH, dtype=float)
+        rearRH = np.asarray(rearRH, dtype=float)
+        validationIndexes = np.unique(np.linspace(0, len(frontRH) - 1, min(len(frontRH), numValidationPoints)).astype(int))
+
+        exactMetricArrays = self.calculateAeroArray(frontRH[validationIndexes], rearRH[validationIndexes], wingAngles)
+        interpolatedMetricArrays = aeroMap.interpolate(frontRH[validationIndexes], rearRH[validationIndexes])
+        return np.max(np.abs(np.array(interpolatedMetricArrays) - np.array(exactMetricArrays)), axis=1)
+
+    def calculateAeroRHTelem(self, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, aeroMap=None, wingAngles=None):
         """Returns frontClAWeightedAverage, rearClAWeightedAverage, totalClAWeightedAverage, totalCdAWeightedAverage, efficiencyWeightedAverage, aeroBalanceWeightedAverage
 
             Calculates the weighted average of aero numbers over the telemetry ride heights, where the weighting is
-            speed^(velocity power)"""
-        numTelemPoints = len(groundSpeedTelem)
+            speed^(velocity power)
 
-        velocityWeightingSum = 0
+            wingAngles is in the same form as setWingAngles() - if it is None, the current wing angles are used (the
+            car is never changed, so this is safe to call from multiple threads)
 
-        frontClAWeightedAverage = 0
-        rearClAWeightedAverage = 0
-        totalClAWeightedAverage = 0
-        totalCdAWeightedAverage = 0
-        efficiencyWeightedAverage = 0
-        aeroBalanceWeightedAverage = 0
+            If aeroMap (an AeroMap calculated with the same wing angles, covering the telemetry ride heights) is passed
+            in, the aero numbers are bilinearly interpolated from it rather than calculated (see AeroMap.interpolate()
+            and getLookupError())"""
+        # Calculate the aero numbers for every telemetry data point at once
+        if aeroMap is not None:
+            frontClA, rearClA, totalClA, totalCdA, efficiency, aeroBalance = aeroMap.interpolate(np.asarray(frontRHTelem, dtype=float), np.asarray(rearRHTelem, dtype=float))
+        else:
+            frontClA, rearClA, totalClA, totalCdA, efficiency, aeroBalance = self.calculateAeroArray(frontRHTelem, rearRHTelem, wingAngles)
 
         # Calculate the weighted average of the aero numbers, for the telemetry passed in
-        for i in range(numTelemPoints):
-            velocityWeighting = pow(groundSpeedTelem[i], velocityPower)
-            velocityWeightingSum += velocityWeighting
-
-            frontClA, rearClA, totalClA, totalCdA, efficiency, aeroBalance = self.calculateAero(frontRHTelem[i], rearRHTelem[i])
-
-            frontClAWeightedAverage += frontClA * velocityWeighting
-            rearClAWeightedAverage += rearClA * velocityWeighting
-            totalClAWeightedAverage += totalClA * velocityWeighting
-            totalCdAWeightedAverage += totalCdA * velocityWeighting
-            efficiencyWeightedAverage += efficiency * velocityWeighting
-            aeroBalanceWeightedAverage += aeroBalance * velocityWeighting
-
-        frontClAWeightedAverage /= velocityWeightingSum
-        rearClAWeightedAverage /= velocityWeightingSum
-        totalClAWeightedAverage /= velocityWeightingSum
-        totalCdAWeightedAverage /= velocityWeightingSum
-        efficiencyWeightedAverage /= velocityWeightingSum
-        aeroBalanceWeightedAverage /= velocityWeightingSum
+        velocityWeighting = np.power(np.asarray(groundSpeedTelem, dtype=float), velocityPower)
+        velocityWeightingSum = np.sum(velocityWeighting)
+
+        frontClAWeightedAverage = np.dot(frontClA, velocityWeighting) / velocityWeightingSum
+        rearClAWeightedAverage = np.dot(rearClA, velocityWeighting) / velocityWeightingSum
+        totalClAWeightedAverage = np.dot(totalClA, velocityWeighting) / velocityWeightingSum
+        totalCdAWeightedAverage = np.dot(totalCdA, velocityWeighting) / velocityWeightingSum
+        efficiencyWeightedAverage = np.dot(efficiency, velocityWeighting) / velocityWeightingSum
+        aeroBalanceWeightedAverage = np.dot(aeroBalance, velocityWeighting) / velocityWeightingSum
 
         return frontClAWeightedAverage, rearClAWeightedAverage, totalClAWeightedAverage, totalCdAWeightedAverage, efficiencyWeightedAverage, aeroBalanceWeightedAverage
 
-    def optimiseAeroRHTelem(self, frontRHOffsetMin, frontRHOffsetMax, rearRHOffsetMin, rearRHOffsetMax, wingAnglesArray, aeroBalanceTarget, aeroBalanceTolerance, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem):
-        """Returns validSetups, maxTotalClASetup, minTotalCdASetup, maxEfficiencySetup
+    def calculateAeroRHTelemBootstrap(self, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, numResamples=500, confidenceLevel=0.95, blockLength=None, aeroMap=None, wingAngles=None, seed=None):
+        """Returns a NumPy array of shape (6, 3), where each row is [weightedAverage, lower, upper] for frontClA,
+            rearClA, totalClA, totalCdA, efficiency and aeroBalance - weightedAverage is the same as
+            calculateAeroRHTelem(), and lower and upper are the bounds of its confidence interval (confidenceLevel is
+            e.g. 0.95 for a 95% confidence interval)
+
+            The confidence intervals are found with a circular block bootstrap - the telemetry is resampled numResamples
+            times by joining randomly chosen blocks of blockLength consecutive data points (wrapping around at the end),
+            so the correlation between nearby data points is kept, and cutting the last block short so each resample
+            has the same number of data points as the telemetry. If blockLength is None, it's the cube root of the
+            number of data points. The intervals are the percentiles of the weighted averages of the resamples
+
+            The aero numbers are only calculated once per data point (aeroMap and wingAngles are used the same as in
+            calculateAeroRHTelem()). The weighted sum of every possible block is then found from prefix sums, so all
+            the resamples are calculated at once by adding up the sums of their blocks
+
+            seed is passed to NumPy's default_rng(), so the resamples can be repeated"""
+        # Calculate the aero numbers for every telemetry data point at once
+        if aeroMap is not None:
+            metricArrays = np.array(aeroMap.interpolate(np.asarray(frontRHTelem, dtype=float), np.asarray(rearRHTelem, dtype=float)))
+        else:
+            metricArrays = np.array(self.calculateAeroArray(frontRHTelem, rearRHTelem, wingAngles))
+        velocityWeighting = np.power(np.asarray(groundSpeedTelem, dtype=float), velocityPower)
+        numTelemPoints = len(velocityWeighting)
+
+        if blockLength is None:
+            blockLength = round(numTelemPoints ** (1 / 3))
+        blockLength = min(max(int(blockLength), 1), numTelemPoints)
+        numBlocks = math.ceil(numTelemPoints / blockLength)
+        lastBlockLength = numTelemPoints - (numBlocks - 1) * blockLength
+
+        # Prefix sums of the weighted aero numbers (with the weights themselves in the last row), extended past the end
+        # so blocks can wrap around - the sum of the block starting at index i is prefixSums[:, i + blockLength] -
+        # prefixSums[:, i]
+        weightedArrays = np.vstack([metricArrays * velocityWeighting, velocityWeighting])
+        weightedArrays = np.concatenate([weightedArrays, weightedArrays[:, :blockLength - 1]], axis=1)
+        prefixSums = np.zeros((len(weightedArrays), weightedArrays.shape[1] + 1))
+        np.cumsum(weightedArrays, axis=1, out=prefixSums[:, 1:])
+        blockSums = prefixSums[:, blockLength:blockLength + numTelemPoints] - prefixSums[:, :numTelemPoints]
+        lastBlockSums = prefixSums[:, lastBlockLength:lastBlockLength + numTelemPoints] - prefixSums[:, :numTelemPoints]
+
+        # Sum the randomly chosen blocks of every resample (where the last block is only its first lastBlockLength
+        # data points), then divide by the sum of the weights of those blocks
+        blockStarts = np.random.default_rng(seed).integers(0, numTelemPoints, (numResamples, numBlocks))
+        resampleSums = lastBlockSums[:, blockStarts[:, -1]]
+        for blockIndex in range(numBlocks - 1):
+            resampleSums += blockSums[:, blockStarts[:, blockIndex]]
+        resampleWeightedAverages = resampleSums[:-1] / resampleSums[-1]
+
+        weightedAverages = metricArrays @ velocityWeighting / np.sum(velocityWeighting)
+        bounds = np.percentile(resampleWeightedAverages, [50 * (1 - confidenceLevel), 50 * (1 + confidenceLevel)], axis=1)
+        return np.column_stack([weightedAverages, bounds[0], bounds[1]])
+
+    def evaluateSetups(self, frontRHOffsets, rearRHOffsets, wingAnglesArray, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem):
+        """Returns setupResults, a NumPy array of shape (len(wingAnglesArray), len(rearRHOffsets), len(frontRHOffsets), 6),
+            where setupResults[wingAnglesIndex][rearRHOffsetIndex][frontRHOffsetIndex] are the weighted averages
+            (frontClA, rearClA, ClA, CdA, efficiency, aeroBalance) of that setup, as described in calculateAeroRHTelem()
+
+            For each RH offset, each wing's contribution is calculated once per angle (see AeroBasis), then reused for
+            all the wing angle combinations"""
+        frontRHTelem = np.asarray(frontRHTelem, dtype=float)
+        rearRHTelem = np.asarray(rearRHTelem, dtype=float)
+        velocityWeighting = np.power(np.asarray(groundSpeedTelem, dtype=float), velocityPower)
+        velocityWeightingSum = np.sum(velocityWeighting)
+
+        setupResults = np.empty((len(wingAnglesArray), len(rearRHOffsets), len(frontRHOffsets), len(AeroMap.metricNames)))
+        for rearRHOffsetIndex in range(len(rearRHOffsets)):
+            for frontRHOffsetIndex in range(len(frontRHOffsets)):
+                aeroBasis = AeroBasis(self, frontRHTelem + frontRHOffsets[frontRHOffsetIndex], rearRHTelem + rearRHOffsets[rearRHOffsetIndex])
+                for wingAnglesIndex in range(len(wingAnglesArray)):
+                    metricArrays = aeroBasis.calculateAero(wingAnglesArray[wingAnglesIndex])
+                    setupResults[wingAnglesIndex, rearRHOffsetIndex, frontRHOffsetIndex] = [np.dot(metricArray, velocityWeighting) / velocityWeightingSum for metricArray in metricArrays]
+
+        return setupResults
+
+    def evaluateSetupsHistogram(self, frontRHOffsets, rearRHOffsets, wingAnglesArray, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, histogramRHStep):
+        """Returns setupResults in the same form as evaluateSetups(), but calculated from a ride height histogram
+
+            The telemetry is binned once into a 2D histogram on a ride height grid with a spacing of histogramRHStep,
+            where each bin is weighted by speed^(velocity power), and the aero map is calculated once (per wing angle
+            combination) as a sparse aero map, at only the grid ride heights that the histogram bins land on when
+            shifted by any of the RH offsets (rather than the whole rectangle covering them, most of which the car
+            never visits). The weighted average for each RH offset is then just the weighted sum of the histogram with
+            the aero map shifted by that offset (i.e. a cross-correlation), so the time taken depends on the size of
+            the (offset) telemetry envelope rather than the number of telemetry points multiplied by the number of
+            offsets
+
+            Each telemetry ride height is moved to the nearest histogram grid point, so the aero numbers are slightly
+            different to evaluateSetups() - the RH offsets must be multiples of histogramRHStep"""
+        frontRHTelem = np.asarray(frontRHTelem, dtype=float)
+        rearRHTelem = np.asarray(rearRHTelem, dtype=float)
+        velocityWeighting = np.power(np.asarray(groundSpeedTelem, dtype=float), velocityPower)
+
+        # Convert the RH offsets to a number of histogram grid steps
+        frontRHOffsetSteps = np.rint(np.asarray(frontRHOffsets, dtype=float) / histogramRHStep).astype(int)
+        rearRHOffsetSteps = np.rint(np.asarray(rearRHOffsets, dtype=float) / histogramRHStep).astype(int)
+        if (not np.allclose(frontRHOffsetSteps * histogramRHStep, frontRHOffsets, rtol=0, atol=histogramRHStep * 1e-6)
+                or not np.allclose(rearRHOffsetSteps * histogramRHStep, rearRHOffsets, rtol=0, atol=histogramRHStep * 1e-6)):
+            raise Exception("The RH offsets must be multiples of histogramRHStep")
+
+        # Bin the telemetry into the weighted histogram (only the bins containing telemetry are kept)
+        frontRHOrigin = np.floor(np.min(frontRHTelem) / histogramRHStep) * histogramRHStep
+        rearRHOrigin = np.floor(np.min(rearRHTelem) / histogramRHStep) * histogramRHStep
+        frontRHBins = np.rint((frontRHTelem - frontRHOrigin) / histogramRHStep).astype(int)
+        rearRHBins = np.rint((rearRHTelem - rearRHOrigin) / histogramRHStep).astype(int)
+        numFrontRHBins = np.max(frontRHBins) + 1
+        histogram = np.bincount(rearRHBins * numFrontRHBins + frontRHBins, weights=velocityWeighting)
+        histogramBins = np.nonzero(histogram)[0]
+        histogramWeights = histogram[histogramBins]
+        histogramWeightsSum = np.sum(histogramWeights)
+        rearRHHistogramBins, frontRHHistogramBins = np.divmod(histogramBins, numFrontRHBins)
+
+        # Ride height grid covering the histogram shifted by every RH offset
+        frontRHGridSteps = np.arange(np.min(frontRHOffsetSteps), np.max(frontRHOffsetSteps) + numFrontRHBins)
+        rearRHGridSteps = np.arange(np.min(rearRHOffsetSteps), np.max(rearRHOffsetSteps) + np.max(rearRHBins) + 1)
+
+        # Flat grid indexes of the histogram bins for every RH offset, in the form [rearRHOffsetIndex][frontRHOffsetIndex][bin]
+        # - the sparse aero map is calculated at just these grid ride heights, and shiftedBinPositions is where each one
+        # is stored in it
+        frontRHGridIndexes = (frontRHOffsetSteps - frontRHGridSteps[0])[:, None] + frontRHHistogramBins[None, :]
+        rearRHGridIndexes = (rearRHOffsetSteps - rearRHGridSteps[0])[:, None] + rearRHHistogramBins[None, :]
+        shiftedBinGridIndexes = rearRHGridIndexes[:, None, :] * len(frontRHGridSteps) + frontRHGridIndexes[None, :, :]
+        gridIndexes, shiftedBinPositions = np.unique(shiftedBinGridIndexes, return_inverse=True)
+        shiftedBinPositions = shiftedBinPositions.reshape(shiftedBinGridIndexes.shape)
+        rearRHIndexes, frontRHIndexes = np.divmod(gridIndexes, len(frontRHGridSteps))
+        aeroBasis = AeroBasis(self, frontRHOrigin + frontRHGridSteps[frontRHIndexes] * histogramRHStep,
+                              rearRHOrigin + rearRHGridSteps[rearRHIndexes] * histogramRHStep)
+
+        setupResults = np.empty((len(wingAnglesArray), len(rearRHOffsets), len(frontRHOffsets), len(AeroMap.metricNames)))
+        for wingAnglesIndex in range(len(wingAnglesArray)):
+            metricArrays = np.array(aeroBasis.calculateAero(wingAnglesArray[wingAnglesIndex]))
+            for rearRHOffsetIndex in range(len(rearRHOffsets)):
+                # In the form [metric][frontRHOffsetIndex][bin]
+                shiftedMetricArrays = metricArrays[:, shiftedBinPositions[rearRHOffsetIndex]]
+                setupResults[wingAnglesIndex, rearRHOffsetIndex] = (shiftedMetricArrays @ histogramWeights).T / histogramWeightsSum
+
+        return setupResults
+
+    def evaluateSetupsLookup(self, frontRHOffsets, rearRHOffsets, wingAnglesArray, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, lookupRHStep, numValidationPoints=1000, printLookupError=False):
+        """Returns setupResults in the same form as evaluateSetups(), but with the aero numbers of every telemetry point
+            bilinearly interpolated from an aero map (from getAeroMap(), so it's stored in and read from the aero map
+            cache) with a grid spacing of lookupRHStep, calculated once per wing angle combination on a grid covering
+            the telemetry shifted by all the RH offsets
+
+            The RH offsets must be multiples of lookupRHStep, so shifting the telemetry doesn't change where each point
+            is between the grid points - so each point's weighting (speed^(velocity power)) is split between its 4
+            surrounding grid points once, and the weighted average for each RH offset is the weighted sum of the aero
+            map shifted by that offset (like evaluateSetupsHistogram(), but identical to interpolating every telemetry
+            point with AeroMap.interpolate())
+
+            If printLookupError is True, the maximum interpolation error of each metric, compared to calculating the
+            aero numbers (see getLookupError()), is printed for the middle RH offsets over a validation subset of the
+            telemetry"""
+        frontRHTelem = np.asarray(frontRHTelem, dtype=float)
+        rearRHTelem = np.asarray(rearRHTelem, dtype=float)
+        velocityWeighting = np.power(np.asarray(groundSpeedTelem, dtype=float), velocityPower)
+
+        # Convert the RH offsets to a number of grid steps
+        frontRHOffsetSteps = np.rint(np.asarray(frontRHOffsets, dtype=float) / lookupRHStep).astype(int)
+        rearRHOffsetSteps = np.rint(np.asarray(rearRHOffsets, dtype=float) / lookupRHStep).astype(int)
+        if (not np.allclose(frontRHOffsetSteps * lookupRHStep, frontRHOffsets, rtol=0, atol=lookupRHStep * 1e-6)
+                or not np.allclose(rearRHOffsetSteps * lookupRHStep, rearRHOffsets, rtol=0, atol=lookupRHStep * 1e-6)):
+            raise Exception("The RH offsets must be multiples of lookupRHStep")
+
+        # Split the weighting of each telemetry point between its 4 surrounding grid points (only the grid points with
+        # a weighting are kept)
+        frontRHOrigin = np.floor(np.min(frontRHTelem) / lookupRHStep) * lookupRHStep
+        rearRHOrigin = np.floor(np.min(rearRHTelem) / lookupRHStep) * lookupRHStep
+        frontRHPositions = np.maximum((frontRHTelem - frontRHOrigin) / lookupRHStep, 0)
+        rearRHPositions = np.maximum((rearRHTelem - rearRHOrigin) / lookupRHStep, 0)
+        frontRHBins = np.floor(frontRHPositions).astype(int)
+        rearRHBins = np.floor(rearRHPositions).astype(int)
+        frontRHFractions = frontRHPositions - frontRHBins
+        rearRHFractions = rearRHPositions - rearRHBins
+        numFrontRHBins = np.max(frontRHBins) + 2
+        numRearRHBins = np.max(rearRHBins) + 2
+        binWeights = np.zeros(numRearRHBins * numFrontRHBins)
+        for rearRHCorner, rearRHCornerWeights in [[0, 1 - rearRHFractions], [1, rearRHFractions]]:
+            for frontRHCorner, frontRHCornerWeights in [[0, 1 - frontRHFractions], [1, frontRHFractions]]:
+                binWeights += np.bincount((rearRHBins + rearRHCorner) * numFrontRHBins + frontRHBins + frontRHCorner,
+                                          weights=velocityWeighting * rearRHCornerWeights * frontRHCornerWeights,
+                                          minlength=len(binWeights))
+        gridBins = np.nonzero(binWeights)[0]
+        gridBinWeights = binWeights[gridBins]
+        gridBinWeightsSum = np.sum(velocityWeighting)
+        rearRHGridBins, frontRHGridBins = np.divmod(gridBins, numFrontRHBins)
+
+        # Ride height grid covering the telemetry shifted by every RH offset
+        frontRHGridSteps = np.arange(np.min(frontRHOffsetSteps), np.max(frontRHOffsetSteps) + numFrontRHBins)
+        rearRHGridSteps = np.arange(np.min(rearRHOffsetSteps), np.max(rearRHOffsetSteps) + numRearRHBins)
+        frontRHMin, frontRHMax = frontRHOrigin + frontRHGridSteps[0] * lookupRHStep, frontRHOrigin + frontRHGridSteps[-1] * lookupRHStep
+        rearRHMin, rearRHMax = rearRHOrigin + rearRHGridSteps[0] * lookupRHStep, rearRHOrigin + rearRHGridSteps[-1] * lookupRHStep
+        aeroBasis = self.getAeroMapBasis(frontRHMin, frontRHMax, rearRHMin, rearRHMax, lookupRHStep)
+
+        # Grid indexes of the weighted grid points for every front RH offset, in the form [frontRHOffsetIndex][bin]
+        frontRHGridIndexes = (frontRHOffsetSteps - frontRHGridSteps[0])[:, None] + frontRHGridBins[None, :]
+
+        # Telemetry shifted by the middle RH offsets, for checking the interpolation error
+        frontRHValidation = frontRHTelem + frontRHOffsets[len(frontRHOffsets) // 2]
+        rearRHValidation = rearRHTelem + rearRHOffsets[len(rearRHOffsets) // 2]
+        maxLookupErrors = np.zeros(len(AeroMap.metricNames))
+
+        setupResults = np.empty((len(wingAnglesArray), len(rearRHOffsets), len(frontRHOffsets), len(AeroMap.metricNames)))
+        for wingAnglesIndex in range(len(wingAnglesArray)):
+            # The aero map is read from the aero map cache if it's already been calculated
+            aeroMap = self.getAeroMap(frontRHMin, frontRHMax, rearRHMin, rearRHMax, lookupRHStep, 0, aeroBasis=aeroBasis, wingAngles=wingAnglesArray[wingAnglesIndex])
+            metricArrays = aeroMap.metricArrays
+            for rearRHOffsetIndex in range(len(rearRHOffsets)):
+                rearRHGridIndexes = rearRHOffsetSteps[rearRHOffsetIndex] - rearRHGridSteps[0] + rearRHGridBins
+                # In the form [metric][frontRHOffsetIndex][bin]
+                shiftedMetricArrays = metricArrays[:, rearRHGridIndexes[None, :], frontRHGridIndexes]
+                setupResults[wingAnglesIndex, rearRHOffsetIndex] = (shiftedMetricArrays @ gridBinWeights).T / gridBinWeightsSum
+
+            if printLookupError:
+                maxLookupErrors = np.maximum(maxLookupErrors, self.getLookupError(aeroMap, frontRHValidation, rearRHValidation, numValidationPoints, wingAnglesArray[wingAnglesIndex]))
+
+        if printLookupError:
+            print("Maximum lookup interpolation errors (validation subset):")
+            for metricIndex in range(len(AeroMap.metricNames)):
+                print("\t" + AeroMap.metricNames[metricIndex] + ":", maxLookupErrors[metricIndex])
+
+        return setupResults
+
+    def evaluateSetupsBracketed(self, frontRHOffsets, rearRHOffsets, wingAnglesArray, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, minAllowedAeroBalance, maxAllowedAeroBalance, printEvaluations=False):
+        """Returns setupResults in the same form as evaluateSetups(), but only the setups near the allowed aero balance
+            band are evaluated - the rest are NaN (so they're never valid)
+
+            For a fixed wing angle combination and front RH offset, the weighted aero balance is close to monotonic in
+            the rear RH offset (i.e. in rake), so the rear RH offsets where it enters and leaves the band are found by
+            bisection, then only the offsets between them are evaluated. The evaluated range is then extended past
+            each end until a setup outside the band is found, so any valid setups just outside the bisected range (if
+            the aero balance isn't quite monotonic) are still found
+
+            All the wing angle combinations are bisected together, so the setups evaluated at the same time with the
+            same RH offsets share one AeroBasis - the setups that are evaluated have identical values to
+            evaluateSetups(). If printEvaluations is True, the number of setups evaluated is printed"""
+        frontRHTelem = np.asarray(frontRHTelem, dtype=float)
+        rearRHTelem = np.asarray(rearRHTelem, dtype=float)
+        velocityWeighting = np.power(np.asarray(groundSpeedTelem, dtype=float), velocityPower)
+        velocityWeightingSum = np.sum(velocityWeighting)
+        numWingAngles = len(wingAnglesArray)
+        numRearRHOffsets = len(rearRHOffsets)
+        wingAnglesIndexes = np.arange(numWingAngles)
+
+        setupResults = np.full((numWingAngles, numRearRHOffsets, len(frontRHOffsets), len(AeroMap.metricNames)), np.nan)
+        numEvaluations = 0
+        for frontRHOffsetIndex in range(len(frontRHOffsets)):
+            # In the form [wingAnglesIndex][rearRHOffsetIndex][metric]
+            results = setupResults[:, :, frontRHOffsetIndex]
+
+            def getAeroBalances(wingAnglesIndexArray, rearRHOffsetIndexArray):
+                """Returns the weighted aero balances of the setups (wingAnglesIndexArray[i], rearRHOffsetIndexArray[i]),
+                    evaluating any that haven't already been evaluated - all the wing angle combinations at each rear
+                    RH offset are evaluated together, so they share one AeroBasis"""
+                nonlocal numEvaluations
+                for rearRHOffsetIndex in np.unique(rearRHOffsetIndexArray):
+                    toEvaluate = wingAnglesIndexArray[(rearRHOffsetIndexArray == rearRHOffsetIndex) & np.isnan(results[wingAnglesIndexArray, rearRHOffsetIndexArray, 5])]
+                    if len(toEvaluate) > 0:
+                        aeroBasis = AeroBasis(self, frontRHTelem + frontRHOffsets[frontRHOffsetIndex], rearRHTelem + rearRHOffsets[rearRHOffsetIndex])
+                        for wingAnglesIndex in np.unique(toEvaluate):
+                            results[wingAnglesIndex, rearRHOffsetIndex] = [np.dot(metricArray, velocityWeighting) / velocityWeightingSum for metricArray in aeroBasis.calculateAero(wingAnglesArray[wingAnglesIndex])]
+                            numEvaluations += 1
+                return results[wingAnglesIndexArray, rearRHOffsetIndexArray, 5]
+
+            # Flip the aero balance (and band) of each wing angle combination if it decreases with rear RH offset, so
+            # it's always increasing
+            getAeroBalances(np.concatenate([wingAnglesIndexes, wingAnglesIndexes]), np.repeat([0, numRearRHOffsets - 1], numWingAngles))
+            direction = np.where(results[:, -1, 5] >= results[:, 0, 5], 1, -1)
+            lowerBound = np.minimum(direction * minAllowedAeroBalance, direction * maxAllowedAeroBalance)
+            upperBound = np.maximum(direction * minAllowedAeroBalance, direction * maxAllowedAeroBalance)
+
+            # Bisect (for all wing angle combinations at once) for the first rear RH offset with aero balance >=
+            # lowerBound, and then for the last rear RH offset with aero balance <= upperBound
+            bandIndexes = []
+            for isLowerEdge in [True, False]:
+                lowerIndex, upperIndex = np.zeros(numWingAngles, dtype=int), np.full(numWingAngles, numRearRHOffsets)
+                while np.any(lowerIndex < upperIndex):
+                    active = wingAnglesIndexes[lowerIndex < upperIndex]
+                    middleIndex = (lowerIndex[active] + upperIndex[active]) // 2
+                    aeroBalance = direction[active] * getAeroBalances(active, middleIndex)
+                    if isLowerEdge:
+                        isAbove = aeroBalance >= lowerBound[active]
+                    else:
+                        isAbove = aeroBalance > upperBound[active]
+                    upperIndex[active] = np.where(isAbove, middleIndex, upperIndex[active])
+                    lowerIndex[active] = np.where(isAbove, lowerIndex[active], middleIndex + 1)
+                bandIndexes.append(lowerIndex if isLowerEdge else lowerIndex - 1)
+            bandStartIndex, bandEndIndex = bandIndexes
+
+            # Evaluate the rear RH offsets in the band
+            bandLengths = np.maximum(bandEndIndex - bandStartIndex + 1, 0)
+            bandWingAnglesIndexes = np.repeat(wingAnglesIndexes, bandLengths)
+            getAeroBalances(bandWingAnglesIndexes, np.repeat(bandStartIndex, bandLengths) + np.arange(np.sum(bandLengths)) - np.repeat(np.cumsum(bandLengths) - bandLengths, bandLengths))
+
+            # Extend past each end of the band until a setup outside the band is found
+            for step in [-1, 1]:
+                edgeIndex = bandStartIndex.copy() if step == -1 else bandEndIndex.copy()
+                isExtending = bandLengths > 0
+                while True:
+                    isExtending &= (edgeIndex + step >= 0) & (edgeIndex + step < numRearRHOffsets)
+                    active = wingAnglesIndexes[isExtending]
+                    if len(active) == 0:
+                        break
+                    aeroBalance = direction[active] * getAeroBalances(active, edgeIndex[active] + step)
+                    isInBand = (lowerBound[active] <= aeroBalance) & (aeroBalance <= upperBound[active])
+                    edgeIndex[active[isInBand]] += step
+                    isExtending[active[~isInBand]] = False
+
+        if printEvaluations:
+            print("Setups evaluated:", numEvaluations, "of", setupResults.shape[0] * setupResults.shape[1] * setupResults.shape[2])
+
+        return setupResults
+
+    def evaluateSetupsContour(self, frontRHOffsets, rearRHOffsets, wingAnglesArray, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, minAllowedAeroBalance, maxAllowedAeroBalance, contourBalanceMargin=0, numValidationPoints=1000, printScreening=False):
+        """Returns setupResults in the same form as evaluateSetups(), but only the setups that could have an aero balance
+            within the allowed band are evaluated - the rest are NaN (so they're never valid)
+
+            The weighted aero balance of a setup is a weighted average of the aero balance at each telemetry point, so
+            it's between the lowest and highest aero balance over the grid cells that the shifted telemetry is in. For
+            each wing angle combination, an aero map (from getAeroMap(), so it's stored in and read from the aero map
+            cache) is calculated on a 1mm grid covering the telemetry shifted by every RH offset, and each grid cell is
+            classified by the range of aero balance at its corners (like marching squares, see getContourSegments()).
+            The RH offsets must be whole numbers of mm apart, so shifting the telemetry moves it by whole cells - for
+            each RH offset, the range over the cells the telemetry is in is the band that the weighted aero balance
+            must be in
+
+            The aero balance between the corners of a cell is bilinearly interpolated, so the range is widened by the
+            maximum interpolation error of the aero balance (see getLookupError()), over a validation subset of up to
+            numValidationPoints telemetry points, each shifted by a different RH offset pair - plus contourBalanceMargin
+            (in %) on each side as a safety margin. The setups whose range doesn't overlap the allowed band are never
+            evaluated with the telemetry, and wing angle combinations with no RH offsets that overlap the band are
+            screened out entirely
+
+            All the wing angle combinations at each RH offset share one AeroBasis, so the setups that are evaluated have
+            identical values to evaluateSetups(). If printScreening is True, the number of wing angle combinations
+            screened out and setups evaluated are printed"""
+        frontRHTelem = np.asarray(frontRHTelem, dtype=float)
+        rearRHTelem = np.asarray(rearRHTelem, dtype=float)
+        velocityWeighting = np.power(np.asarray(groundSpeedTelem, dtype=float), velocityPower)
+        velocityWeightingSum = np.sum(velocityWeighting)
+        contourRHStep = 0.001
+
+        # Convert the RH offsets to a number of grid steps from the lowest RH offset
+        frontRHOffsets = np.asarray(frontRHOffsets, dtype=float)
+        rearRHOffsets = np.asarray(rearRHOffsets, dtype=float)
+        frontRHOffsetSteps = np.rint((frontRHOffsets - np.min(frontRHOffsets)) / contourRHStep).astype(int)
+        rearRHOffsetSteps = np.rint((rearRHOffsets - np.min(rearRHOffsets)) / contourRHStep).astype(int)
+        if (not np.allclose(frontRHOffsetSteps * contourRHStep, frontRHOffsets - np.min(frontRHOffsets), rtol=0, atol=contourRHStep * 1e-6)
+                or not np.allclose(rearRHOffsetSteps * contourRHStep, rearRHOffsets - np.min(rearRHOffsets), rtol=0, atol=contourRHStep * 1e-6)):
+            raise Exception("The RH offsets must be whole numbers of mm apart")
+        numFrontRHOffsetSteps = np.max(frontRHOffsetSteps) + 1
+        numRearRHOffsetSteps = np.max(rearRHOffsetSteps) + 1
+
+        # The grid cells that the telemetry shifted by the lowest RH offsets is in, in the form [[rearRHBin, frontRHBin], ...]
+        frontRHTelemShifted = frontRHTelem + np.min(frontRHOffsets)
+        rearRHTelemShifted = rearRHTelem + np.min(rearRHOffsets)
+        frontRHOrigin = np.floor(np.min(frontRHTelemShifted) / contourRHStep) * contourRHStep
+        rearRHOrigin = np.floor(np.min(rearRHTelemShifted) / contourRHStep) * contourRHStep
+        frontRHBins = np.maximum(np.floor((frontRHTelemShifted - frontRHOrigin) / contourRHStep).astype(int), 0)
+        rearRHBins = np.maximum(np.floor((rearRHTelemShifted - rearRHOrigin) / contourRHStep).astype(int), 0)
+        occupiedCells = np.unique(np.stack([rearRHBins, frontRHBins], axis=1), axis=0)
+
+        # Ride height grid covering the telemetry shifted by every RH offset
+        frontRHMin, frontRHMax = frontRHOrigin, frontRHOrigin + (np.max(frontRHBins) + numFrontRHOffsetSteps) * contourRHStep
+        rearRHMin, rearRHMax = rearRHOrigin, rearRHOrigin + (np.max(rearRHBins) + numRearRHOffsetSteps) * contourRHStep
+        aeroBasis = self.getAeroMapBasis(frontRHMin, frontRHMax, rearRHMin, rearRHMax, contourRHStep)
+
+        # Validation subset of the telemetry, where each point is shifted by a different RH offset pair (cycling through
+        # all of them) so the interpolation error is checked over the whole grid
+        validationIndexes = np.unique(np.linspace(0, len(frontRHTelem) - 1, min(len(frontRHTelem), numValidationPoints)).astype(int))
+        validationOffsetIndexes = np.arange(len(validationIndexes)) % (len(frontRHOffsets) * len(rearRHOffsets))
+        frontRHValidation = frontRHTelem[validationIndexes] + frontRHOffsets[validationOffsetIndexes % len(frontRHOffsets)]
+        rearRHValidation = rearRHTelem[validationIndexes] + rearRHOffsets[validationOffsetIndexes // len(frontRHOffsets)]
+
+        # Whether to evaluate each setup, in the form [wingAnglesIndex][rearRHOffsetIndex][frontRHOffsetIndex]
+        isCandidate = np.zeros((len(wingAnglesArray), len(rearRHOffsets), len(frontRHOffsets)), dtype=bool)
+        for wingAnglesIndex in range(len(wingAnglesArray)):
+            aeroMap = self.getAeroMap(frontRHMin, frontRHMax, rearRHMin, rearRHMax, contourRHStep, 0, aeroBasis=aeroBasis, wingAngles=wingAnglesArray[wingAnglesIndex])
+            aeroBalanceMargin = self.getLookupError(aeroMap, frontRHValidation, rearRHValidation, numValidationPoints, wingAnglesArray[wingAnglesIndex])[5] + contourBalanceMargin
+
+            # Range of aero balance at the corners of each grid cell
+            aeroBalance2D = aeroMap.getMetric("aeroBalance")
+            cornerAeroBalances = [aeroBalance2D[:-1, :-1], aeroBalance2D[:-1, 1:], aeroBalance2D[1:, 1:], aeroBalance2D[1:, :-1]]
+            cellMinAeroBalance2D = np.minimum.reduce(cornerAeroBalances)
+            cellMaxAeroBalance2D = np.maximum.reduce(cornerAeroBalances)
+
+            # Range of aero balance over the occupied cells for every number of grid steps that the telemetry is shifted
+            # by, in the form [rearRHOffsetSteps][frontRHOffsetSteps]
+            minAeroBalance2D = np.full((numRearRHOffsetSteps, numFrontRHOffsetSteps), np.inf)
+            maxAeroBalance2D = np.full((numRearRHOffsetSteps, numFrontRHOffsetSteps), -np.inf)
+            for rearRHBin, frontRHBin in occupiedCells:
+                np.minimum(minAeroBalance2D, cellMinAeroBalance2D[rearRHBin:rearRHBin + numRearRHOffsetSteps, frontRHBin:frontRHBin + numFrontRHOffsetSteps], out=minAeroBalance2D)
+                np.maximum(maxAeroBalance2D, cellMaxAeroBalance2D[rearRHBin:rearRHBin + numRearRHOffsetSteps, frontRHBin:frontRHBin + numFrontRHOffsetSteps], out=maxAeroBalance2D)
+
+            minAeroBalances = minAeroBalance2D[rearRHOffsetSteps][:, frontRHOffsetSteps]
+            maxAeroBalances = maxAeroBalance2D[rearRHOffsetSteps][:, frontRHOffsetSteps]
+            isCandidate[wingAnglesIndex] = ((maxAeroBalances + aeroBalanceMargin >= minAllowedAeroBalance)
+                                            & (minAeroBalances - aeroBalanceMargin <= maxAllowedAeroBalance))
+
+        if printScreening:
+            print("Wing angle combinations screened out:", np.sum(~np.any(isCandidate, axis=(1, 2))), "of", len(wingAnglesArray))
+
+        # Evaluate the candidate setups
+        setupResults = np.full(isCandidate.shape + (len(AeroMap.metricNames),), np.nan)
+        for rearRHOffsetIndex in range(len(rearRHOffsets)):
+            for frontRHOffsetIndex in range(len(frontRHOffsets)):
+                candidateWingAnglesIndexes = np.flatnonzero(isCandidate[:, rearRHOffsetIndex, frontRHOffsetIndex])
+                if len(candidateWingAnglesIndexes) == 0:
+                    continue
+                aeroBasis = AeroBasis(self, frontRHTelem + frontRHOffsets[frontRHOffsetIndex], rearRHTelem + rearRHOffsets[rearRHOffsetIndex])
+                for wingAnglesIndex in candidateWingAnglesIndexes:
+                    setupResults[wingAnglesIndex, rearRHOffsetIndex, frontRHOffsetIndex] = [np.dot(metricArray, velocityWeighting) / velocityWeightingSum for metricArray in aeroBasis.calculateAero(wingAnglesArray[wingAnglesIndex])]
+
+        if printScreening:
+            print("Setups evaluated:", np.sum(isCandidate), "of", isCandidate.size)
+
+        return setupResults
+
+    def evaluateSetupsParallel(self, frontRHOffsets, rearRHOffsets, wingAnglesArray, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, method, histogramRHStep, numWorkers, aeroBalanceBand=None, lookupRHStep=0.001, useThreads=False, contourBalanceMargin=0):
+        """Returns setupResults in the same form (and with identical values) as evaluateSetups(),
+            evaluateSetupsHistogram(), evaluateSetupsBracketed(), evaluateSetupsLookup() or evaluateSetupsContour()
+            (depending on method), but the setups are spread across numWorkers processes (or threads if useThreads is
+            True)
+
+            For the "exact" method each task is one rear RH offset, and for the other methods each task is a chunk of
+            wing angle combinations (so every task uses the same histogram grid or bracketing as the serial calculation)
+
+            With processes, the telemetry is put in shared memory, so it's only stored once rather than copied to every
+            worker - note that on Windows the worker processes re-import the script that was run, so that script must
+            only run the optimisation inside if __name__ == "__main__":
+
+            With threads, every task uses this car and the telemetry directly (nothing is copied or pickled, and the
+            evaluation never changes the car) - most of the time is spent in NumPy, which releases the GIL, so the
+            threads run in parallel"""
+        # Split the setups into tasks
+        tasks = []
+        if method == "exact":
+            for rearRHOffset in rearRHOffsets:
+                tasks.append((method, frontRHOffsets, [rearRHOffset], wingAnglesArray, velocityPower, histogramRHStep, aeroBalanceBand, lookupRHStep, contourBalanceMargin))
+            concatenateAxis = 1
+        else:
+            chunkSize = max(1, -(-len(wingAnglesArray) // (numWorkers * 4)))
+            for i in range(0, len(wingAnglesArray), chunkSize):
+                tasks.append((method, frontRHOffsets, rearRHOffsets, wingAnglesArray[i:i + chunkSize], velocityPower, histogramRHStep, aeroBalanceBand, lookupRHStep, contourBalanceMargin))
+            concatenateAxis = 0
+
+        if useThreads:
+            frontRHTelem = np.asarray(frontRHTelem, dtype=float)
+            rearRHTelem = np.asarray(rearRHTelem, dtype=float)
+            groundSpeedTelem = np.asarray(groundSpeedTelem, dtype=float)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=numWorkers) as executor:
+                # executor.map() returns the results in the same order as the tasks
+                return np.concatenate(list(executor.map(lambda task: self.evaluateSetupsTile(task, frontRHTelem, rearRHTelem, groundSpeedTelem), tasks)), axis=concatenateAxis)
+
+        numTelemPoints = len(groundSpeedTelem)
+        sharedTelem = shared_memory.SharedMemory(create=True, size=max(3 * numTelemPoints * 8, 1))
+        try:
+            telem = np.ndarray((3, numTelemPoints), dtype=np.float64, buffer=sharedTelem.buf)
+            telem[0] = frontRHTelem
+            telem[1] = rearRHTelem
+            telem[2] = groundSpeedTelem
+
+            with concurrent.futures.ProcessPoolExecutor(max_workers=numWorkers, initializer=initSetupWorker, initargs=(self, sharedTelem.name, numTelemPoints)) as executor:
+                # executor.map() returns the results in the same order as the tasks
+                setupResults = np.concatenate(list(executor.map(evaluateSetupsWorker, tasks)), axis=concatenateAxis)
+            del telem
+        finally:
+            sharedTelem.close()
+            sharedTelem.unlink()
+
+        return setupResults
+
+    def evaluateSetupsTile(self, task, frontRHTelem, rearRHTelem, groundSpeedTelem):
+        """Evaluates one tile of setups for evaluateSetupsParallel(), where task is (method, frontRHOffsets,
+            rearRHOffsets, wingAnglesArray, velocityPower, histogramRHStep, aeroBalanceBand, lookupRHStep,
+            contourBalanceMargin) - returns setupResults for the tile"""
+        method, frontRHOffsets, rearRHOffsets, wingAnglesArray, velocityPower, histogramRHStep, aeroBalanceBand, lookupRHStep, contourBalanceMargin = task
+
+        if method == "histogram":
+            return self.evaluateSetupsHistogram(frontRHOffsets, rearRHOffsets, wingAnglesArray, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, histogramRHStep)
+        if method == "bracketed":
+            return self.evaluateSetupsBracketed(frontRHOffsets, rearRHOffsets, wingAnglesArray, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, aeroBalanceBand[0], aeroBalanceBand[1])
+        if method == "lookup":
+            return self.evaluateSetupsLookup(frontRHOffsets, rearRHOffsets, wingAnglesArray, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, lookupRHStep)
+        if method == "contour":
+            return self.evaluateSetupsContour(frontRHOffsets, rearRHOffsets, wingAnglesArray, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, aeroBalanceBand[0], aeroBalanceBand[1], contourBalanceMargin)
+        return self.evaluateSetups(frontRHOffsets, rearRHOffsets, wingAnglesArray, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem)
+
+    def optimiseAeroRHTelem(self, frontRHOffsetMin, frontRHOffsetMax, rearRHOffsetMin, rearRHOffsetMax, wingAnglesArray, aeroBalanceTarget, aeroBalanceTolerance, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, method="exact", histogramRHStep=0.001, numWorkers=None, lookupRHStep=0.001, useThreads=False, wingAnglesChunkSize=1000, contourBalanceMargin=0, printValidSetups=False):
+        """Returns validSetups, maxTotalClASetup, minTotalCdASetup, maxEfficiencySetup, paretoSetups
 
             Where the setups are in the form [frontRHOffset (metres), rearRHOffset (metres), wingAngles], and
             validSetups is an array containing all the valid setups (within the aero balance tolerances)
 
+            paretoSetups contains the valid setups on the Pareto front of max total ClA, min total CdA and min aero
+            balance error (distance from aeroBalanceTarget), sorted by total ClA (highest first) - every valid setup
+            not in it is beaten or matched in all 3 by one that is (see getParetoFront())
+
             RHOffsets in metres - defines how the optimiser is allowed to shift the ride height envelope
 
             Uses the ride height and ground speed telemetry arrays passed in to calculate aero numbers, as described in
             calculateAeroRHTelem()
 
-            Prints out all valid setups"""
+            method can be:
+                - "exact": the aero is calculated for every telemetry data point for every setup (see evaluateSetups())
+                - "histogram": the telemetry is binned into a ride height histogram with a spacing of histogramRHStep,
+                    which is much faster for wide RH offset ranges (see evaluateSetupsHistogram())
+                - "bracketed": same as "exact", but only the setups near the allowed aero balance band are evaluated
+                    (see evaluateSetupsBracketed())
+                - "lookup": the aero numbers are bilinearly interpolated from aero maps with a grid spacing of
+                    lookupRHStep (see evaluateSetupsLookup())
+                - "contour": same as "exact", but only the setups whose range of aero balance over the shifted
+                    telemetry's grid cells (from 1mm aero maps, widened by the interpolation error plus
+                    contourBalanceMargin) overlaps the allowed aero balance band are evaluated, so infeasible wing angle
+                    combinations are screened out cheaply (see evaluateSetupsContour())
+
+            If numWorkers is more than 1, the setups are evaluated in parallel across that many processes, or threads
+            if useThreads is True (see evaluateSetupsParallel()) - the results are identical to evaluating them in this
+            process
+
+            The car's wing angles are never changed, so a car can be shared by optimisations running at the same time
+
+            wingAnglesArray can be any iterable of wing angles (e.g. the generator from generateWingAngles()), which is
+            evaluated wingAnglesChunkSize wing angle combinations at a time, so only the valid setups are kept in memory
+
+            The valid setups and the best setups are found from the arrays of results of each chunk at once (rather than
+            looping over every setup)
+
+            Prints out the best setups and the Pareto front, and every valid setup (as CSV lines) if printValidSetups is
+            True (which also prints how many setups the "bracketed" and "contour" methods evaluate, and the maximum
+            interpolation error of the "lookup" method, when they aren't run in parallel)"""
         minAllowedAeroBalance = aeroBalanceTarget - aeroBalanceTolerance
         maxAllowedAeroBalance = aeroBalanceTarget + aeroBalanceTolerance
 
         RHOffsetStep = 0.001                # RH increments of 1mm
-        RHOffsetMargin = RHOffsetStep / 2   # Floating point maths reasons
+        frontRHOffsets = getRHAxis(frontRHOffsetMin, frontRHOffsetMax, RHOffsetStep).tolist()
+        rearRHOffsets = getRHAxis(rearRHOffsetMin, rearRHOffsetMax, RHOffsetStep).tolist()
 
         # Performances of best setups
         maxTotalClA = -999
@@ -772,80 +2153,121 @@ class Car:
         maxEfficiencySetup = baselineSetup
 
         validSetups = []    # Will contain all valid setups (see above for the form)
-
-        print("Total setup combinations:", len(wingAnglesArray) * (round((frontRHOffsetMax - frontRHOffsetMin) / RHOffsetStep) + 1) * (round((rearRHOffsetMax - rearRHOffsetMin) / RHOffsetStep) + 1))
-        print("Valid setups:")
-        # Iterate through all wing angle combinations
-        for wingAngles in wingAnglesArray:
-            self.setWingAngles(wingAngles)
-
-            # Iterate through all rear ride height offsets
-            rearRHOffset = rearRHOffsetMin
-            while rearRHOffset <= rearRHOffsetMax + RHOffsetMargin:
-                # Iterate through all front ride height offsets
-                frontRHOffset = frontRHOffsetMin
-                while frontRHOffset <= frontRHOffsetMax + RHOffsetMargin:
-                    setup = [frontRHOffset, rearRHOffset, wingAngles]
-                    #print("\tWing angles:", wingAngles, "  \tRH offsets [F, R] (mm):", [round(frontRHOffset * 1000), round(rearRHOffset * 1000)])
-
-                    # Get the weighted average of the aero numbers, for the telemetry passed in - accounting for the RH
-                    # offsets
-                    frontRHTelemAdjusted = [frontRH + frontRHOffset for frontRH in frontRHTelem]
-                    rearRHTelemAdjusted = [rearRH + rearRHOffset for rearRH in rearRHTelem]
-                    frontClAWeightedAverage, rearClAWeightedAverage, totalClAWeightedAverage, totalCdAWeightedAverage, efficiencyWeightedAverage, aeroBalanceWeightedAverage = self.calculateAeroRHTelem(velocityPower, frontRHTelemAdjusted, rearRHTelemAdjusted, groundSpeedTelem)
-
-                    # Check if the aero balance weighted average is within tolerances
-                    if minAllowedAeroBalance <= aeroBalanceWeightedAverage <= maxAllowedAeroBalance:
-                        # If aero balance is within tolerances, print the setup and its numbers
-                        #print("\tWing angles:", wingAngles, "  \tRH offsets [F, R] (mm):", [round(frontRHOffset * 1000), round(rearRHOffset * 1000)], "\t\tClA:", round(totalClAWeightedAverage, 3), "\tCdA:", round(totalCdAWeightedAverage, 3), "\tEfficiency:", round(efficiencyWeightedAverage, 3), "\tAero balance %:", round(aeroBalanceWeightedAverage, 3))
-                        print(str(wingAngles[0]) + "," + str(wingAngles[1]) + "," + str(round(frontRHOffset * 1000)) + "," + str(round(rearRHOffset * 1000)) + "," + str(frontClAWeightedAverage) + "," + str(rearClAWeightedAverage) + "," + str(totalClAWeightedAverage) + "," + str(totalCdAWeightedAverage) + "," + str(efficiencyWeightedAverage) + "," + str(aeroBalanceWeightedAverage))
-
-                        # Add the setup to validSetups
-                        validSetups.append(setup)
-
-                        # Update best performing aero numbers and setups
-                        if totalClAWeightedAverage > maxTotalClA:
-                            maxTotalClA = totalClAWeightedAverage
-                            maxTotalClASetup = setup
-                        if totalCdAWeightedAverage < minTotalCdA:
-                            minTotalCdA = totalCdAWeightedAverage
-                            minTotalCdASetup = setup
-                        if efficiencyWeightedAverage > maxEfficiency:
-                            maxEfficiency = efficiencyWeightedAverage
-                            maxEfficiencySetup = setup
-                    frontRHOffset += RHOffsetStep
-                rearRHOffset += RHOffsetStep
+        validSetupObjectives = []   # [totalClA, totalCdA, aeroBalance] of each chunk's valid setups, in the same order
+
+        # Convert the telemetry to NumPy arrays once, so the RH offsets can be applied without copying lists
+        frontRHTelem = np.asarray(frontRHTelem, dtype=float)
+        rearRHTelem = np.asarray(rearRHTelem, dtype=float)
+        groundSpeedTelem = np.asarray(groundSpeedTelem, dtype=float)
+
+        # The number of wing angle combinations is only known in advance if wingAnglesArray isn't a generator
+        if hasattr(wingAnglesArray, "__len__"):
+            print("Total setup combinations:", len(wingAnglesArray) * len(frontRHOffsets) * len(rearRHOffsets))
+
+        if method not in ["exact", "histogram", "bracketed", "lookup", "contour"]:
+            raise Exception("Unknown optimisation method: " + str(method))
+
+        if printValidSetups:
+            print("Valid setups:")
+        wingAnglesIterator = iter(wingAnglesArray)
+        numWingAngles = 0
+        while True:
+            wingAnglesChunk = list(itertools.islice(wingAnglesIterator, wingAnglesChunkSize))
+            if len(wingAnglesChunk) == 0:
+                break
+            numWingAngles += len(wingAnglesChunk)
+
+            # Get the weighted average of the aero numbers of every setup in the chunk, for the telemetry passed in
+            if numWorkers is not None and numWorkers > 1:
+                setupResults = self.evaluateSetupsParallel(frontRHOffsets, rearRHOffsets, wingAnglesChunk, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, method, histogramRHStep, numWorkers, [minAllowedAeroBalance, maxAllowedAeroBalance], lookupRHStep, useThreads, contourBalanceMargin)
+            elif method == "exact":
+                setupResults = self.evaluateSetups(frontRHOffsets, rearRHOffsets, wingAnglesChunk, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem)
+            elif method == "bracketed":
+                setupResults = self.evaluateSetupsBracketed(frontRHOffsets, rearRHOffsets, wingAnglesChunk, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, minAllowedAeroBalance, maxAllowedAeroBalance, printEvaluations=printValidSetups)
+            elif method == "lookup":
+                setupResults = self.evaluateSetupsLookup(frontRHOffsets, rearRHOffsets, wingAnglesChunk, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, lookupRHStep, printLookupError=printValidSetups)
+            elif method == "contour":
+                setupResults = self.evaluateSetupsContour(frontRHOffsets, rearRHOffsets, wingAnglesChunk, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, minAllowedAeroBalance, maxAllowedAeroBalance, contourBalanceMargin, printScreening=printValidSetups)
+            else:
+                setupResults = self.evaluateSetupsHistogram(frontRHOffsets, rearRHOffsets, wingAnglesChunk, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, histogramRHStep)
+
+            # The valid setups in the same order as looping through all wing angle combinations, rear ride height
+            # offsets and front ride height offsets
+            isValidSetup = (setupResults[..., 5] >= minAllowedAeroBalance) & (setupResults[..., 5] <= maxAllowedAeroBalance)
+            if not np.any(isValidSetup):
+                continue
+            wingAnglesIndexes, rearRHOffsetIndexes, frontRHOffsetIndexes = np.nonzero(isValidSetup)
+            validResults = setupResults[isValidSetup]
+            chunkValidSetups = [[frontRHOffsets[frontRHOffsetIndex], rearRHOffsets[rearRHOffsetIndex], wingAnglesChunk[wingAnglesIndex]]
+                                for wingAnglesIndex, rearRHOffsetIndex, frontRHOffsetIndex in zip(wingAnglesIndexes.tolist(), rearRHOffsetIndexes.tolist(), frontRHOffsetIndexes.tolist())]
+            validSetups.extend(chunkValidSetups)
+            validSetupObjectives.append(validResults[:, [2, 3, 5]])
+
+            if printValidSetups:
+                for setup, setupResult in zip(chunkValidSetups, validResults.tolist()):
+                    frontClAWeightedAverage, rearClAWeightedAverage, totalClAWeightedAverage, totalCdAWeightedAverage, efficiencyWeightedAverage, aeroBalanceWeightedAverage = setupResult
+                    print(str(setup[2][0]) + "," + str(setup[2][1]) + "," + str(round(setup[0] * 1000)) + "," + str(round(setup[1] * 1000)) + "," + str(frontClAWeightedAverage) + "," + str(rearClAWeightedAverage) + "," + str(totalClAWeightedAverage) + "," + str(totalCdAWeightedAverage) + "," + str(efficiencyWeightedAverage) + "," + str(aeroBalanceWeightedAverage))
+
+            # Update best performing aero numbers and setups (the first of any equal setups is kept, as argmax and argmin
+            # return the first)
+            maxTotalClAIndex = int(np.argmax(validResults[:, 2]))
+            if validResults[maxTotalClAIndex, 2] > maxTotalClA:
+                maxTotalClA = validResults[maxTotalClAIndex, 2]
+                maxTotalClASetup = chunkValidSetups[maxTotalClAIndex]
+            minTotalCdAIndex = int(np.argmin(validResults[:, 3]))
+            if validResults[minTotalCdAIndex, 3] < minTotalCdA:
+                minTotalCdA = validResults[minTotalCdAIndex, 3]
+                minTotalCdASetup = chunkValidSetups[minTotalCdAIndex]
+            maxEfficiencyIndex = int(np.argmax(validResults[:, 4]))
+            if validResults[maxEfficiencyIndex, 4] > maxEfficiency:
+                maxEfficiency = validResults[maxEfficiencyIndex, 4]
+                maxEfficiencySetup = chunkValidSetups[maxEfficiencyIndex]
+
+        if not hasattr(wingAnglesArray, "__len__"):
+            print("Total setup combinations:", numWingAngles * len(frontRHOffsets) * len(rearRHOffsets))
 
         # Print stats for the max total ClA setup
-        self.setWingAngles(maxTotalClASetup[2])
-        frontRHTelemAdjusted = [frontRH + maxTotalClASetup[0] for frontRH in frontRHTelem]
-        rearRHTelemAdjusted = [rearRH + maxTotalClASetup[1] for rearRH in rearRHTelem]
-        frontClAWeightedAverage, rearClAWeightedAverage, totalClAWeightedAverage, totalCdAWeightedAverage, efficiencyWeightedAverage, aeroBalanceWeightedAverage = self.calculateAeroRHTelem(velocityPower, frontRHTelemAdjusted, rearRHTelemAdjusted, groundSpeedTelem)
+        frontRHTelemAdjusted = frontRHTelem + maxTotalClASetup[0]
+        rearRHTelemAdjusted = rearRHTelem + maxTotalClASetup[1]
+        frontClAWeightedAverage, rearClAWeightedAverage, totalClAWeightedAverage, totalCdAWeightedAverage, efficiencyWeightedAverage, aeroBalanceWeightedAverage = self.calculateAeroRHTelem(velocityPower, frontRHTelemAdjusted, rearRHTelemAdjusted, groundSpeedTelem, wingAngles=maxTotalClASetup[2])
         print("\nMax total ClA:", "\n\tWing angles:", maxTotalClASetup[2], "\n\tRH offsets [F, R] (mm):",
               [round(maxTotalClASetup[0] * 1000), round(maxTotalClASetup[1] * 1000)], "\n\tClA:",
               round(totalClAWeightedAverage, 3), "\n\tCdA:", round(totalCdAWeightedAverage, 3), "\n\tEfficiency:",
               round(efficiencyWeightedAverage, 3), "\n\tAero balance %:", round(aeroBalanceWeightedAverage, 3))
 
         # Print stats for the min total CdA setup
-        self.setWingAngles(minTotalCdASetup[2])
-        frontRHTelemAdjusted = [frontRH + minTotalCdASetup[0] for frontRH in frontRHTelem]
-        rearRHTelemAdjusted = [rearRH + minTotalCdASetup[1] for rearRH in rearRHTelem]
+        frontRHTelemAdjusted = frontRHTelem + minTotalCdASetup[0]
+        rearRHTelemAdjusted = rearRHTelem + minTotalCdASetup[1]
         frontClAWeightedAverage, rearClAWeightedAverage, totalClAWeightedAverage, totalCdAWeightedAverage, efficiencyWeightedAverage, aeroBalanceWeightedAverage = self.calculateAeroRHTelem(
-            velocityPower, frontRHTelemAdjusted, rearRHTelemAdjusted, groundSpeedTelem)
+            velocityPower, frontRHTelemAdjusted, rearRHTelemAdjusted, groundSpeedTelem, wingAngles=minTotalCdASetup[2])
         print("\nMin total CdA:", "\n\tWing angles:", minTotalCdASetup[2], "\n\tRH offsets [F, R] (mm):",
               [round(minTotalCdASetup[0] * 1000), round(minTotalCdASetup[1] * 1000)], "\n\tClA:",
               round(totalClAWeightedAverage, 3), "\n\tCdA:", round(totalCdAWeightedAverage, 3), "\n\tEfficiency:",
               round(efficiencyWeightedAverage, 3), "\n\tAero balance %:", round(aeroBalanceWeightedAverage, 3))
 
         # Print stats for the max efficiency setup
-        self.setWingAngles(maxEfficiencySetup[2])
-        frontRHTelemAdjusted = [frontRH + maxEfficiencySetup[0] for frontRH in frontRHTelem]
-        rearRHTelemAdjusted = [rearRH + maxEfficiencySetup[1] for rearRH in rearRHTelem]
+        frontRHTelemAdjusted = frontRHTelem + maxEfficiencySetup[0]
+        rearRHTelemAdjusted = rearRHTelem + maxEfficiencySetup[1]
         frontClAWeightedAverage, rearClAWeightedAverage, totalClAWeightedAverage, totalCdAWeightedAverage, efficiencyWeightedAverage, aeroBalanceWeightedAverage = self.calculateAeroRHTelem(
-            velocityPower, frontRHTelemAdjusted, rearRHTelemAdjusted, groundSpeedTelem)
+            velocityPower, frontRHTelemAdjusted, rearRHTelemAdjusted, groundSpeedTelem, wingAngles=maxEfficiencySetup[2])
         print("\nMax efficiency:", "\n\tWing angles:", maxEfficiencySetup[2], "\n\tRH offsets [F, R] (mm):",
               [round(maxEfficiencySetup[0] * 1000), round(maxEfficiencySetup[1] * 1000)], "\n\tClA:",
               round(totalClAWeightedAverage, 3), "\n\tCdA:", round(totalCdAWeightedAverage, 3), "\n\tEfficiency:",
               round(efficiencyWeightedAverage, 3), "\n\tAero balance %:", round(aeroBalanceWeightedAverage, 3))
 
-        return validSetups, maxTotalClASetup, minTotalCdASetup, maxEfficiencySetup
+        # Find the Pareto front of the valid setups (ClA is maximised, so it's negated)
+        paretoSetups = []
+        if len(validSetups) > 0:
+            validSetupObjectives = np.concatenate(validSetupObjectives)
+            paretoIndexes = getParetoFront(np.stack([-validSetupObjectives[:, 0], validSetupObjectives[:, 1],
+                                                     np.abs(validSetupObjectives[:, 2] - aeroBalanceTarget)], axis=1))
+            paretoIndexes = paretoIndexes[np.argsort(-validSetupObjectives[paretoIndexes, 0], kind="stable")]
+            paretoSetups = [validSetups[paretoIndex] for paretoIndex in paretoIndexes.tolist()]
+
+            print("\nPareto front (" + str(len(paretoSetups)) + " of " + str(len(validSetups)) + " valid setups):")
+            for paretoIndex in paretoIndexes.tolist():
+                setup = validSetups[paretoIndex]
+                totalClAWeightedAverage, totalCdAWeightedAverage, aeroBalanceWeightedAverage = validSetupObjectives[paretoIndex].tolist()
+                print("\tWing angles:", setup[2], "  \tRH offsets [F, R] (mm):", [round(setup[0] * 1000), round(setup[1] * 1000)], "\t\tClA:", round(totalClAWeightedAverage, 3), "\tCdA:", round(totalCdAWeightedAverage, 3), "\tAero balance %:", round(aeroBalanceWeightedAverage, 3))
+
+        return validSetups, maxTotalClASetup, minTotalCdASetup, maxEfficiencySetup, paretoSetups
@@ -1,5 +1,7 @@
+from aeroMapCache import AeroMapCache
 from car import Car, getRHEnvelope2D
 import processingMoTeCData
+import time
 
 """
 GT3 Cars:
@@ -9,7 +11,11 @@ GT3 Cars:
 carName = "ks_porsche_911_gt1"
 carsDirectory = "C:\\Program Files (x86)\\Steam\\steamapps\\common\\assettocorsa\\content\\cars"
 
-car = Car(carsDirectory, carName)
+aeroMapCacheDirectory = "aeroMapCache"  # Set to None to disable caching aero maps
+plotAeroMaps = True     # Set to False for a compute-only run (skips plotting, so Matplotlib is never imported)
+
+aeroMapCache = AeroMapCache(aeroMapCacheDirectory) if aeroMapCacheDirectory is not None else None
+car = Car(carsDirectory, carName, aeroMapCache)
 print(car)
 print()
 
@@ -21,12 +27,7 @@ rearRHMax = 0.001 * 100
 RHStep = 0.001 * 1
 colliderMargin = 0
 
-RHArray, frontClAArray2D, rearClAArray2D, totalClAArray2D, totalCdAArray2D, efficiencyArray2D, aeroBalanceArray2D, isValid2D = car.getAeroMap(frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, colliderMargin)
-
-# Generate all combinations of wing angles
-"""wingAnglesArray = []
-for RW in range(0, 1 + 8):        # RW from 0 to 8
-    wingAnglesArray.append([0, 2, RW, 11])"""
+aeroMap = car.getAeroMap(frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, colliderMargin)
 
 # If you don't want to wait forever for the aero to be optimised for ride heights, change these to arrays with only a
 # few elements
@@ -38,8 +39,9 @@ wingAnglesArray = [[0, 2, 6, 1]]
 RHEnvelope2D = getRHEnvelope2D(frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, frontRHTelem, rearRHTelem)
 #RHEnvelope2D = None
 
-car.plotAeroMaps("plots", frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, colliderMargin, wingAnglesArray, RHEnvelope2D)
-exit()
+if plotAeroMaps:
+    car.plotAeroMaps("plots", frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, colliderMargin, wingAnglesArray, RHEnvelope2D)
+    exit()
 
 optimisationStart = time.time()
 
@@ -48,6 +50,8 @@ aeroBalanceTolerance = 0.5
 
 velocityPower = 1
 
+optimisationMethod = "exact"    # "exact", "histogram" (bins the telemetry, much faster for wide RH offset ranges), "bracketed", "lookup" (interpolates aero maps) or "contour" (screens setups by the range of aero balance over the telemetry)
+
 frontRHOffsetMin = 0.001 * 0    # -1, From baseline (but telem is min RH all round)
 frontRHOffsetMax = 0.001 * 2    # 7
 rearRHOffsetMin = 0.001 * 0    # -4
@@ -58,10 +62,38 @@ frontRHOffsetMax = 0.001 * 0
 rearRHOffsetMin = 0.001 * 0
 rearRHOffsetMax = 0.001 * 0"""
 
-validSetups, maxTotalClASetup, minTotalCdASetup, maxEfficiencySetup = car.optimiseAeroRHTelem(frontRHOffsetMin, frontRHOffsetMax, rearRHOffsetMin, rearRHOffsetMax, wingAnglesArray, aeroBalanceTarget, aeroBalanceTolerance, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem)
+# Set to True to optimise every combination of wing angles allowed by the car's setup.ini rather than wingAnglesArray
+# (they're generated one at a time, skipping the ones that can't reach the aero balance target)
+optimiseAllWingAngles = False
+if optimiseAllWingAngles:
+    wingAnglesArray = car.generateWingAngles(aeroBalanceTarget, aeroBalanceTolerance, frontRHTelem, rearRHTelem, frontRHOffsetMin, frontRHOffsetMax, rearRHOffsetMin, rearRHOffsetMax)
+
+validSetups, maxTotalClASetup, minTotalCdASetup, maxEfficiencySetup, paretoSetups = car.optimiseAeroRHTelem(frontRHOffsetMin, frontRHOffsetMax, rearRHOffsetMin, rearRHOffsetMax, wingAnglesArray, aeroBalanceTarget, aeroBalanceTolerance, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, optimisationMethod)
 
 print("\nOptimisation time (s):", round(time.time() - optimisationStart, 3))
 
+# Set to True to refine the RH offsets of the valid wing angle combinations continuously (rather than in 1mm steps) with
+# a smooth surrogate of the aero maps - needs SciPy
+refineWithSurrogate = False
+if refineWithSurrogate:
+    from aeroSurrogate import optimiseSurrogate
+    surrogateWingAnglesArray = []
+    for setup in validSetups:
+        if setup[2] not in surrogateWingAnglesArray:
+            surrogateWingAnglesArray.append(setup[2])
+    print()
+    bestSurrogateSetup, surrogateSetups = optimiseSurrogate(car, frontRHOffsetMin, frontRHOffsetMax, rearRHOffsetMin, rearRHOffsetMax, surrogateWingAnglesArray, aeroBalanceTarget, aeroBalanceTolerance, velocityPower, frontRHTelem, rearRHTelem, groundSpeedTelem, "totalClA")
+    print("Best surrogate setup:", bestSurrogateSetup[:3] if bestSurrogateSetup is not None else None)
+
+# Set to more than 0 to print 95% confidence intervals (from a block bootstrap of the telemetry) of the aero numbers of
+# the max total ClA setup, to see whether small differences between setups are real or just noise in the telemetry
+bootstrapNumResamples = 0
+if bootstrapNumResamples > 0:
+    bootstrapResults = car.calculateAeroRHTelemBootstrap(velocityPower, [frontRH + maxTotalClASetup[0] for frontRH in frontRHTelem], [rearRH + maxTotalClASetup[1] for rearRH in rearRHTelem], groundSpeedTelem, bootstrapNumResamples, wingAngles=maxTotalClASetup[2])
+    print("\nMax total ClA 95% confidence intervals:")
+    for metricName, [weightedAverage, lower, upper] in zip(["Front ClA", "Rear ClA", "ClA", "CdA", "Efficiency", "Aero balance %"], bootstrapResults.tolist()):
+        print("\t" + metricName + ":", round(weightedAverage, 4), "\t[" + str(round(lower, 4)) + ", " + str(round(upper, 4)) + "]")
+
 wingAnglesArray = []
 RHEnvelope2D = []
 fileNames = []
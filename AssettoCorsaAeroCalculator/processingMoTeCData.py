@@ -1,29 +1,11 @@
 import math
+from telemData import smooth
 
 directory = "C:\\Users\\Willow\\Downloads"
 fileName = "911 gt1 silvo.csv"  # Select the range in MoTeC, then export visible data as CSV
                                          # (don't include maths channels)
 
 
-def smooth(telemArray, smoothingPoints):
-    """Returns an array containing the moving average (of smoothingPoints * 2 + 1 points) of telemArray, where the first
-        smoothingPoints elements are simply the first moving average data point repeated, and similar for the last
-        smoothingPoints elements"""
-    # Generate array of the moving average of telemArray
-    smoothedTelemArray = []
-    for index in range(smoothingPoints, len(telemArray) - smoothingPoints):
-        movingSum = telemArray[index]
-        for i in range(smoothingPoints):
-            movingSum += telemArray[index - i - 1] + telemArray[index + i + 1]
-        smoothedTelemArray.append(movingSum / (smoothingPoints * 2 + 1))
-    # Repeat the first moving average data point and last moving average data point until smoothedTelemArray is the same
-    # length as the original telem array
-    for i in range(smoothingPoints):
-        smoothedTelemArray.insert(0, smoothedTelemArray[0])
-        smoothedTelemArray.insert(-1, smoothedTelemArray[-1])
-    return smoothedTelemArray
-
-
 groundSpeedTelem = []  # in km/h
 frontRHTelem = []  # in metres
 rearRHTelem = []  # in metres
@@ -0,0 +1,86 @@
+"""
+This python file (telemData.py) is for reading and processing telemetry exported from MoTeC, shared by the scripts that
+use telemetry (aeroMapRHEnvelope.py and batchRunner.py)
+"""
+import math
+
+
+def smooth(telemArray, smoothingPoints):
+    """Returns an array containing the moving average (of smoothingPoints * 2 + 1 points) of telemArray, where the first
+        smoothingPoints elements are simply the first moving average data point repeated, and similar for the last
+        smoothingPoints elements"""
+    # Generate array of the moving average of telemArray
+    smoothedTelemArray = []
+    for index in range(smoothingPoints, len(telemArray) - smoothingPoints):
+        movingSum = telemArray[index]
+        for i in range(smoothingPoints):
+            movingSum += telemArray[index - i - 1] + telemArray[index + i + 1]
+        smoothedTelemArray.append(movingSum / (smoothingPoints * 2 + 1))
+    # Repeat the first moving average data point and last moving average data point until smoothedTelemArray is the same
+    # length as the original telem array
+    for i in range(smoothingPoints):
+        smoothedTelemArray.insert(0, smoothedTelemArray[0])
+        smoothedTelemArray.insert(-1, smoothedTelemArray[-1])
+    return smoothedTelemArray
+
+
+def readMoTeCTelem(telemFilePath):
+    """Returns groundSpeedTelem, frontRHTelem, rearRHTelem, longGTelem, combinedGTelem, combinedG2WDTelem read from a
+        MoTeC CSV export (select the range in MoTeC, then export visible data as CSV, without maths channels)
+
+        Ground speed is in km/h, ride heights in metres and G in G (combined G 2WD multiplies longitudinal G by 2 if
+        it's positive)"""
+    groundSpeedTelem = []
+    frontRHTelem = []
+    rearRHTelem = []
+    longGTelem = []
+    combinedGTelem = []
+    combinedG2WDTelem = []
+
+    # Read raw telemetry data (see processingMoTeCData.py for the channel indexes)
+    dataLineStart = 18
+    with open(telemFilePath, "r") as csvFile:
+        lineCounter = 1
+        for line in csvFile:
+            if lineCounter >= dataLineStart:
+                data = [float(i) for i in line.replace("\n", "").replace("\"", "").split(",")]
+                groundSpeedTelem.append(data[63])
+                frontRHTelem.append((data[90] + data[91]) / 2 / 1000)
+                rearRHTelem.append((data[92] + data[93]) / 2 / 1000)
+                longGTelem.append(data[23])
+                combinedGTelem.append(math.sqrt(pow(data[22], 2) + pow(data[23], 2)))
+                if data[23] > 0:
+                    combinedG2WDTelem.append(math.sqrt(pow(data[22], 2) + pow(data[23] * 2, 2)))
+                else:
+                    combinedG2WDTelem.append(math.sqrt(pow(data[22], 2) + pow(data[23], 2)))
+            lineCounter += 1
+
+    return groundSpeedTelem, frontRHTelem, rearRHTelem, longGTelem, combinedGTelem, combinedG2WDTelem
+
+
+def processTelem(rawTelem, smoothingPoints, telemDataFiltering, is2WD):
+    """Returns groundSpeedTelem, frontRHTelem, rearRHTelem after smoothing the ride heights and G (with
+        smoothingPoints) and filtering the telemetry, where rawTelem is returned by readMoTeCTelem()
+
+        telemDataFiltering can be "all", or "cornering" (cornering but not braking or accelerating)"""
+    groundSpeedTelem, frontRHTelem, rearRHTelem, longGTelem, combinedGTelem, combinedG2WDTelem = rawTelem
+    if telemDataFiltering not in ["all", "cornering"]:
+        raise Exception("Unknown telemetry filtering: " + str(telemDataFiltering))
+
+    smoothedFrontRHTelem = smooth(frontRHTelem, smoothingPoints)
+    smoothedRearRHTelem = smooth(rearRHTelem, smoothingPoints)
+    smoothedLongGTelem = smooth(longGTelem, smoothingPoints)
+    smoothedCombinedGTelem = smooth(combinedG2WDTelem if is2WD else combinedGTelem, smoothingPoints)
+
+    processedGroundSpeedTelem = []
+    processedFrontRHTelem = []
+    processedRearRHTelem = []
+    for i in range(len(groundSpeedTelem)):
+        if telemDataFiltering == "cornering":
+            if not (smoothedCombinedGTelem[i] > 1 and abs(smoothedLongGTelem[i]) < 0.25 * smoothedCombinedGTelem[i]):
+                continue
+        processedGroundSpeedTelem.append(groundSpeedTelem[i])
+        processedFrontRHTelem.append(smoothedFrontRHTelem[i])
+        processedRearRHTelem.append(smoothedRearRHTelem[i])
+
+    return processedGroundSpeedTelem, processedFrontRHTelem, processedRearRHTelem
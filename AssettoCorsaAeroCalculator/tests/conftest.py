@@ -0,0 +1,71 @@
+"""
+Shared fixtures for the tests - a small synthetic car (written the same way as a car in Assetto Corsa's cars
+folder) and synthetic telemetry, so the tests don't need Assetto Corsa to be installed
+"""
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from car import Car
+
+carName = "testcar"
+
+carFiles = {
+    "\\car.ini": "[BASIC]\nGRAPHICS_OFFSET=0,-0.6,0\n[RIDE]\nPICKUP_FRONT_HEIGHT=0.140 ; x\nPICKUP_REAR_HEIGHT=0.170\n",
+    "\\suspensions.ini": "[BASIC]\nWHEELBASE=2.50\nCG_LOCATION=0.45\n",
+    "\\colliders.ini": "[COLLIDER_0]\nCENTRE=0,-0.02,0.3\nSIZE=1.8,0.24,4.1\nGROUND_ENABLE=1\n"
+                       "[COLLIDER_1]\nCENTRE=0,0.3,0\nSIZE=1,0.3,1\nGROUND_ENABLE=0\n",
+    "front_gh.lut": "0.0|0.6\n0.02|1.05\n0.04|1.10\n0.06|1.0\n0.10|0.85\n0.2|0.8\n",
+    "rear_gh.lut": "0.0|0.7\n0.03|1.0\n0.06|1.08\n0.09|1.0\n0.2|0.9\n",
+    "aoa_cl.lut": "-10|-0.4\n0|0.2\n5|0.9\n10|1.4 ; comment\n15|1.7\n20|1.6\n",
+    "aoa_cd.lut": "-10|0.08\n0|0.04\n5|0.07\n10|0.12\n15|0.2\n20|0.3\n",
+    "body_aoa.lut": "-3|0.7\n0|1.0\n3|1.25\n",
+    "\\aero.ini": "[HEADER]\nVERSION=3\n"
+                 "[WING_0]\nNAME=BODY_FRONT\nCHORD=1.0\nSPAN=1.0\nPOSITION=0,-0.2,1.2\nLUT_AOA_CL=body_aoa.lut\n"
+                 "LUT_GH_CL=front_gh.lut\nCL_GAIN=1.6\nLUT_AOA_CD=\nLUT_GH_CD=\nCD_GAIN=0.25\nANGLE=0\n"
+                 "[WING_1]\nNAME=BODY_REAR\nCHORD=1.0\nSPAN=1.0\nPOSITION=0,-0.18,-1.3\nLUT_AOA_CL=body_aoa.lut\n"
+                 "LUT_GH_CL=rear_gh.lut\nCL_GAIN=1.1\nLUT_AOA_CD=\nLUT_GH_CD=\nCD_GAIN=0.3\nANGLE=0\n"
+                 "[WING_2]\nNAME=FRONT_WING\nCHORD=0.4\nSPAN=1.6\nPOSITION=0,-0.25,2.1\nLUT_AOA_CL=aoa_cl.lut\n"
+                 "LUT_GH_CL=front_gh.lut\nCL_GAIN=1.0\nLUT_AOA_CD=aoa_cd.lut\nLUT_GH_CD=front_gh.lut\nCD_GAIN=1.0\nANGLE=3\n"
+                 "[WING_3]\nNAME=REAR_WING\nCHORD=0.35\nSPAN=1.7\nPOSITION=0,0.55,-2.2\nLUT_AOA_CL=aoa_cl.lut\n"
+                 "LUT_GH_CL=\nCL_GAIN=1.0\nLUT_AOA_CD=aoa_cd.lut\nLUT_GH_CD=\nCD_GAIN=1.0\nANGLE=6\n",
+    "\\setup.ini": "[WING_2]\nNAME=Front Wing\nMIN=0\nMAX=6\nSTEP=1\n[WING_3]\nNAME=Rear Wing\nMIN=2\nMAX=12\nSTEP=2\n",
+}
+
+
+@pytest.fixture(scope="session")
+def carsDirectory(tmp_path_factory):
+    """Returns the cars directory containing the synthetic car (the car data paths are built the same way as Car does,
+        so this works with both Windows and Linux path separators)"""
+    carsDirectory = str(tmp_path_factory.mktemp("cars"))
+    os.makedirs(os.path.join(carsDirectory, carName, "data"), exist_ok=True)
+    carDataDirectory = carsDirectory + "\\" + carName + "\\data\\"
+    for fileName, fileText in carFiles.items():
+        with open(carDataDirectory + fileName, "w") as carFile:
+            carFile.write(fileText)
+    return carsDirectory
+
+
+@pytest.fixture(scope="session")
+def car(carsDirectory):
+    return Car(carsDirectory, carName)
+
+
+def getTelem(numTelemPoints, seed=1):
+    """Returns frontRHTelem, rearRHTelem, groundSpeedTelem of a synthetic lap (ride heights in metres dropping with
+        speed, plus bumps and noise)"""
+    rng = np.random.default_rng(seed)
+    timeSteps = np.arange(numTelemPoints)
+    groundSpeedTelem = np.abs(120 + 80 * np.sin(timeSteps / 150) + rng.normal(0, 3, numTelemPoints))
+    load = (groundSpeedTelem / 200) ** 2
+    frontRHTelem = 0.045 - 0.02 * load + 0.003 * np.sin(timeSteps / 13) + rng.normal(0, 0.001, numTelemPoints)
+    rearRHTelem = 0.070 - 0.015 * load + 0.004 * np.sin(timeSteps / 17) + rng.normal(0, 0.001, numTelemPoints)
+    return frontRHTelem, rearRHTelem, groundSpeedTelem
+
+
+@pytest.fixture(scope="session")
+def telem():
+    return getTelem(1500)
@@ -0,0 +1,55 @@
+import os
+import numpy as np
+
+from aeroMapCache import AeroMapCache
+from car import Car
+
+
+def test_cached_aero_map_matches_calculated(carsDirectory, tmp_path):
+    aeroMapCache = AeroMapCache(str(tmp_path / "cache"))
+    cachedCar = Car(carsDirectory, "testcar", aeroMapCache)
+    car = Car(carsDirectory, "testcar")
+
+    calculatedAeroMap = car.getAeroMap(0, 0.04, 0.02, 0.08, 0.002, 0.005)
+    firstAeroMap = cachedCar.getAeroMap(0, 0.04, 0.02, 0.08, 0.002, 0.005)
+    assert len(os.listdir(aeroMapCache.cacheDirectory)) == 1
+
+    # A cache hit gives the same aero map
+    secondAeroMap = cachedCar.getAeroMap(0, 0.04, 0.02, 0.08, 0.002, 0.005)
+    assert secondAeroMap.numEvaluations == 0
+    assert len(os.listdir(aeroMapCache.cacheDirectory)) == 1
+    for aeroMap in [firstAeroMap, secondAeroMap]:
+        assert np.array_equal(aeroMap.frontRHArray, calculatedAeroMap.frontRHArray)
+        assert np.array_equal(aeroMap.rearRHArray, calculatedAeroMap.rearRHArray)
+        assert np.array_equal(aeroMap.metricArrays, calculatedAeroMap.metricArrays)
+        assert np.array_equal(aeroMap.isValid2D, calculatedAeroMap.isValid2D)
+    # The collider clearance is cached rather than the validity, so a different collider margin is still a cache hit
+    otherMarginAeroMap = cachedCar.getAeroMap(0, 0.04, 0.02, 0.08, 0.002, 0.02)
+    assert np.array_equal(otherMarginAeroMap.isValid2D, car.getAeroMap(0, 0.04, 0.02, 0.08, 0.002, 0.02).isValid2D)
+    assert len(os.listdir(aeroMapCache.cacheDirectory)) == 1
+
+    # Different wing angles or grids are stored separately
+    cachedCar.getAeroMap(0, 0.04, 0.02, 0.08, 0.002, 0.005, wingAngles=[None, None, 0, 12])
+    cachedCar.getAeroMap(0, 0.04, 0.02, 0.08, 0.001, 0.005)
+    assert len(os.listdir(aeroMapCache.cacheDirectory)) == 3
+
+
+def test_least_recently_used_evicted(tmp_path):
+    aeroMapCache = AeroMapCache(str(tmp_path / "cache"))
+    RHArray = np.linspace(0, 0.1, 50)
+    rng = np.random.default_rng(0)
+    keys = []
+    for index in range(3):
+        keys.append(aeroMapCache.getKey("carDataHash", [0, index], 0, 0.1, 0, 0.1, 0.002, np.float64))
+        aeroMapCache.save(keys[-1], RHArray, RHArray, rng.normal(size=(6, 50, 50)), rng.normal(size=(50, 50)))
+        os.utime(aeroMapCache.getFilePath(keys[-1]), (index, index))
+    fileSize = os.path.getsize(aeroMapCache.getFilePath(keys[0]))
+
+    # Loading the oldest one makes it the most recently used, so the second one is evicted
+    assert aeroMapCache.load(keys[0]) is not None
+    aeroMapCache.maxCacheSize = fileSize * 2.5
+    aeroMapCache.evict()
+    assert aeroMapCache.load(keys[1]) is None
+    assert aeroMapCache.load(keys[0]) is not None
+    assert aeroMapCache.load(keys[2]) is not None
+    assert aeroMapCache.load(aeroMapCache.getKey("carDataHash", [0, 3], 0, 0.1, 0, 0.1, 0.002, np.float64)) is None
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy")
+
+from aeroSurrogate import AeroSurrogate, getSurrogateAeroMap, optimiseRHOffsetsSurrogate
+from car import getRHAxis
+
+wingAngles = [None, None, 3.0, 8.0]
+RHOffsetMin = -0.004
+RHOffsetMax = 0.004
+
+
+def test_gradients_match_finite_differences(car, telem):
+    frontRHTelem, rearRHTelem, groundSpeedTelem = telem
+    surrogate = AeroSurrogate(getSurrogateAeroMap(car, wingAngles, RHOffsetMin, RHOffsetMax, RHOffsetMin, RHOffsetMax, frontRHTelem, rearRHTelem, 0.001))
+    RHOffsets = np.array([0.0013, -0.0021])
+    weightedAverages, gradients = surrogate.getWeightedAverages(RHOffsets, frontRHTelem, rearRHTelem, groundSpeedTelem)
+
+    step = 1e-7
+    for offsetIndex in range(2):
+        offsetStep = np.zeros(2)
+        offsetStep[offsetIndex] = step
+        finiteDifferences = (surrogate.getWeightedAverages(RHOffsets + offsetStep, frontRHTelem, rearRHTelem, groundSpeedTelem)[0]
+                             - surrogate.getWeightedAverages(RHOffsets - offsetStep, frontRHTelem, rearRHTelem, groundSpeedTelem)[0]) / (2 * step)
+        assert np.allclose(finiteDifferences, gradients[:, offsetIndex], rtol=1e-5, atol=1e-6)
+
+    exactResults = car.calculateAeroRHTelem(1, frontRHTelem + RHOffsets[0], rearRHTelem + RHOffsets[1], groundSpeedTelem, wingAngles=wingAngles)
+    assert np.allclose(weightedAverages, exactResults, rtol=1e-4)
+
+
+@pytest.mark.parametrize("aeroBalanceOffset", [-0.4, 0, 0.4])
+def test_at_least_as_good_as_grid(car, telem, aeroBalanceOffset):
+    frontRHTelem, rearRHTelem, groundSpeedTelem = telem
+    aeroBalanceTarget = car.calculateAeroRHTelem(1, frontRHTelem, rearRHTelem, groundSpeedTelem, wingAngles=wingAngles)[5] + aeroBalanceOffset
+    aeroBalanceTolerance = 0.3
+
+    RHOffsets = getRHAxis(RHOffsetMin, RHOffsetMax, 0.001).tolist()
+    setupResults = car.evaluateSetups(RHOffsets, RHOffsets, [wingAngles], 1, frontRHTelem, rearRHTelem, groundSpeedTelem)[0]
+    isValidSetup = np.abs(setupResults[..., 5] - aeroBalanceTarget) <= aeroBalanceTolerance
+    assert np.any(isValidSetup)
+    gridMaxTotalClA = np.max(setupResults[..., 2][isValidSetup])
+
+    setup = optimiseRHOffsetsSurrogate(car, wingAngles, RHOffsetMin, RHOffsetMax, RHOffsetMin, RHOffsetMax, aeroBalanceTarget, aeroBalanceTolerance, 1, frontRHTelem, rearRHTelem, groundSpeedTelem)
+    assert setup is not None
+    frontRHOffset, rearRHOffset, setupWingAngles, exactResults, surrogateResults = setup
+    assert RHOffsetMin <= frontRHOffset <= RHOffsetMax and RHOffsetMin <= rearRHOffset <= RHOffsetMax
+    assert np.allclose(exactResults, car.calculateAeroRHTelem(1, frontRHTelem + frontRHOffset, rearRHTelem + rearRHOffset, groundSpeedTelem, wingAngles=wingAngles))
+    assert abs(exactResults[5] - aeroBalanceTarget) <= aeroBalanceTolerance
+    assert exactResults[2] >= gridMaxTotalClA - 1e-12
+
+
+@pytest.mark.parametrize("combinationWingAngles, aeroBalanceTarget", [[[None, None, 1.0, 12.0], 24.1], [[None, None, 0.0, 10.0], 24.003]])
+def test_active_balance_constraint(car, telem, combinationWingAngles, aeroBalanceTarget):
+    """The best setup is on the edge of the aero balance tolerances, where the surrogate's aero balance is slightly
+        different to the real aero model's"""
+    frontRHTelem, rearRHTelem, groundSpeedTelem = telem
+    aeroBalanceTolerance = 0.3
+
+    RHOffsets = getRHAxis(RHOffsetMin, RHOffsetMax, 0.001).tolist()
+    setupResults = car.evaluateSetups(RHOffsets, RHOffsets, [combinationWingAngles], 1, frontRHTelem, rearRHTelem, groundSpeedTelem)[0]
+    isValidSetup = np.abs(setupResults[..., 5] - aeroBalanceTarget) <= aeroBalanceTolerance
+    gridMaxTotalClA = np.max(setupResults[..., 2][isValidSetup])
+
+    setup = optimiseRHOffsetsSurrogate(car, combinationWingAngles, RHOffsetMin, RHOffsetMax, RHOffsetMin, RHOffsetMax, aeroBalanceTarget, aeroBalanceTolerance, 1, frontRHTelem, rearRHTelem, groundSpeedTelem)
+    assert setup is not None
+    exactResults = setup[3]
+    assert abs(exactResults[5] - aeroBalanceTarget) <= aeroBalanceTolerance
+    assert abs(exactResults[5] - aeroBalanceTarget) > aeroBalanceTolerance - 0.01
+    assert exactResults[2] > gridMaxTotalClA
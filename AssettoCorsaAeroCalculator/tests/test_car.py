@@ -0,0 +1,449 @@
+import math
+import os
+import numpy as np
+import pytest
+
+from car import AeroMap, LookupTable, dilateRHEnvelope2D, getParetoFront, getRHAxis, getRHEnvelope2D, readLUT, readLUTFile
+
+
+def readLUTLinearSearch(x, LUT):
+    """The original readLUT(), which searches the LUT from the start"""
+    if x <= LUT[0][0]:
+        return LUT[0][1]
+    if x >= LUT[len(LUT) - 1][0]:
+        return LUT[len(LUT) - 1][1]
+    upperIndex = 0
+    while LUT[upperIndex][0] < x:
+        upperIndex += 1
+    lowerIndex = upperIndex - 1
+    return LUT[lowerIndex][1] + (x - LUT[lowerIndex][0]) * (LUT[upperIndex][1] - LUT[lowerIndex][1]) / (LUT[upperIndex][0] - LUT[lowerIndex][0])
+
+
+def test_lookup_table_matches_linear_search():
+    LUT = [[-10, -0.4], [0, 0.2], [5, 0.9], [10, 1.4], [15, 1.7], [20, 1.6]]
+    lookupTable = LookupTable(LUT)
+    unsortedLookupTable = LookupTable(LUT[::-1])
+    xValues = np.concatenate([np.linspace(-15, 25, 401), [row[0] for row in LUT]])
+    expectedValues = [readLUTLinearSearch(x, LUT) for x in xValues.tolist()]
+    for x, expectedValue in zip(xValues.tolist(), expectedValues):
+        assert lookupTable.read(x) == pytest.approx(expectedValue, abs=1e-15)
+        assert unsortedLookupTable.read(x) == pytest.approx(expectedValue, abs=1e-15)
+        assert readLUT(x, LUT) == pytest.approx(expectedValue, abs=1e-15)
+        assert lookupTable.readValues(x) == pytest.approx(expectedValue, abs=1e-15)
+    assert np.allclose(lookupTable.readArray(xValues), expectedValues, rtol=0, atol=1e-15)
+    assert np.allclose(lookupTable.readValues(xValues.reshape(-1, 1)).reshape(-1), expectedValues, rtol=0, atol=1e-15)
+
+
+def test_lut_cache_shares_lookup_tables(car, carsDirectory):
+    LUTCache = {}
+    carDataDirectory = carsDirectory + "\\testcar\\data\\"
+    lookupTable = readLUTFile(carDataDirectory + "aoa_cl.lut", LUTCache)
+    assert readLUTFile(carDataDirectory + "aoa_cl.lut", LUTCache) is lookupTable
+    assert lookupTable.xList == [-10, 0, 5, 10, 15, 20]
+
+    # The front and rear wing use the same LUT file
+    assert car.wings[2].LUT_AOA_CL is car.wings[3].LUT_AOA_CL
+
+
+def test_calculate_aero_array_matches_scalar(car):
+    rng = np.random.default_rng(0)
+    frontRHArray = rng.uniform(-0.01, 0.1, 500)
+    rearRHArray = rng.uniform(-0.01, 0.12, 500)
+    for wingAngles in [None, [None, None, 0, 12], [1, -1, 5.5, 2]]:
+        arrayResults = np.array(car.calculateAeroArray(frontRHArray, rearRHArray, wingAngles))
+        scalarResults = np.array([car.calculateAero(frontRH, rearRH, wingAngles) for frontRH, rearRH in zip(frontRHArray.tolist(), rearRHArray.tolist())]).T
+        assert np.allclose(arrayResults, scalarResults, rtol=1e-12, atol=1e-15)
+
+    # Any shape of array, e.g. a 2D grid
+    arrayResults2D = np.array(car.calculateAeroArray(frontRHArray.reshape(20, 25), rearRHArray.reshape(20, 25)))
+    assert np.array_equal(arrayResults2D.reshape(6, -1), np.array(car.calculateAeroArray(frontRHArray, rearRHArray)))
+
+
+def getParetoFrontBruteForce(objectives):
+    """Returns the indexes of the non-dominated rows of objectives by comparing every pair of points (only the first of
+        any identical points is kept)"""
+    paretoIndexes = []
+    for index in range(len(objectives)):
+        isDominated = np.any(np.all(objectives <= objectives[index], axis=1) & np.any(objectives < objectives[index], axis=1))
+        isDuplicate = np.any(np.all(objectives[:index] == objectives[index], axis=1))
+        if not isDominated and not isDuplicate:
+            paretoIndexes.append(index)
+    return np.array(paretoIndexes, dtype=int)
+
+
+@pytest.mark.parametrize("numObjectives", [2, 3])
+def test_pareto_front_matches_brute_force(numObjectives):
+    rng = np.random.default_rng(0)
+    for trial in range(200):
+        numPoints = int(rng.integers(1, 150))
+        if trial % 2 == 0:
+            # Lots of ties and duplicates
+            objectives = rng.integers(0, 5, (numPoints, numObjectives)).astype(float)
+        else:
+            objectives = rng.normal(size=(numPoints, numObjectives))
+        assert np.array_equal(getParetoFront(objectives), getParetoFrontBruteForce(objectives))
+        assert np.array_equal(getParetoFront(objectives, numPrefilterBins=4), getParetoFrontBruteForce(objectives))
+
+
+def test_pareto_front_all_non_dominated():
+    # Every point is on the front (the worst case for the 3 objective front)
+    numPoints = 5000
+    objectives = np.stack([np.arange(numPoints), -np.arange(numPoints), np.arange(numPoints)], axis=1).astype(float)
+    assert np.array_equal(getParetoFront(objectives), np.arange(numPoints))
+    assert len(getParetoFront(np.zeros((0, 3)))) == 0
+
+
+def test_optimiser_matches_brute_force(car, telem):
+    frontRHTelem, rearRHTelem, groundSpeedTelem = telem
+    wingAnglesArray = [[None, None, frontWingAngle, rearWingAngle] for frontWingAngle in [2, 3, 4] for rearWingAngle in [6, 8]]
+    aeroBalanceTarget = 34.5
+    aeroBalanceTolerance = 0.5
+    validSetups, maxTotalClASetup, minTotalCdASetup, maxEfficiencySetup, paretoSetups = car.optimiseAeroRHTelem(-0.003, 0.003, -0.003, 0.003, wingAnglesArray, aeroBalanceTarget, aeroBalanceTolerance, 1, frontRHTelem, rearRHTelem, groundSpeedTelem, wingAnglesChunkSize=4)
+
+    RHOffsets = getRHAxis(-0.003, 0.003, 0.001).tolist()
+    setupResults = car.evaluateSetups(RHOffsets, RHOffsets, wingAnglesArray, 1, frontRHTelem, rearRHTelem, groundSpeedTelem)
+    expectedSetups = []
+    expectedResults = []
+    for wingAnglesIndex in range(len(wingAnglesArray)):
+        for rearRHOffsetIndex in range(len(RHOffsets)):
+            for frontRHOffsetIndex in range(len(RHOffsets)):
+                setupResult = setupResults[wingAnglesIndex, rearRHOffsetIndex, frontRHOffsetIndex]
+                if abs(setupResult[5] - aeroBalanceTarget) <= aeroBalanceTolerance:
+                    expectedSetups.append([RHOffsets[frontRHOffsetIndex], RHOffsets[rearRHOffsetIndex], wingAnglesArray[wingAnglesIndex]])
+                    expectedResults.append(setupResult)
+    expectedResults = np.array(expectedResults)
+
+    assert len(expectedSetups) > 0
+    assert validSetups == expectedSetups
+    assert maxTotalClASetup == expectedSetups[int(np.argmax(expectedResults[:, 2]))]
+    assert minTotalCdASetup == expectedSetups[int(np.argmin(expectedResults[:, 3]))]
+    assert maxEfficiencySetup == expectedSetups[int(np.argmax(expectedResults[:, 4]))]
+
+    paretoObjectives = np.stack([-expectedResults[:, 2], expectedResults[:, 3], np.abs(expectedResults[:, 5] - aeroBalanceTarget)], axis=1)
+    expectedParetoSetups = [expectedSetups[paretoIndex] for paretoIndex in getParetoFrontBruteForce(paretoObjectives)]
+    assert sorted(map(str, paretoSetups)) == sorted(map(str, expectedParetoSetups))
+
+
+def test_histogram_matches_exact_on_binned_telemetry(car, telem):
+    frontRHTelem, rearRHTelem, groundSpeedTelem = telem
+    wingAnglesArray = [[None, None, 2, 6], [None, None, 4, 10]]
+    RHOffsets = getRHAxis(-0.003, 0.003, 0.001).tolist()
+    histogramRHStep = 0.001
+    histogramResults = car.evaluateSetupsHistogram(RHOffsets, RHOffsets, wingAnglesArray, 1, frontRHTelem, rearRHTelem, groundSpeedTelem, histogramRHStep)
+
+    # The histogram moves every telemetry ride height to the nearest histogram grid point
+    binnedTelem = []
+    for RHTelem in [frontRHTelem, rearRHTelem]:
+        RHOrigin = np.floor(np.min(RHTelem) / histogramRHStep) * histogramRHStep
+        binnedTelem.append(RHOrigin + np.rint((RHTelem - RHOrigin) / histogramRHStep) * histogramRHStep)
+    exactResults = car.evaluateSetups(RHOffsets, RHOffsets, wingAnglesArray, 1, binnedTelem[0], binnedTelem[1], groundSpeedTelem)
+    assert np.allclose(histogramResults, exactResults, rtol=1e-9, atol=1e-12)
+
+    # And it's close to the exact results with the real telemetry
+    exactResults = car.evaluateSetups(RHOffsets, RHOffsets, wingAnglesArray, 1, frontRHTelem, rearRHTelem, groundSpeedTelem)
+    assert np.allclose(histogramResults, exactResults, rtol=1e-3)
+
+
+def test_bracketed_matches_exact(car, telem):
+    frontRHTelem, rearRHTelem, groundSpeedTelem = telem
+    wingAnglesArray = [[None, None, frontWingAngle, rearWingAngle] for frontWingAngle in [0, 3, 6] for rearWingAngle in [2, 8, 12]]
+    exactOutputs = car.optimiseAeroRHTelem(-0.006, 0.006, -0.006, 0.006, wingAnglesArray, 33.2, 0.2, 1, frontRHTelem, rearRHTelem, groundSpeedTelem)
+    bracketedOutputs = car.optimiseAeroRHTelem(-0.006, 0.006, -0.006, 0.006, wingAnglesArray, 33.2, 0.2, 1, frontRHTelem, rearRHTelem, groundSpeedTelem, method="bracketed")
+    assert len(exactOutputs[0]) > 0
+    assert bracketedOutputs == exactOutputs
+
+    # The setups that are evaluated have identical values to evaluateSetups(), and the rest are NaN
+    RHOffsets = getRHAxis(-0.006, 0.006, 0.001).tolist()
+    exactResults = car.evaluateSetups(RHOffsets, RHOffsets, wingAnglesArray, 1, frontRHTelem, rearRHTelem, groundSpeedTelem)
+    bracketedResults = car.evaluateSetupsBracketed(RHOffsets, RHOffsets, wingAnglesArray, 1, frontRHTelem, rearRHTelem, groundSpeedTelem, 33, 33.4)
+    isEvaluated = ~np.isnan(bracketedResults[..., 5])
+    assert not np.all(isEvaluated)
+    assert np.array_equal(bracketedResults[isEvaluated], exactResults[isEvaluated])
+
+
+def test_lookup_close_to_exact(car, telem, capsys):
+    frontRHTelem, rearRHTelem, groundSpeedTelem = telem
+    wingAnglesArray = [[None, None, 2, 6], [None, None, 4, 10]]
+    RHOffsets = getRHAxis(-0.003, 0.003, 0.001).tolist()
+    exactResults = car.evaluateSetups(RHOffsets, RHOffsets, wingAnglesArray, 1, frontRHTelem, rearRHTelem, groundSpeedTelem)
+    lookupResults = car.evaluateSetupsLookup(RHOffsets, RHOffsets, wingAnglesArray, 1, frontRHTelem, rearRHTelem, groundSpeedTelem, 0.0005)
+    assert np.allclose(lookupResults, exactResults, rtol=1e-4)
+
+    # The interpolation errors are only printed if they're asked for
+    assert capsys.readouterr().out == ""
+    car.evaluateSetupsLookup(RHOffsets, RHOffsets, wingAnglesArray, 1, frontRHTelem, rearRHTelem, groundSpeedTelem, 0.0005, printLookupError=True)
+    assert "Maximum lookup interpolation errors" in capsys.readouterr().out
+
+    with pytest.raises(Exception, match="multiples of lookupRHStep"):
+        car.evaluateSetupsLookup([0.0003], RHOffsets, wingAnglesArray, 1, frontRHTelem, rearRHTelem, groundSpeedTelem, 0.001)
+
+
+# A band crossing two wing angle combinations, a band narrower than an RH offset step, a band no setup reaches, and a
+# band where the only valid setup's weighted aero balance is more than 0.05 from the aero balance at its centroid (which
+# the centroid screen missed with no margin)
+@pytest.mark.parametrize("aeroBalanceTarget, aeroBalanceTolerance", [[33.2, 0.2], [27.6, 0.05], [45, 0.5], [38.75, 0.05]])
+def test_contour_matches_exact(car, telem, aeroBalanceTarget, aeroBalanceTolerance):
+    frontRHTelem, rearRHTelem, groundSpeedTelem = telem
+    wingAnglesArray = list(car.generateWingAngles())
+    exactOutputs = car.optimiseAeroRHTelem(-0.006, 0.006, -0.006, 0.006, wingAnglesArray, aeroBalanceTarget, aeroBalanceTolerance, 1, frontRHTelem, rearRHTelem, groundSpeedTelem)
+    contourOutputs = car.optimiseAeroRHTelem(-0.006, 0.006, -0.006, 0.006, wingAnglesArray, aeroBalanceTarget, aeroBalanceTolerance, 1, frontRHTelem, rearRHTelem, groundSpeedTelem, method="contour", contourBalanceMargin=0)
+    assert contourOutputs == exactOutputs
+
+    # Most of the setups are screened out
+    RHOffsets = getRHAxis(-0.006, 0.006, 0.001).tolist()
+    contourResults = car.evaluateSetupsContour(RHOffsets, RHOffsets, wingAnglesArray, 1, frontRHTelem, rearRHTelem, groundSpeedTelem, aeroBalanceTarget - aeroBalanceTolerance, aeroBalanceTarget + aeroBalanceTolerance)
+    assert np.mean(np.isnan(contourResults[..., 5])) > 0.8
+
+
+@pytest.mark.parametrize("useThreads", [True, False])
+def test_parallel_matches_serial(car, telem, useThreads):
+    frontRHTelem, rearRHTelem, groundSpeedTelem = telem
+    wingAnglesArray = [[None, None, frontWingAngle, rearWingAngle] for frontWingAngle in [2, 3, 4] for rearWingAngle in [6, 8]]
+    RHOffsets = getRHAxis(-0.003, 0.003, 0.001).tolist()
+    for method, serialResults in [["exact", car.evaluateSetups(RHOffsets, RHOffsets, wingAnglesArray, 1, frontRHTelem, rearRHTelem, groundSpeedTelem)],
+                                  ["histogram", car.evaluateSetupsHistogram(RHOffsets, RHOffsets, wingAnglesArray, 1, frontRHTelem, rearRHTelem, groundSpeedTelem, 0.001)]]:
+        parallelResults = car.evaluateSetupsParallel(RHOffsets, RHOffsets, wingAnglesArray, 1, frontRHTelem, rearRHTelem, groundSpeedTelem, method, 0.001, 2, useThreads=useThreads)
+        assert np.array_equal(parallelResults, serialResults)
+
+
+def test_bootstrap_matches_resampling(car, telem):
+    frontRHTelem, rearRHTelem, groundSpeedTelem = telem
+    numResamples = 200
+    blockLength = 7
+    bootstrapResults = car.calculateAeroRHTelemBootstrap(1, frontRHTelem, rearRHTelem, groundSpeedTelem, numResamples, 0.9, blockLength, seed=3)
+    assert np.allclose(bootstrapResults[:, 0], car.calculateAeroRHTelem(1, frontRHTelem, rearRHTelem, groundSpeedTelem))
+
+    # Resample the telemetry itself, with the same blocks cut to the length of the telemetry (1500 isn't a multiple of
+    # blockLength, so the last block is cut short)
+    numTelemPoints = len(groundSpeedTelem)
+    assert numTelemPoints % blockLength != 0
+    blockStarts = np.random.default_rng(3).integers(0, numTelemPoints, (numResamples, -(-numTelemPoints // blockLength)))
+    metricArrays = np.array(car.calculateAeroArray(frontRHTelem, rearRHTelem))
+    resampleWeightedAverages = []
+    for resampleBlockStarts in blockStarts:
+        resampleIndexes = ((resampleBlockStarts[:, np.newaxis] + np.arange(blockLength)) % numTelemPoints).reshape(-1)[:numTelemPoints]
+        assert len(resampleIndexes) == numTelemPoints
+        resampleWeightedAverages.append(metricArrays[:, resampleIndexes] @ groundSpeedTelem[resampleIndexes] / np.sum(groundSpeedTelem[resampleIndexes]))
+    bounds = np.percentile(np.array(resampleWeightedAverages), [5, 95], axis=0)
+    assert np.allclose(bootstrapResults[:, 1:], bounds.T, rtol=1e-9)
+    assert np.all(bootstrapResults[:, 1] <= bootstrapResults[:, 0]) and np.all(bootstrapResults[:, 0] <= bootstrapResults[:, 2])
+
+
+@pytest.mark.parametrize("aeroBalanceTarget, aeroBalanceTolerance", [[33.2, 0.2], [27.6, 0.05], [45, 0.5], [38, 3]])
+def test_generate_wing_angles_matches_exhaustive(car, telem, aeroBalanceTarget, aeroBalanceTolerance):
+    frontRHTelem, rearRHTelem, groundSpeedTelem = telem
+    allWingAngles = list(car.generateWingAngles())
+    assert allWingAngles == [[None, None, frontWingAngle, rearWingAngle] for frontWingAngle in range(0, 7) for rearWingAngle in range(2, 13, 2)]
+    generatedWingAngles = list(car.generateWingAngles(aeroBalanceTarget, aeroBalanceTolerance, frontRHTelem, rearRHTelem, -0.004, 0.003, -0.002, 0.005))
+
+    # Every combination with a valid setup is generated, in the same order as all the combinations
+    RHOffsetsFront = getRHAxis(-0.004, 0.003, 0.001).tolist()
+    RHOffsetsRear = getRHAxis(-0.002, 0.005, 0.001).tolist()
+    setupResults = car.evaluateSetups(RHOffsetsFront, RHOffsetsRear, allWingAngles, 1, frontRHTelem, rearRHTelem, groundSpeedTelem)
+    hasValidSetup = np.any(np.abs(setupResults[..., 5] - aeroBalanceTarget) <= aeroBalanceTolerance, axis=(1, 2))
+    assert generatedWingAngles == [wingAngles for wingAngles in allWingAngles if wingAngles in generatedWingAngles]
+    for wingAngles, isValid in zip(allWingAngles, hasValidSetup.tolist()):
+        if isValid:
+            assert wingAngles in generatedWingAngles
+    assert len(generatedWingAngles) < len(allWingAngles)
+
+
+def getRHEnvelope2DBaseline(frontRHMin, frontRHMax, rearRHMin, rearRHMax, RHStep, frontRHTelem, rearRHTelem):
+    """The original getRHEnvelope2D(), which searches the telemetry for every ride height combination"""
+    RHEnvelope2D = []
+    frontRHTelem = [round(i, 3) for i in frontRHTelem]
+    rearRHTelem = [round(i, 3) for i in rearRHTelem]
+    telemRHCombinations = []
+    for i in range(len(frontRHTelem)):
+        telemRHCombinations.append([frontRHTelem[i], rearRHTelem[i]])
+    RHMargin = RHStep / 2
+    rearRH = rearRHMin
+    while rearRH <= rearRHMax + RHMargin:
+        RHEnvelope2D.append([])
+        frontRH = frontRHMin
+        while frontRH <= frontRHMax + RHMargin:
+            if [round(frontRH, 3), round(rearRH, 3)] in telemRHCombinations:
+                RHEnvelope2D[-1].append(1)
+            else:
+                RHEnvelope2D[-1].append(0)
+            frontRH += RHStep
+        rearRH += RHStep
+    return RHEnvelope2D
+
+
+@pytest.mark.parametrize("RHStep", [0.001, 0.002])
+def test_rh_envelope_matches_baseline(telem, RHStep):
+    frontRHTelem, rearRHTelem, groundSpeedTelem = telem
+    # Telemetry logged to 0.1 mm (like a MoTeC export), so lots of ride heights are exactly half way between two mm
+    for RHTelemRoundingDigits in [None, 4]:
+        if RHTelemRoundingDigits is not None:
+            frontRHTelem = np.array([round(frontRH, RHTelemRoundingDigits) for frontRH in frontRHTelem.tolist()])
+            rearRHTelem = np.array([round(rearRH, RHTelemRoundingDigits) for rearRH in rearRHTelem.tolist()])
+        for frontRHMin, rearRHMin in [[0, 0], [0.012, 0.034]]:
+            expectedEnvelope2D = getRHEnvelope2DBaseline(frontRHMin, 0.07, rearRHMin, 0.09, RHStep, frontRHTelem.tolist(), rearRHTelem.tolist())
+            RHEnvelope2D = getRHEnvelope2D(frontRHMin, 0.07, rearRHMin, 0.09, RHStep, frontRHTelem, rearRHTelem)
+            assert np.sum(expectedEnvelope2D) > 0
+            assert np.array_equal(RHEnvelope2D, expectedEnvelope2D)
+
+
+@pytest.mark.parametrize("RHStep", [0.0005, 0.001, 0.002])
+def test_rh_density(telem, RHStep):
+    frontRHTelem, rearRHTelem, groundSpeedTelem = telem
+    RHEnvelope2D, density2D = getRHEnvelope2D(0, 0.08, 0.02, 0.1, RHStep, frontRHTelem, rearRHTelem, groundSpeedTelem, returnDensity=True)
+    assert np.array_equal(RHEnvelope2D, getRHEnvelope2D(0, 0.08, 0.02, 0.1, RHStep, frontRHTelem, rearRHTelem))
+
+    # The grid covers all the telemetry, so the density (per mm^2) adds up to 1 over the area of the grid
+    assert np.sum(density2D) * (RHStep * 1000) ** 2 == pytest.approx(1)
+    assert np.all(density2D >= 0)
+
+    # Each ride height combination's cell holds the telemetry nearest to it
+    frontRHArray = getRHAxis(0, 0.08, RHStep)
+    rearRHArray = getRHAxis(0.02, 0.1, RHStep)
+    rearRHIndex, frontRHIndex = np.unravel_index(np.argmax(density2D), density2D.shape)
+    isInCell = (np.abs(frontRHTelem - frontRHArray[frontRHIndex]) < RHStep / 2) & (np.abs(rearRHTelem - rearRHArray[rearRHIndex]) < RHStep / 2)
+    expectedDensity = np.sum(groundSpeedTelem[isInCell]) / np.sum(groundSpeedTelem) / (RHStep * 1000) ** 2
+    assert density2D[rearRHIndex, frontRHIndex] == pytest.approx(expectedDensity)
+
+
+def test_plot_aero_maps_skips_unchanged(car, tmp_path):
+    pytest.importorskip("matplotlib")
+    saveDirectory = str(tmp_path / "plots")
+    wingAnglesArray = [[None, None, 2, 6]]
+    fileName = str(wingAnglesArray[0])
+    filePath = saveDirectory + "\\" + fileName
+
+    # Every figure is rendered unless skipping is asked for
+    assert car.plotAeroMaps(saveDirectory, 0, 0.02, 0.02, 0.04, 0.002, 0, wingAnglesArray) == [fileName]
+    assert car.plotAeroMaps(saveDirectory, 0, 0.02, 0.02, 0.04, 0.002, 0, wingAnglesArray) == [fileName]
+    assert car.plotAeroMaps(saveDirectory, 0, 0.02, 0.02, 0.04, 0.002, 0, wingAnglesArray, skipUnchanged=True) == []
+
+    # A missing figure, or one older than its fingerprint, is rendered again even though the fingerprint matches
+    os.remove(filePath + ".png")
+    assert car.plotAeroMaps(saveDirectory, 0, 0.02, 0.02, 0.04, 0.002, 0, wingAnglesArray, skipUnchanged=True) == [fileName]
+    fingerprintTime = os.path.getmtime(filePath + ".fingerprint")
+    os.utime(filePath + ".png", (fingerprintTime - 10, fingerprintTime - 10))
+    assert car.plotAeroMaps(saveDirectory, 0, 0.02, 0.02, 0.04, 0.002, 0, wingAnglesArray, skipUnchanged=True) == [fileName]
+    assert car.plotAeroMaps(saveDirectory, 0, 0.02, 0.02, 0.04, 0.002, 0, wingAnglesArray, skipUnchanged=True) == []
+
+    # Changing the inputs renders it again
+    assert car.plotAeroMaps(saveDirectory, 0, 0.02, 0.02, 0.04, 0.002, 0, wingAnglesArray, boundsAeroBalance=[20, 50], skipUnchanged=True) == [fileName]
+
+
+def getColliderClearanceLoop(car, frontRH, rearRH):
+    """The original collider check (a loop over every collider, calculating CG height and rake with math), returning the
+        minimum clearance of the colliders' lower edges instead of whether they're all above colliderMargin"""
+    frontCGHeight = frontRH - car.PICKUP_FRONT_HEIGHT
+    rearCGHeight = rearRH - car.PICKUP_REAR_HEIGHT
+    CGHeight = frontCGHeight + car.CG_LOCATION * (rearCGHeight - frontCGHeight)
+    rake = math.degrees(math.asin((rearCGHeight - frontCGHeight) / car.WHEELBASE))
+    clearance = math.inf
+    for Collider in car.colliders:
+        for lowerEdgeY, lowerEdgeZ in Collider.getPositionLowerEdges():
+            clearance = min(clearance, CGHeight + lowerEdgeY - lowerEdgeZ * math.sin(math.radians(rake)))
+    return clearance
+
+
+def getAeroMapScalar(car, frontRHArray, rearRHArray, colliderMargin, wingAngles):
+    """The aero map calculated one ride height at a time with calculateAero(), in the form [metric][RearRH][FrontRH],
+        and whether each ride height is valid"""
+    metricArrays = np.array([[car.calculateAero(frontRH, rearRH, wingAngles) for frontRH in frontRHArray.tolist()] for rearRH in rearRHArray.tolist()])
+    isValid2D = np.array([[getColliderClearanceLoop(car, frontRH, rearRH) >= colliderMargin for frontRH in frontRHArray.tolist()] for rearRH in rearRHArray.tolist()])
+    return np.moveaxis(metricArrays, 2, 0), isValid2D
+
+
+def test_aero_map_matches_scalar(car):
+    frontRHArray = getRHAxis(0, 0.04, 0.002)
+    rearRHArray = getRHAxis(0.02, 0.08, 0.002)
+    for wingAngles in [None, [None, None, 0, 12]]:
+        expectedMetricArrays, expectedIsValid2D = getAeroMapScalar(car, frontRHArray, rearRHArray, -0.27, wingAngles)
+        aeroMap = car.getAeroMap(0, 0.04, 0.02, 0.08, 0.002, -0.27, wingAngles=wingAngles)
+        assert np.array_equal(aeroMap.frontRHArray, frontRHArray) and np.array_equal(aeroMap.rearRHArray, rearRHArray)
+        assert aeroMap.metricArrays.shape == (6, len(rearRHArray), len(frontRHArray))
+        assert np.allclose(aeroMap.metricArrays, expectedMetricArrays, rtol=1e-12, atol=1e-15)
+        assert np.array_equal(aeroMap.isValid2D, expectedIsValid2D)
+        assert 0 < np.sum(aeroMap.isValid2D) < aeroMap.isValid2D.size
+        for metricIndex in range(len(AeroMap.metricNames)):
+            assert np.array_equal(aeroMap.getMetric(AeroMap.metricNames[metricIndex]), aeroMap.metricArrays[metricIndex])
+
+        # float32 aero maps only lose precision
+        aeroMap32 = car.getAeroMap(0, 0.04, 0.02, 0.08, 0.002, -0.27, dtype=np.float32, wingAngles=wingAngles)
+        assert aeroMap32.metricArrays.dtype == np.float32
+        assert np.allclose(aeroMap32.metricArrays, expectedMetricArrays, rtol=1e-6)
+        assert np.array_equal(aeroMap32.isValid2D, expectedIsValid2D)
+
+
+def test_aero_basis_matches_aero_map(car):
+    wingAnglesArray = [[None, None, frontWingAngle, rearWingAngle] for frontWingAngle in [0, 3, 6] for rearWingAngle in [2, 8, 12]]
+    aeroBasis = car.getAeroMapBasis(0, 0.04, 0.02, 0.08, 0.002)
+    for wingAngles in wingAnglesArray:
+        aeroMap = car.getAeroMap(0, 0.04, 0.02, 0.08, 0.002, -0.27, wingAngles=wingAngles)
+        basisAeroMap = car.getAeroMap(0, 0.04, 0.02, 0.08, 0.002, -0.27, aeroBasis=aeroBasis, wingAngles=wingAngles)
+        assert np.allclose(basisAeroMap.metricArrays, aeroMap.metricArrays, rtol=1e-12, atol=1e-15)
+        assert np.array_equal(basisAeroMap.isValid2D, aeroMap.isValid2D)
+
+    # Each wing is only calculated once per distinct angle (the body has its default angle)
+    assert sorted(aeroBasis.wingContributions) == sorted([(0, 0.0), (1, 0.0)] + [(2, float(angle)) for angle in [0, 3, 6]] + [(3, float(angle)) for angle in [2, 8, 12]])
+    assert np.allclose(aeroBasis.calculateAero(wingAnglesArray[0]), car.calculateAeroArray(*np.meshgrid(getRHAxis(0, 0.04, 0.002), getRHAxis(0.02, 0.08, 0.002)), wingAnglesArray[0]), rtol=1e-12, atol=1e-15)
+
+
+def test_collider_clearance_matches_loop(car, telem):
+    frontRHTelem, rearRHTelem, groundSpeedTelem = telem
+    assert len(car.colliders) > 0
+    expectedClearance = np.array([getColliderClearanceLoop(car, frontRH, rearRH) for frontRH, rearRH in zip(frontRHTelem.tolist(), rearRHTelem.tolist())])
+    clearance = car.getColliderClearance(frontRHTelem, rearRHTelem)
+    assert np.allclose(clearance, expectedClearance, rtol=0, atol=1e-12)
+
+    # A row of front ride heights and a column of rear ride heights broadcast to the whole grid
+    frontRHArray = getRHAxis(-0.01, 0.05, 0.002)
+    rearRHArray = getRHAxis(0, 0.08, 0.002)
+    expectedClearance2D = np.array([[getColliderClearanceLoop(car, frontRH, rearRH) for frontRH in frontRHArray.tolist()] for rearRH in rearRHArray.tolist()])
+    clearance2D = car.getColliderClearance(frontRHArray[None, :], rearRHArray[:, None])
+    assert np.allclose(clearance2D, expectedClearance2D, rtol=0, atol=1e-12)
+
+    # Any margin is a threshold of the clearance, the same as checking every collider with Collider.isValid()
+    # The synthetic car's colliders sit below the ground at every ride height, so only negative margins split the grid
+    for colliderMargin in [-0.3, -0.27, -0.25]:
+        isValid2D = car.isValidRideHeight(frontRHArray[None, :], rearRHArray[:, None], colliderMargin)
+        assert 0 < np.sum(isValid2D) < isValid2D.size
+        isNearMargin = np.abs(expectedClearance2D - colliderMargin) < 1e-12
+        for rearRHIndex, frontRHIndex in np.argwhere(~isNearMargin):
+            CGHeight, rake = car.getCGHeightAndRake(frontRHArray[frontRHIndex], rearRHArray[rearRHIndex])
+            assert isValid2D[rearRHIndex, frontRHIndex] == all(Collider.isValid(CGHeight, rake, colliderMargin) for Collider in car.colliders)
+
+
+def test_adaptive_aero_map_close_to_full_grid(car):
+    adaptiveTolerance = 1e-4
+    for wingAngles in [None, [None, None, 0, 12]]:
+        aeroMap = car.getAeroMap(0, 0.1, 0, 0.1, 0.0005, -0.25, wingAngles=wingAngles)
+        adaptiveAeroMap = car.getAeroMap(0, 0.1, 0, 0.1, 0.0005, -0.25, wingAngles=wingAngles, adaptiveTolerance=adaptiveTolerance)
+        assert np.array_equal(adaptiveAeroMap.isValid2D, aeroMap.isValid2D)
+        assert adaptiveAeroMap.numEvaluations < aeroMap.numEvaluations / 2
+
+        # The corners of the coarse cells are always calculated
+        assert np.allclose(adaptiveAeroMap.metricArrays[:, ::16, ::16], aeroMap.metricArrays[:, ::16, ::16], rtol=1e-12, atol=1e-15)
+
+        # The rest of the grid is within twice adaptiveTolerance of each metric's largest magnitude
+        metricScales = np.max(np.abs(aeroMap.metricArrays), axis=(1, 2))
+        maxRelativeErrors = np.max(np.abs(adaptiveAeroMap.metricArrays - aeroMap.metricArrays), axis=(1, 2)) / metricScales
+        assert np.all(maxRelativeErrors < 2 * adaptiveTolerance)
+
+
+def test_sparse_aero_map_matches_dense(car, telem):
+    frontRHTelem, rearRHTelem, groundSpeedTelem = telem
+    RHEnvelope2D = getRHEnvelope2D(0, 0.08, 0.02, 0.1, 0.001, frontRHTelem, rearRHTelem)
+    wingAngles = [None, None, 3, 8]
+    aeroMap = car.getAeroMap(0, 0.08, 0.02, 0.1, 0.001, -0.25, wingAngles=wingAngles)
+    for envelopeMargin in [0, 0.0025]:
+        isInMask2D = dilateRHEnvelope2D(RHEnvelope2D, int(math.ceil(envelopeMargin / 0.001)))
+        assert np.sum(isInMask2D) < isInMask2D.size / 4
+        sparseAeroMaps = [car.getSparseAeroMap(0, 0.08, 0.02, 0.1, 0.001, -0.25, RHEnvelope2D, envelopeMargin, wingAngles=wingAngles),
+                          car.getSparseAeroMap(0, 0.08, 0.02, 0.1, 0.001, -0.25, RHEnvelope2D, envelopeMargin, wingAngles=wingAngles,
+                                               aeroBasis=car.getSparseAeroMapBasis(0, 0.08, 0.02, 0.1, 0.001, RHEnvelope2D, envelopeMargin))]
+        for sparseAeroMap in sparseAeroMaps:
+            assert len(sparseAeroMap) == np.sum(isInMask2D)
+            denseAeroMap = sparseAeroMap.toAeroMap()
+            assert np.allclose(denseAeroMap.metricArrays[:, isInMask2D], aeroMap.metricArrays[:, isInMask2D], rtol=1e-12, atol=1e-15)
+            assert np.all(np.isnan(denseAeroMap.metricArrays[:, ~isInMask2D]))
+            assert np.array_equal(denseAeroMap.isValid2D, aeroMap.isValid2D & isInMask2D)
+            rearRHIndexes, frontRHIndexes = np.nonzero(isInMask2D)
+            assert np.array_equal(sparseAeroMap.metricArrays[:, sparseAeroMap.getPositions(rearRHIndexes, frontRHIndexes)], denseAeroMap.metricArrays[:, isInMask2D])